@@ -1,6 +1,15 @@
 import chainlit as cl
 from chatbot import InteractiveSpeakerPrepAgent
 from langchain_core.messages import HumanMessage
+from step_executor import StepExecutor
+
+# Blocking agent steps run in a shared bounded thread pool (STEP_EXECUTOR_MAX_WORKERS)
+step_executor = StepExecutor()
+
+@cl.on_app_shutdown
+def on_app_shutdown():
+    # Steps still queued are dropped, the sessions they belong to are gone with the server
+    step_executor.shutdown()
 
 @cl.on_chat_start
 async def on_chat_start():
@@ -12,7 +21,7 @@ async def on_chat_start():
     await cl.Message(content="🎤 Speaker Preparation Agent").send()
     
     # Start with greeting
-    response = agent._execute_step("greeting")
+    response = await step_executor.execute_step(agent, "greeting")
     if response:
         await cl.Message(content=response).send()
 
@@ -20,7 +29,12 @@ async def on_chat_start():
 async def on_message(message: cl.Message):
     # Get the agent from session
     agent = cl.user_session.get("agent")
-    
+
+    # Messages of one session are handled one at a time, other sessions are not blocked
+    async with step_executor.session_lock(cl.context.session.id):
+        await process_message(agent, message)
+
+async def process_message(agent: InteractiveSpeakerPrepAgent, message: cl.Message):
     # Add user message to state
     agent.state["messages"].append(HumanMessage(content=message.content))
     
@@ -31,7 +45,7 @@ async def on_message(message: cl.Message):
     if current_step == "greeting":
         # After greeting, process the response
         agent.state["current_step"] = "process_greeting_response"
-        response = agent._execute_step("process_greeting_response")
+        response = await step_executor.execute_step(agent, "process_greeting_response")
         if response:
             await cl.Message(content=response).send()
         
@@ -45,96 +59,96 @@ async def on_message(message: cl.Message):
     elif current_step == "process_greeting_response":
         # After processing greeting, search for event
         agent.state["current_step"] = "search_event"
-        response = agent._execute_step("search_event")
+        response = await step_executor.execute_step(agent, "search_event")
         if response:
             await cl.Message(content=response).send()
             
     elif current_step == "search_event":
         # After event search, ask about goal
         agent.state["current_step"] = "ask_goal"
-        response = agent._execute_step("ask_goal")
+        response = await step_executor.execute_step(agent, "ask_goal")
         if response:
             await cl.Message(content=response).send()
             
     elif current_step == "ask_goal":
         # After asking goal, clarify it
         agent.state["current_step"] = "clarify_goal"
-        response = agent._execute_step("clarify_goal")
+        response = await step_executor.execute_step(agent, "clarify_goal")
         if response:
             await cl.Message(content=response).send()
             
     elif current_step == "clarify_goal":
         # After clarifying goal, ask about stage
         agent.state["current_step"] = "ask_stage"
-        response = agent._execute_step("ask_stage")
+        response = await step_executor.execute_step(agent, "ask_stage")
         if response:
             await cl.Message(content=response).send()
             
     elif current_step == "ask_stage":
         # After asking about stage, analyze audience
         agent.state["current_step"] = "analyze_audience"
-        response = agent._execute_step("analyze_audience")
+        response = await step_executor.execute_step(agent, "analyze_audience")
         if response:
             await cl.Message(content=response).send()
             
     elif current_step == "analyze_audience":
         # Process audience feedback
         agent.state["current_step"] = "process_audience_feedback"
-        response = agent._execute_step("process_audience_feedback")
+        response = await step_executor.execute_step(agent, "process_audience_feedback")
         if response:
             await cl.Message(content=response).send()
             
         # Check if audience is approved
         if agent.state.get("audience_approved", False):
             agent.state["current_step"] = "assess_knowledge"
-            response = agent._execute_step("assess_knowledge")
+            response = await step_executor.execute_step(agent, "assess_knowledge")
             if response:
                 await cl.Message(content=response).send()
                 
     elif current_step == "process_audience_feedback":
         # Process audience feedback again
-        response = agent._execute_step("process_audience_feedback")
+        response = await step_executor.execute_step(agent, "process_audience_feedback")
         if response:
             await cl.Message(content=response).send()
             
         # Check if audience is approved
         if agent.state.get("audience_approved", False):
             agent.state["current_step"] = "assess_knowledge"
-            response = agent._execute_step("assess_knowledge")
+            response = await step_executor.execute_step(agent, "assess_knowledge")
             if response:
                 await cl.Message(content=response).send()
                 
     elif current_step == "assess_knowledge":
         # Process knowledge feedback
         agent.state["current_step"] = "process_knowledge_feedback"
-        response = agent._execute_step("process_knowledge_feedback")
+        response = await step_executor.execute_step(agent, "process_knowledge_feedback")
         if response:
             await cl.Message(content=response).send()
             
         # Check if knowledge is approved
         if agent.state.get("knowledge_approved", False):
             agent.state["current_step"] = "generate_recommendation"
-            response = agent._execute_step("generate_recommendation")
+            response = await step_executor.execute_step(agent, "generate_recommendation")
             if response:
                 await cl.Message(content=response).send()
                 
     elif current_step == "process_knowledge_feedback":
         # Process knowledge feedback again
-        response = agent._execute_step("process_knowledge_feedback")
+        response = await step_executor.execute_step(agent, "process_knowledge_feedback")
         if response:
             await cl.Message(content=response).send()
             
         # Check if knowledge is approved
         if agent.state.get("knowledge_approved", False):
             agent.state["current_step"] = "generate_recommendation"
-            response = agent._execute_step("generate_recommendation")
+            response = await step_executor.execute_step(agent, "generate_recommendation")
             if response:
                 await cl.Message(content=response).send()
                 
     elif current_step == "generate_recommendation":
         # Process recommendation feedback
         agent.state["current_step"] = "process_recommendation_feedback"
-        response = agent._execute_step("process_recommendation_feedback")
+        response = await step_executor.execute_step(agent, "process_recommendation_feedback")
         if response:
             await cl.Message(content=response).send()
             
@@ -153,7 +167,7 @@ async def on_message(message: cl.Message):
                 
     elif current_step == "process_recommendation_feedback":
         # Process recommendation feedback again
-        response = agent._execute_step("process_recommendation_feedback")
+        response = await step_executor.execute_step(agent, "process_recommendation_feedback")
         if response:
             await cl.Message(content=response).send()
             
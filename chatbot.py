@@ -2,12 +2,64 @@ from typing import Dict, List, Optional, TypedDict, Annotated
 from langchain_core.messages import HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.tools import TavilySearchResults
-from langchain.schema import BaseMessage
+from langchain_core.messages import BaseMessage
 import operator
 from langchain_core.utils.json import parse_json_markdown
+from shared.intent_classifier import IntentClassifier
+from shared.intent_examples import (
+    APPROVAL_EXAMPLES,
+    GREETING_INTENT_EXAMPLES,
+    NEGATIVE_FEEDBACK_EXAMPLES,
+    REGENERATE_EXAMPLES,
+    REWRITE_EXAMPLES,
+    UNCLEAR_EXAMPLES,
+)
+from shared.rate_limiter import Priority, PriorityRateLimiter
 
 LLM_MODEL_NAME="models/gemma-3-27b-it"
 
+# Seed examples for the local intent classifiers, short replies are answered without an LLM call
+AUDIENCE_INTENT_EXAMPLES = {
+    "CONTINUE": APPROVAL_EXAMPLES + ["продовжуємо", "давай далі", "йдемо далі"],
+    "ADD": ["додай студентів", "додати", "ще є", "також", "включи ще", "додай ще", "ще додай розробників"],
+    "CHANGE": NEGATIVE_FEEDBACK_EXAMPLES + ["насправді", "виправ", "виправити", "зміни"],
+    "REMOVE": ["видали", "видалити", "прибери", "прибрати", "не потрібно", "зайве", "прибери студентів"],
+    "REWRITE": REWRITE_EXAMPLES,
+    "REGENERATE": REGENERATE_EXAMPLES,
+    "UNCLEAR": UNCLEAR_EXAMPLES,
+}
+
+KNOWLEDGE_INTENT_EXAMPLES = {
+    "AGREE": APPROVAL_EXAMPLES + ["так, згоден", "правильно", "точно", "так, далі", "давай далі"],
+    "ADD_KNOWLEDGE": ["також знають", "ще знають", "ще є", "додати", "додай", "додай ще", "вони ще знають"],
+    "REMOVE_KNOWLEDGE": ["не знають", "вони цього не знають", "прибрати", "прибери", "видалити", "видали", "зайве"],
+    "CORRECT_KNOWLEDGE": NEGATIVE_FEEDBACK_EXAMPLES + ["насправді", "виправити", "виправ", "не все так"],
+    "REWRITE_KNOWLEDGE": REWRITE_EXAMPLES,
+    "REGENERATE_KNOWLEDGE": REGENERATE_EXAMPLES,
+    "UNCLEAR": UNCLEAR_EXAMPLES,
+}
+
+RECOMMENDATION_INTENT_EXAMPLES = {
+    "APPROVE": APPROVAL_EXAMPLES + ["так чудово", "супер"],
+    "MODIFY": NEGATIVE_FEEDBACK_EXAMPLES + [
+        "переформулюй", "переформулювати", "інакше сформулюй", "змінити", "зміни", "зміни формулювання",
+        "не чудово", "не підходить",
+    ],
+    "ADD_ELEMENTS": ["додати", "додай", "включи", "ще треба", "додай заклик до дії", "включити"],
+    "CHANGE_FOCUS": ["більше про", "менше про", "акцент на", "зроби акцент на", "більше уваги"],
+    "REWRITE": REWRITE_EXAMPLES,
+    "REGENERATE": REGENERATE_EXAMPLES,
+    "UNCLEAR": UNCLEAR_EXAMPLES,
+}
+
+greeting_intents = IntentClassifier("chatbot_greeting_intent", GREETING_INTENT_EXAMPLES, threshold=0.9)
+audience_intents = IntentClassifier("chatbot_audience_intent", AUDIENCE_INTENT_EXAMPLES, threshold=0.9)
+knowledge_intents = IntentClassifier("chatbot_knowledge_intent", KNOWLEDGE_INTENT_EXAMPLES, threshold=0.9)
+recommendation_intents = IntentClassifier("chatbot_recommendation_intent", RECOMMENDATION_INTENT_EXAMPLES, threshold=0.9)
+
+# One request/token budget for the API key, shared by all sessions of the process
+rate_limiter = PriorityRateLimiter.from_env()
+
 # State definition
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
@@ -21,7 +73,12 @@ class AgentState(TypedDict):
 
 class InteractiveSpeakerPrepAgent:
     def __init__(self, gemini_model=LLM_MODEL_NAME):
-        self.llm = ChatGoogleGenerativeAI(model=gemini_model, temperature=0.7)
+        self.llm = ChatGoogleGenerativeAI(
+            model=gemini_model,
+            temperature=0.7,
+            rate_limiter=rate_limiter.bind(Priority.INTERACTIVE),
+            callbacks=[rate_limiter.usage_handler],
+        )
         self.search_tool = TavilySearchResults(max_results=5)
         self.state = self._initialize_state()
         self.conversation_steps = [
@@ -229,8 +286,10 @@ class InteractiveSpeakerPrepAgent:
             Відповідь лише одним словом: POSITIVE, NEGATIVE, або UNCLEAR
             """
             
-            response = self.llm.invoke([HumanMessage(content=analysis_prompt)])
-            intent = response.content.strip().upper()
+            intent = greeting_intents.predict(
+                user_response,
+                lambda: self.llm.invoke([HumanMessage(content=analysis_prompt)]).content.strip().upper(),
+            )
             
             if intent == "POSITIVE":
                 return "Класно! Де будеш виступати? На якій конференції чи заході?"
@@ -526,8 +585,10 @@ class InteractiveSpeakerPrepAgent:
         Відповідь лише одним словом: CONTINUE, ADD, REMOVE, REWRITE, REGENERATE, або UNCLEAR
         """
         
-        response = self.llm.invoke([HumanMessage(content=intent_prompt)])
-        return response.content.strip().upper()
+        return audience_intents.predict(
+            user_feedback,
+            lambda: self.llm.invoke([HumanMessage(content=intent_prompt)]).content.strip().upper(),
+        )
 
     def _handle_add_segments(self, user_feedback: str) -> str:
         """Handle adding information to audience segments"""
@@ -770,8 +831,10 @@ class InteractiveSpeakerPrepAgent:
         Відповідь лише одним словом: AGREE, ADD_KNOWLEDGE, REMOVE_KNOWLEDGE, CORRECT_KNOWLEDGE, REWRITE_KNOWLEDGE, REGENERATE_KNOWLEDGE, або UNCLEAR
         """
         
-        response = self.llm.invoke([HumanMessage(content=intent_prompt)])
-        return response.content.strip().upper()
+        return knowledge_intents.predict(
+            user_feedback,
+            lambda: self.llm.invoke([HumanMessage(content=intent_prompt)]).content.strip().upper(),
+        )
 
     def _handle_add_knowledge(self, user_feedback: str) -> str:
         """Handle adding knowledge information"""
@@ -1016,8 +1079,10 @@ class InteractiveSpeakerPrepAgent:
         Відповідь лише одним словом: APPROVE, MODIFY, ADD_ELEMENTS, CHANGE_FOCUS, REWRITE, REGENERATE, або UNCLEAR
         """
         
-        response = self.llm.invoke([HumanMessage(content=intent_prompt)])
-        return response.content.strip().upper()
+        return recommendation_intents.predict(
+            user_feedback,
+            lambda: self.llm.invoke([HumanMessage(content=intent_prompt)]).content.strip().upper(),
+        )
 
     def _handle_modify_recommendation(self, user_feedback: str) -> str:
         """Handle modifying recommendation based on feedback"""
@@ -0,0 +1 @@
+"""Modules shared by the chatbot and the v2/v4/v6 apps; the apps put the repo root on sys.path in src/__init__.py."""
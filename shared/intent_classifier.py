@@ -0,0 +1,180 @@
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Iterable, Optional
+
+TOKEN_RE = re.compile(r"[\w'ʼ’]+")
+# Naive Bayes adds up word evidence and can't read "не добре" as the opposite of "добре"
+NEGATIONS = frozenset({"не", "ні", "нє", "no", "not", "nope"})
+
+logger = logging.getLogger(__name__)
+
+
+def extract_features(text: str) -> list[str]:
+    """Words, word bigrams and 4-letter stems, which cover most Ukrainian inflections."""
+    tokens = TOKEN_RE.findall(text.lower())
+    features = [f"w:{token}" for token in tokens]
+    features += [f"b:{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    features += [f"s:{token[:4]}" for token in tokens if len(token) > 4]
+    return features
+
+
+def is_negation(token: str) -> bool:
+    return token in NEGATIONS or token.endswith(("n't", "nʼt", "n’t"))
+
+
+class IntentClassifier:
+    """
+    Local naive Bayes intent classifier that answers short, unambiguous user turns
+    ("так", "ні, дякую", "давай заново") without an LLM roundtrip.
+    Seed examples are matched verbatim first. Other turns with a negation or a word the
+    model never saw, and turns it is not confident about, are passed to the LLM fallback,
+    and the labels the LLM returns can be logged to INTENT_LOG_PATH to retrain the model later.
+    The local hit/fallback counts are logged every log_every turns (INTENT_STATS_LOG_EVERY, 0 never).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        examples: dict[str, list[str]],
+        threshold: float = 0.85,
+        max_tokens: int = 6,
+        alpha: float = 0.1,
+        log_path: Optional[str] = None,
+        log_every: Optional[int] = None,
+    ):
+        self.name = name
+        self.labels = list(examples)
+        self.threshold = threshold
+        self.max_tokens = max_tokens
+        self.alpha = alpha
+        self.log_path = log_path if log_path is not None else os.getenv("INTENT_LOG_PATH")
+        self.log_every = log_every if log_every is not None else int(os.getenv("INTENT_STATS_LOG_EVERY", 100))
+        self.feature_counts = defaultdict(Counter)
+        self.feature_totals = Counter()
+        self.label_counts = Counter()
+        self.vocabulary = set()
+        # Seed texts answered without the model, texts seeded under two labels are left to it
+        self.exact = {}
+        for label, texts in examples.items():
+            for text in texts:
+                key = " ".join(TOKEN_RE.findall(text.lower()))
+                self.exact[key] = label if self.exact.get(key, label) == label else None
+        self.local_hits = 0
+        self.fallbacks = 0
+
+        self.train((text, label) for label, texts in examples.items() for text in texts)
+        if self.log_path and os.path.exists(self.log_path):
+            self.train(self.load_log(self.log_path))
+
+    def train(self, examples: Iterable[tuple[str, str]]):
+        for text, label in examples:
+            if label not in self.labels:
+                continue
+            features = extract_features(text)
+            self.label_counts[label] += 1
+            self.feature_counts[label].update(features)
+            self.feature_totals[label] += len(features)
+            self.vocabulary.update(features)
+
+    def load_log(self, path: str) -> list[tuple[str, str]]:
+        """Reads (text, label) pairs logged for this classifier."""
+        examples = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("classifier") == self.name:
+                    examples.append((record["text"], record["label"]))
+        return examples
+
+    def log_turn(self, text: str, label: str):
+        if not self.log_path:
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"classifier": self.name, "text": text, "label": label}, ensure_ascii=False) + "\n")
+
+    def predict_proba(self, text: str) -> dict[str, float]:
+        # Features never seen in training carry no evidence, so they are skipped
+        features = [feature for feature in extract_features(text) if feature in self.vocabulary]
+        if not features:
+            return {}
+
+        total_examples = sum(self.label_counts.values())
+        scores = {}
+        for label in self.labels:
+            counts = self.feature_counts[label]
+            denominator = self.feature_totals[label] + self.alpha * len(self.vocabulary)
+            score = math.log((self.label_counts[label] + 1) / (total_examples + len(self.labels)))
+            for feature in features:
+                score += math.log((counts[feature] + self.alpha) / denominator)
+            scores[label] = score
+
+        best = max(scores.values())
+        exp_scores = {label: math.exp(score - best) for label, score in scores.items()}
+        normalizer = sum(exp_scores.values())
+        return {label: value / normalizer for label, value in exp_scores.items()}
+
+    def classify(self, text: str) -> tuple[Optional[str], float]:
+        """Returns the local label and its confidence, or (None, 0.0) for turns left to the LLM."""
+        tokens = TOKEN_RE.findall(text.lower())
+        if len(tokens) > self.max_tokens:
+            return None, 0.0
+        label = self.exact.get(" ".join(tokens))
+        if label is not None:
+            return label, 1.0
+        if any(is_negation(token) or f"w:{token}" not in self.vocabulary for token in tokens):
+            return None, 0.0
+        probabilities = self.predict_proba(text)
+        if not probabilities:
+            return None, 0.0
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def predict(self, text: str, fallback: Callable[[], str]) -> str:
+        """Classifies locally when confident, otherwise returns (and logs) the fallback's label."""
+        label, confidence = self.classify(text)
+        if label is not None and confidence >= self.threshold:
+            self._count("local_hits")
+            return label
+
+        self._count("fallbacks")
+        label = fallback()
+        if label in self.labels:
+            self.log_turn(text, label)
+        return label
+
+    async def apredict(self, text: str, afallback: Callable[[], Awaitable[str]]) -> str:
+        """Async variant of `predict`."""
+        label, confidence = self.classify(text)
+        if label is not None and confidence >= self.threshold:
+            self._count("local_hits")
+            return label
+
+        self._count("fallbacks")
+        label = await afallback()
+        if label in self.labels:
+            self.log_turn(text, label)
+        return label
+
+    def _count(self, outcome: str):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        if self.log_every and (self.local_hits + self.fallbacks) % self.log_every == 0:
+            self.log_stats()
+
+    def stats(self) -> dict[str, float]:
+        total = self.local_hits + self.fallbacks
+        return {
+            "local_hits": self.local_hits,
+            "fallbacks": self.fallbacks,
+            "hit_rate": self.local_hits / total if total else 0.0,
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        logger.info(
+            "intent classifier %s: %d local, %d LLM fallbacks, hit rate %.0f%%",
+            self.name, stats["local_hits"], stats["fallbacks"], stats["hit_rate"] * 100,
+        )
@@ -0,0 +1,49 @@
+"""
+Seed examples for the local intent classifiers of the apps. Each app builds its label sets
+from these, and gives its classifier its own name so the logged turns are not mixed up.
+"""
+
+# Replies that accept a generated item and move on
+APPROVAL_EXAMPLES = [
+    "так", "добре", "згоден", "згодна", "чудово", "підходить", "все добре", "все ок", "все вірно", "ок", "ok", "yes",
+]
+# Negated approvals and plain complaints, the classifier leaves the unseen ones to the LLM
+NEGATIVE_FEEDBACK_EXAMPLES = [
+    "не так", "не згоден", "не зовсім так", "погано", "все погано", "не все вірно", "не все добре", "не добре",
+]
+REWRITE_EXAMPLES = ["сам напишу", "напишу сам", "по-своєму", "я сам опишу", "я сам"]
+REGENERATE_EXAMPLES = ["заново", "по-новому", "інший варіант", "запропонуй інший варіант", "перегенеруй", "спробуй ще раз"]
+UNCLEAR_EXAMPLES = ["що?", "не знаю", "хм", "поясни", "можливо", "не розумію", "what?", "hmm"]
+
+# Replies to "Готуєшся до виступу?"
+GREETING_INTENT_EXAMPLES = {
+    "POSITIVE": [
+        "так", "так, готуюся", "готуюся", "готуюсь", "звичайно", "авжеж", "ага", "угу", "да",
+        "так, виступаю", "так, скоро виступ", "yes", "yep", "sure",
+    ],
+    "NEGATIVE": [
+        "ні", "ні, не готуюся", "не готуюся", "не готуюсь", "ні, дякую", "нє", "ні, не виступаю",
+        "не зараз", "no", "nope", "not really",
+    ],
+    "UNCLEAR": ["що?", "не знаю", "хм", "а що це?", "можливо", "поки не знаю", "what?", "hmm", "maybe"],
+}
+# Positive replies to the greeting that already name the event
+GREETING_EVENT_EXAMPLES = [
+    "так, виступаю на конференції", "готуюся до конференції", "виступаю на конференції",
+    "готуюся до дзвінка з клієнтом", "так, готуюся до презентації", "виступаю на митапі",
+]
+
+# Replies to a generated item (audience analysis, knowledge assessment, recommendation)
+FEEDBACK_INTENT_EXAMPLES = {
+    "CONTINUE": APPROVAL_EXAMPLES + ["продовжуємо", "давай далі", "так, далі", "правильно", "йдемо далі", "looks good"],
+    "MODIFY": NEGATIVE_FEEDBACK_EXAMPLES + [
+        "додай студентів", "зміни це", "виправ, будь ласка", "додай ще", "прибери це", "видали останній пункт",
+        "зміни формулювання", "насправді інакше", "так, але додай", "додати", "змінити", "виправити", "прибрати",
+        "не чудово", "не підходить", "не дуже",
+    ],
+    "REGENERATE": REGENERATE_EXAMPLES + [
+        "зроби по-новому", "перегенеруй будь ласка", "заново будь ласка", "давай інший варіант", "зроби заново",
+        "regenerate", "try again",
+    ],
+    "UNCLEAR": UNCLEAR_EXAMPLES + ["а навіщо?"],
+}
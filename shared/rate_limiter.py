@@ -0,0 +1,269 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+# Estimates charged to the chat model calls started in this context, in the order they were let through
+_charges: ContextVar[Optional[list[float]]] = ContextVar("rate_limiter_charges", default=None)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # a user is waiting on the reply
+    BACKGROUND = 1  # research and other batch work
+
+
+class PriorityRateLimiter:
+    """
+    Process-wide request and token buckets for one API key, shared by every LLM call site.
+    Waiting calls are served strictly by priority, then by arrival, so an interactive call only
+    waits for the next free request however many background calls are queued. Background calls
+    also leave interactive_reserve of both buckets untouched, so a burst of research can't
+    drain them. A call is charged the average tokens of recent calls up front, acquire returns
+    that estimate and record_tokens corrects it by the reported usage, so the token bucket may
+    go into debt: later calls wait until it is paid back. A rate of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        burst: float = 1.0,
+        interactive_reserve: float = 0.2,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        # Buckets hold `burst` seconds of quota, plus the reserve background calls can't take
+        request_burst = max(1.0, requests_per_minute / 60 * burst)
+        self._request_floor = interactive_reserve * request_burst
+        self._request_capacity = request_burst + self._request_floor
+        token_burst = tokens_per_minute / 60 * burst
+        self._token_floor = interactive_reserve * token_burst
+        self._token_capacity = token_burst + self._token_floor
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        # (priority, arrival) of waiting calls, the smallest is served next
+        self._queue: list[tuple[int, int]] = []
+        self._arrivals = itertools.count()
+        # ticket -> threading.Event of a sync caller or (loop, future) of an async one
+        self._wakers: dict[tuple[int, int], Any] = {}
+        self.granted = {priority: 0 for priority in Priority}
+        self.wait_total = {priority: 0.0 for priority in Priority}
+        self.wait_max = {priority: 0.0 for priority in Priority}
+        self.tokens_used = 0
+        # Moving average of reported tokens per call, charged when a call is let through
+        self._tokens_per_call = 0.0
+        self.usage_handler = _UsageHandler(self)
+
+    @classmethod
+    def from_env(cls) -> "PriorityRateLimiter":
+        return cls(
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", 2000)),
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", 4_000_000)),
+            interactive_reserve=float(os.getenv("LLM_INTERACTIVE_RESERVE", 0.2)),
+        )
+
+    def bind(self, priority: Priority) -> BaseRateLimiter:
+        """This limiter at a fixed priority, for the rate_limiter argument of a chat model."""
+        return _BoundRateLimiter(self, priority)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._refilled
+        self._refilled = now
+        self._requests = min(self._request_capacity, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self._token_capacity, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _try_grant(self, ticket: tuple[int, int]) -> Optional[float]:
+        """
+        Takes a request for the ticket if it is next in line and the buckets allow and returns 0;
+        otherwise the seconds until the buckets allow it, or None when other calls are ahead.
+        """
+        self._refill()
+        if self._queue[0] != ticket:
+            return None
+        background = ticket[0] != Priority.INTERACTIVE
+        wait = 0.0
+        if self.requests_per_minute:
+            needed = 1 + (self._request_floor if background else 0)
+            wait = max(wait, (needed - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            needed = self._token_floor if background else 0
+            wait = max(wait, (needed - self._tokens) * 60 / self.tokens_per_minute)
+        if wait > 0:
+            return wait
+        self._dequeue(ticket)
+        self._requests -= 1
+        self._tokens -= self._tokens_per_call
+        return 0
+
+    def _enqueue(self, priority: Priority, waker) -> tuple[int, int]:
+        ticket = (int(priority), next(self._arrivals))
+        heapq.heappush(self._queue, ticket)
+        self._wakers[ticket] = waker
+        return ticket
+
+    def _dequeue(self, ticket: tuple[int, int]):
+        was_first = self._queue[0] == ticket
+        self._queue.remove(ticket)
+        heapq.heapify(self._queue)
+        del self._wakers[ticket]
+        if was_first and self._queue:
+            # The next call in line waits for the buckets now
+            waker = self._wakers[self._queue[0]]
+            if isinstance(waker, threading.Event):
+                waker.set()
+            else:
+                loop, future = waker
+                loop.call_soon_threadsafe(_resolve, future)
+
+    def _record_wait(self, priority: Priority, started: float):
+        waited = time.monotonic() - started
+        with self._lock:
+            self.granted[priority] += 1
+            self.wait_total[priority] += waited
+            self.wait_max[priority] = max(self.wait_max[priority], waited)
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE, blocking: bool = True) -> Optional[float]:
+        """Waits for a request, returns the tokens charged for it, or None when not blocking and none is free."""
+        started = time.monotonic()
+        waker = threading.Event()
+        with self._lock:
+            ticket = self._enqueue(priority, waker)
+        try:
+            while True:
+                with self._lock:
+                    waker.clear()
+                    wait = self._try_grant(ticket)
+                    charged = self._tokens_per_call
+                    if wait != 0 and not blocking:
+                        self._dequeue(ticket)
+                        return None
+                if wait == 0:
+                    break
+                waker.wait(wait)
+        except BaseException:
+            with self._lock:
+                if ticket in self._wakers:
+                    self._dequeue(ticket)
+            raise
+        self._record_wait(priority, started)
+        return charged
+
+    async def aacquire(self, priority: Priority = Priority.INTERACTIVE, blocking: bool = True) -> Optional[float]:
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = loop.create_future()
+            ticket = self._enqueue(priority, (loop, future))
+        try:
+            while True:
+                with self._lock:
+                    future = self._wakers[ticket][1]
+                    if future.done():
+                        future = loop.create_future()
+                        self._wakers[ticket] = (loop, future)
+                    wait = self._try_grant(ticket)
+                    charged = self._tokens_per_call
+                    if wait != 0 and not blocking:
+                        self._dequeue(ticket)
+                        return None
+                if wait == 0:
+                    break
+                await asyncio.wait([future], timeout=wait)
+        except BaseException:
+            # Cancelled while queued, don't hold up the calls behind
+            with self._lock:
+                if ticket in self._wakers:
+                    self._dequeue(ticket)
+            raise
+        self._record_wait(priority, started)
+        return charged
+
+    def record_tokens(self, tokens: int, charged: float):
+        """Charges the usage a call reported, less the estimate acquire charged when it was let through."""
+        with self._lock:
+            self._tokens -= tokens - charged
+            self.tokens_used += tokens
+            self._tokens_per_call = 0.9 * self._tokens_per_call + 0.1 * tokens if self._tokens_per_call else tokens
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._refill()
+            return {
+                "requests_available": round(self._requests, 2),
+                "tokens_available": round(self._tokens),
+                "queued": {priority.name.lower(): sum(t[0] == priority for t in self._queue) for priority in Priority},
+                "granted": {priority.name.lower(): self.granted[priority] for priority in Priority},
+                "avg_wait": {
+                    priority.name.lower(): self.wait_total[priority] / self.granted[priority] if self.granted[priority] else 0.0
+                    for priority in Priority
+                },
+                "max_wait": {priority.name.lower(): self.wait_max[priority] for priority in Priority},
+                "tokens_used": self.tokens_used,
+            }
+
+
+class _BoundRateLimiter(BaseRateLimiter):
+    def __init__(self, limiter: PriorityRateLimiter, priority: Priority):
+        self.limiter = limiter
+        self.priority = priority
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        return _track(self.limiter.acquire(self.priority, blocking=blocking))
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        return _track(await self.limiter.aacquire(self.priority, blocking=blocking))
+
+
+def _track(charged: Optional[float]) -> bool:
+    charges = _charges.get()
+    if charged is not None and charges is not None:
+        charges.append(charged)
+    return charged is not None
+
+
+class _UsageHandler(BaseCallbackHandler):
+    """
+    Charges the tokens a chat model reports to the limiter. Only calls the limiter let through
+    are charged, a cache hit never reaches it; the calls of one batch take the charges in order.
+    """
+
+    run_inline = True
+
+    def __init__(self, limiter: PriorityRateLimiter):
+        self.limiter = limiter
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: list, **kwargs: Any):
+        # Set in the caller's context before the model acquires, so its charges land in this list
+        _charges.set([])
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any):
+        charges = _charges.get()
+        if not charges:
+            return
+        charged = charges.pop(0)
+        usages = [
+            generation.message.usage_metadata
+            for generations in response.generations
+            for generation in generations
+            if getattr(getattr(generation, "message", None), "usage_metadata", None)
+        ]
+        # Without reported usage the estimate stays charged
+        if usages:
+            self.limiter.record_tokens(sum(usage["total_tokens"] for usage in usages), charged)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapses whitespace so cosmetic differences in prompts hit the same entry."""
+    return " ".join(prompt.split())
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache shared by all LLM call sites of the process.
+    Every entry carries its own expiry, so each call site picks its TTL, and the
+    table is kept under max_entries by evicting the least recently used rows.
+    Hits only note the access time in memory, the notes are written in one transaction
+    once flush_every keys are pending and before evicting. The database is opened on first use.
+    The hit/miss counts per call site are logged every log_every lookups (0 never).
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000, flush_every: int = 100, log_every: int = 100):
+        self.path = path
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.log_every = log_every
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # key -> last hit time not yet written to accessed_at
+        self._accessed: dict[str, float] = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Opens the database and creates the table, called with the lock held."""
+        if self._conn is not None:
+            return self._conn
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+        self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(prompt: str, model: str, **params: Any) -> str:
+        payload = json.dumps(
+            {"prompt": normalize_prompt(prompt), "model": model, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        value = self._get(key, call_site)
+        if self.log_every and (sum(self.hits.values()) + sum(self.misses.values())) % self.log_every == 0:
+            self.log_stats()
+        return value
+
+    def _get(self, key: str, call_site: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses[call_site] += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self.flush_every:
+                self._flush_accessed()
+                conn.commit()
+            self.hits[call_site] += 1
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            self._accessed.pop(key, None)
+            self._evict()
+            conn.commit()
+
+    async def aget(self, key: str, call_site: str = "default") -> Optional[str]:
+        """`get` on a worker thread, so the event loop doesn't wait for SQLite."""
+        return await asyncio.to_thread(self.get, key, call_site)
+
+    async def aset(self, key: str, value: str, ttl: float):
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def _flush_accessed(self):
+        self._conn.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            # Recent hits must count before picking the least recently used rows
+            self._flush_accessed()
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            self._accessed.clear()
+            conn.commit()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Hit/miss counters per call site since the process started."""
+        result = {}
+        for call_site in set(self.hits) | set(self.misses):
+            hits, misses = self.hits[call_site], self.misses[call_site]
+            result[call_site] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+        return result
+
+    def log_stats(self):
+        for call_site, counts in sorted(self.stats().items()):
+            logger.info(
+                "response cache %s: %d hits, %d misses, hit rate %.0f%%",
+                call_site, counts["hits"], counts["misses"], counts["hit_rate"] * 100,
+            )
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Adapts ResponseCache to LangChain's cache interface so it can be passed as
+    `cache=` to a chat model. LangChain already includes the model name and
+    parameters in llm_string, so they become part of the key.
+    """
+
+    def __init__(self, response_cache: ResponseCache, call_site: str, ttl: float):
+        self.response_cache = response_cache
+        self.call_site = call_site
+        self.ttl = ttl
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.response_cache.get(self.response_cache.make_key(prompt, llm_string), self.call_site)
+        if value is None:
+            return None
+        return loads(value, allowed_objects="core")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.response_cache.set(self.response_cache.make_key(prompt, llm_string), dumps(list(return_val)), self.ttl)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.response_cache.clear()
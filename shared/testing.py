@@ -0,0 +1,110 @@
+"""Stand-ins for the Gemini API and the Chainlit runtime, for tests of the chat apps."""
+import asyncio
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+
+class StubGemini:
+    """
+    Answers every ChatGoogleGenerativeAI call after delay seconds without the API: structured
+    output calls get an empty JSON object, the rest a fixed reply. peak is the largest number
+    of calls that were in flight at once.
+    """
+
+    def __init__(self, delay: float = 0.2, reply: str = "Розкажи більше."):
+        self.delay = delay
+        self.reply = reply
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _result(self, kwargs: dict) -> ChatResult:
+        content = "{}" if kwargs.get("response_mime_type") == "application/json" else self.reply
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content))])
+
+    def install(self, monkeypatch):
+        stub = self
+
+        def _generate(model, messages, stop=None, run_manager=None, **kwargs):
+            with stub._call():
+                time.sleep(stub.delay)
+            return stub._result(kwargs)
+
+        async def _agenerate(model, messages, stop=None, run_manager=None, **kwargs):
+            with stub._call():
+                await asyncio.sleep(stub.delay)
+            return stub._result(kwargs)
+
+        monkeypatch.setattr(ChatGoogleGenerativeAI, "_generate", _generate)
+        monkeypatch.setattr(ChatGoogleGenerativeAI, "_agenerate", _agenerate)
+        # Without a streaming implementation every call goes through the two above
+        monkeypatch.setattr(ChatGoogleGenerativeAI, "_stream", BaseChatModel._stream)
+        monkeypatch.setattr(ChatGoogleGenerativeAI, "_astream", BaseChatModel._astream)
+        return self
+
+
+class _UserSession(dict):
+    def set(self, key, value):
+        self[key] = value
+
+
+class _Message:
+    def __init__(self, chainlit: "FakeChainlit", content: str = ""):
+        self.chainlit = chainlit
+        self.content = content
+
+    async def stream_token(self, token: str):
+        self.content += token
+
+    async def send(self):
+        self.chainlit.replies[self.chainlit.context.session.id].append(self.content)
+
+
+class FakeChainlit:
+    """
+    The parts of the chainlit module the apps use. Each asyncio task that calls start is one
+    chat session; replies holds the messages sent to every session.
+    """
+
+    LangchainCallbackHandler = BaseCallbackHandler
+
+    def __init__(self):
+        self._session = contextvars.ContextVar("chainlit_session")
+        self.replies: dict[str, list[str]] = defaultdict(list)
+
+    def start(self, session_id: str):
+        self._session.set(SimpleNamespace(id=session_id, user_session=_UserSession()))
+
+    @property
+    def context(self):
+        return SimpleNamespace(session=self._session.get())
+
+    @property
+    def user_session(self) -> _UserSession:
+        return self._session.get().user_session
+
+    def Message(self, content: str = "") -> _Message:
+        return _Message(self, content)
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from chatbot import InteractiveSpeakerPrepAgent
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class StepExecutor:
+    """Runs the blocking steps of InteractiveSpeakerPrepAgent off the event loop.
+
+    Steps are executed in a bounded thread pool so a slow LLM or Tavily call
+    only occupies one worker. Steps of the same session are serialized with a
+    per-session lock, since they all mutate the same agent state.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = int(os.getenv("STEP_EXECUTOR_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-step")
+        # A lock is dropped as soon as no handler of its session holds or awaits it
+        self._session_locks = weakref.WeakValueDictionary()
+
+    def session_lock(self, session_id: str) -> asyncio.Lock:
+        """Returns the lock serializing message handling for the given session."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    async def execute_step(self, agent: InteractiveSpeakerPrepAgent, step: str) -> Optional[str]:
+        """Executes a conversation step in the thread pool and returns its response."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, agent._execute_step, step)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
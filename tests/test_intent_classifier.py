@@ -0,0 +1,78 @@
+import pytest
+
+import chatbot
+from shared.intent_classifier import IntentClassifier
+
+EXAMPLES = {
+    "APPROVE": ["так", "добре", "чудово", "все добре", "все ок", "ok"],
+    "MODIFY": ["зміни", "додай ще", "не так", "погано"],
+}
+
+
+def make_classifier(log_path: str = "") -> IntentClassifier:
+    return IntentClassifier("test_intent", EXAMPLES, threshold=0.9, log_path=log_path)
+
+
+def test_seed_examples_are_answered_verbatim():
+    classifier = make_classifier()
+    assert classifier.classify("Так") == ("APPROVE", 1.0)
+    assert classifier.classify("не так") == ("MODIFY", 1.0)
+
+
+@pytest.mark.parametrize("text", ["не добре", "не чудово", "не все ок", "not ok", "don't", "ні, добре"])
+def test_negated_turns_go_to_the_llm(text):
+    classifier = make_classifier()
+    assert classifier.classify(text) == (None, 0.0)
+    assert classifier.predict(text, lambda: "MODIFY") == "MODIFY"
+    assert classifier.fallbacks == 1
+
+
+@pytest.mark.parametrize("text", ["все жахливо", "жахливо", "добре, але скороти"])
+def test_unseen_words_go_to_the_llm(text):
+    classifier = make_classifier()
+    assert classifier.classify(text) == (None, 0.0)
+
+
+def test_known_words_are_classified_locally():
+    classifier = make_classifier()
+    label, confidence = classifier.classify("все чудово")
+    assert label == "APPROVE" and confidence >= 0.9
+    assert classifier.predict("все чудово", lambda: pytest.fail("LLM called")) == "APPROVE"
+
+
+def test_conflicting_seed_examples_are_left_to_the_model():
+    classifier = IntentClassifier("test_intent", {"A": ["так"], "B": ["так", "ні"]}, log_path="")
+    assert classifier.exact["так"] is None
+
+
+def test_llm_labels_are_logged_and_retrained(tmp_path):
+    log_path = str(tmp_path / "turns.jsonl")
+    classifier = make_classifier(log_path=log_path)
+    classifier.predict("все жахливо", lambda: "MODIFY")
+    retrained = make_classifier(log_path=log_path)
+    assert "w:жахливо" in retrained.vocabulary
+    assert retrained.load_log(log_path) == [("все жахливо", "MODIFY")]
+
+
+@pytest.mark.parametrize(
+    "classifier, text, label",
+    [
+        ("recommendation_intents", "не все добре", "MODIFY"),
+        ("audience_intents", "не все вірно", "CHANGE"),
+        ("audience_intents", "все погано", "CHANGE"),
+        ("knowledge_intents", "не все вірно", "CORRECT_KNOWLEDGE"),
+    ],
+)
+def test_chatbot_negative_replies_are_not_approvals(classifier, text, label):
+    assert getattr(chatbot, classifier).predict(text, lambda: "UNCLEAR") == label
+
+
+def test_stats_are_logged_every_log_every_turns(caplog):
+    classifier = IntentClassifier("test_intent", EXAMPLES, threshold=0.9, log_path="", log_every=2)
+    with caplog.at_level("INFO", logger="shared.intent_classifier"):
+        classifier.predict("так", lambda: pytest.fail("LLM called"))
+        assert not caplog.records
+        classifier.predict("все жахливо", lambda: "MODIFY")
+    assert [record.getMessage() for record in caplog.records] == [
+        "intent classifier test_intent: 1 local, 1 LLM fallbacks, hit rate 50%"
+    ]
@@ -0,0 +1,67 @@
+import asyncio
+
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+
+from shared.rate_limiter import Priority, PriorityRateLimiter
+
+
+def frozen_limiter(monkeypatch, **kwargs) -> PriorityRateLimiter:
+    limiter = PriorityRateLimiter(**kwargs)
+    monkeypatch.setattr(limiter, "_refill", lambda: None)
+    return limiter
+
+
+def test_usage_is_corrected_by_the_estimate_charged(monkeypatch):
+    limiter = frozen_limiter(monkeypatch, tokens_per_minute=6_000_000)
+    full = limiter._tokens
+    first = limiter.acquire()
+    limiter.record_tokens(1000, first)
+    slow = limiter.acquire()
+    fast = limiter.acquire()
+    # The average moves while the slow call is still running
+    limiter.record_tokens(5000, fast)
+    limiter.record_tokens(800, slow)
+    assert (first, slow, fast) == (0, 1000, 1000)
+    assert limiter._tokens == full - 6800
+    assert limiter.tokens_used == 6800
+
+
+def test_non_blocking_acquire_reports_no_charge(monkeypatch):
+    limiter = frozen_limiter(monkeypatch, requests_per_minute=60, burst=1, interactive_reserve=0)
+    assert limiter.acquire(blocking=False) == 0
+    assert limiter.acquire(blocking=False) is None
+    assert limiter.bind(Priority.INTERACTIVE).acquire(blocking=False) is False
+
+
+def fake_model(limiter: PriorityRateLimiter) -> FakeMessagesListChatModel:
+    reply = AIMessage("ok", usage_metadata={"input_tokens": 20, "output_tokens": 10, "total_tokens": 30})
+    return FakeMessagesListChatModel(
+        responses=[reply],
+        cache=InMemoryCache(),
+        rate_limiter=limiter.bind(Priority.INTERACTIVE),
+        callbacks=[limiter.usage_handler],
+    )
+
+
+def test_cache_hits_are_not_charged():
+    limiter = PriorityRateLimiter(requests_per_minute=600, tokens_per_minute=600_000)
+    model = fake_model(limiter)
+    model.invoke("привіт")
+    model.invoke("привіт")
+    assert limiter.granted[Priority.INTERACTIVE] == 1
+    assert limiter.tokens_used == 30
+
+
+def test_async_calls_are_charged_once_each():
+    limiter = PriorityRateLimiter(requests_per_minute=600, tokens_per_minute=600_000)
+    model = fake_model(limiter)
+
+    async def run():
+        await asyncio.gather(model.ainvoke("один"), model.ainvoke("два"))
+        await model.ainvoke("один")
+
+    asyncio.run(run())
+    assert limiter.granted[Priority.INTERACTIVE] == 2
+    assert limiter.tokens_used == 60
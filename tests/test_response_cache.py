@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sqlite3
+import threading
+
+from shared.response_cache import ResponseCache
+
+
+def accessed_at(path: str, key: str) -> float:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path)
+    assert not os.path.exists(path)
+    assert cache.get("missing") is None
+    assert os.path.exists(path)
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.set("fresh", "a", ttl=60)
+    cache.set("stale", "b", ttl=-1)
+    assert cache.get("fresh", "site") == "a"
+    assert cache.get("stale", "site") is None
+    assert cache.stats()["site"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_hits_are_written_in_batches(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path, flush_every=3)
+    for key in "abc":
+        cache.set(key, key, ttl=60)
+    written = accessed_at(path, "a")
+
+    cache.get("a")
+    cache.get("b")
+    assert accessed_at(path, "a") == written
+    cache.get("c")
+    assert accessed_at(path, "a") > written
+    assert not cache._accessed
+
+
+def test_pending_hits_count_for_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.set("old", "1", ttl=60)
+    cache.set("new", "2", ttl=60)
+    cache.get("old")
+    cache.set("newest", "3", ttl=60)
+    assert cache.get("old") == "1"
+    assert cache.get("new") is None
+
+
+def test_async_calls_run_off_the_event_loop(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    threads = []
+    get = cache.get
+
+    def recording_get(*args):
+        threads.append(threading.current_thread())
+        return get(*args)
+
+    cache.get = recording_get
+
+    async def main():
+        await cache.aset("key", "value", ttl=60)
+        return await cache.aget("key")
+
+    assert asyncio.run(main()) == "value"
+    assert threads and threading.main_thread() not in threads
+
+
+def test_stats_are_logged_every_log_every_lookups(tmp_path, caplog):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), log_every=3)
+    cache.set("key", "value", ttl=60)
+    with caplog.at_level("INFO", logger="shared.response_cache"):
+        for _ in range(2):
+            cache.get("key", "intent")
+        assert not caplog.records
+        cache.get("missing", "research")
+    assert [record.getMessage() for record in caplog.records] == [
+        "response cache intent: 2 hits, 0 misses, hit rate 100%",
+        "response cache research: 0 hits, 1 misses, hit rate 0%",
+    ]
@@ -0,0 +1,105 @@
+import asyncio
+import gc
+import threading
+import time
+
+from step_executor import StepExecutor
+
+
+class BlockingAgent:
+    """Stands in for InteractiveSpeakerPrepAgent: every step blocks until released."""
+
+    def __init__(self, tracker: "Tracker"):
+        self.tracker = tracker
+
+    def _execute_step(self, step: str) -> str:
+        with self.tracker.lock:
+            self.tracker.running += 1
+            self.tracker.peak = max(self.tracker.peak, self.tracker.running)
+        self.tracker.release.wait(5)
+        with self.tracker.lock:
+            self.tracker.running -= 1
+        return step
+
+
+class Tracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.running = 0
+        self.peak = 0
+
+    async def wait_running(self, count: int):
+        deadline = time.monotonic() + 5
+        while self.running < count and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        # Give any step beyond the expected ones the chance to start
+        await asyncio.sleep(0.1)
+
+
+def test_max_workers_bound_the_pool(monkeypatch):
+    monkeypatch.setenv("STEP_EXECUTOR_MAX_WORKERS", "2")
+    executor = StepExecutor()
+    tracker = Tracker()
+
+    async def run():
+        steps = [asyncio.create_task(executor.execute_step(BlockingAgent(tracker), f"step{i}")) for i in range(5)]
+        await tracker.wait_running(2)
+        peak = tracker.peak
+        tracker.release.set()
+        return peak, await asyncio.gather(*steps)
+
+    peak, responses = asyncio.run(run())
+    executor.shutdown()
+    assert executor.max_workers == 2 and peak == 2
+    assert responses == [f"step{i}" for i in range(5)]
+
+
+def test_steps_of_one_session_are_serialized():
+    executor = StepExecutor(max_workers=8)
+    tracker = {session: Tracker() for session in ("a", "b")}
+
+    async def handle(session: str):
+        async with executor.session_lock(session):
+            return await executor.execute_step(BlockingAgent(tracker[session]), session)
+
+    async def run():
+        handlers = [asyncio.create_task(handle(session)) for session in ("a", "a", "a", "b", "b")]
+        await tracker["a"].wait_running(1)
+        await tracker["b"].wait_running(1)
+        # One step of each session runs, the other sessions' steps are not held up
+        running = (tracker["a"].running, tracker["b"].running)
+        tracker["a"].release.set()
+        tracker["b"].release.set()
+        await asyncio.gather(*handlers)
+        return running
+
+    assert asyncio.run(run()) == (1, 1)
+    assert tracker["a"].peak == 1 and tracker["b"].peak == 1
+    executor.shutdown()
+
+
+def test_session_lock_lives_while_held_or_awaited():
+    executor = StepExecutor(max_workers=2)
+    tracker = Tracker()
+
+    async def handle():
+        async with executor.session_lock("s"):
+            await executor.execute_step(BlockingAgent(tracker), "step")
+
+    async def run():
+        holder = asyncio.create_task(handle())
+        waiter = asyncio.create_task(handle())
+        await tracker.wait_running(1)
+        gc.collect()
+        # Nothing but the two handlers refers to the lock, it must still be the one they use
+        lock = executor.session_lock("s")
+        assert lock.locked()
+        del lock
+        tracker.release.set()
+        await asyncio.gather(holder, waiter)
+
+    asyncio.run(run())
+    gc.collect()
+    assert "s" not in executor._session_locks
+    executor.shutdown()
@@ -2,16 +2,21 @@
 from src.agent import InteractiveSpeakerPrepAgent
 from src.services.llm_service import LanguageModelService
 from src.services.search_service import SearchService
+from shared.response_cache import ResponseCache
+from shared.rate_limiter import PriorityRateLimiter
 from src.ui.command_line_ui import CommandLineUI
-from src.config import LLM_MODEL_NAME
+from src.config import LLM_MODEL_NAME, LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES
 
 def main():
     """Main function to initialize and run the interactive agent."""
     print("🚀 Запуск інтерактивного агента підготовки до виступу")
+    response_cache = None
 
     try:
         # 1. Initialize services (external dependencies)
-        llm_service = LanguageModelService(model_name=LLM_MODEL_NAME)
+        response_cache = ResponseCache(LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES)
+        rate_limiter = PriorityRateLimiter.from_env()
+        llm_service = LanguageModelService(model_name=LLM_MODEL_NAME, cache=response_cache, rate_limiter=rate_limiter)
         search_service = SearchService(max_results=5)
 
         # 2. Initialize the user interface
@@ -34,5 +39,10 @@ def main():
         print(f"❌ Помилка ініціалізації: {e}")
         print("Перевірте налаштування API ключів (GOOGLE_API_KEY, TAVILY_API_KEY) та з'єднання з інтернетом.")
 
+    finally:
+        if response_cache is not None:
+            for call_site, counts in sorted(response_cache.stats().items()):
+                print(f"📊 Кеш відповідей {call_site}: {counts['hits']} влучань, {counts['misses']} промахів")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The `shared` package lives in the repo root, one level above the app
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
@@ -1,2 +1,7 @@
 # src/config.py
-LLM_MODEL_NAME = "models/gemma-3-27b-it"
\ No newline at end of file
+LLM_MODEL_NAME = "models/gemma-3-27b-it"
+
+# Persistent cache for deterministic LLM calls
+LLM_CACHE_PATH = "llm_cache.sqlite"
+LLM_CACHE_MAX_ENTRIES = 10_000
+INTENT_CACHE_TTL = 7 * 24 * 60 * 60  # one-word intent classifications
@@ -1,18 +1,49 @@
 # src/services/llm_service.py
+from typing import Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
+from shared.rate_limiter import Priority, PriorityRateLimiter
+from shared.response_cache import ResponseCache
 
 class LanguageModelService:
     """A wrapper for the language model to decouple it from the main application."""
-    def __init__(self, model_name: str, temperature: float = 0.7):
-        self.llm = ChatGoogleGenerativeAI(model=model_name, temperature=temperature)
+    def __init__(
+        self,
+        model_name: str,
+        temperature: float = 0.7,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[PriorityRateLimiter] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
+        """
+        Calls wait for the shared rate limiter, when one is given, at the service's priority.
+        Cached calls go to a temperature 0 copy of the model, a sampled reply is not worth reusing.
+        """
+        self.model_name = model_name
+        self.temperature = temperature
+        self.cache = cache
+        limits = {"rate_limiter": rate_limiter.bind(priority), "callbacks": [rate_limiter.usage_handler]} if rate_limiter else {}
+        self.llm = ChatGoogleGenerativeAI(model=model_name, temperature=temperature, **limits)
+        self.deterministic_llm = ChatGoogleGenerativeAI(model=model_name, temperature=0, **limits) if cache else None
 
-    def invoke(self, prompt: str) -> str:
-        """Invokes the language model with a given prompt."""
+    def invoke(self, prompt: str, cache_ttl: Optional[float] = None, call_site: str = "default") -> str:
+        """
+        Invokes the language model with a given prompt.
+        Call sites with deterministic answers pass cache_ttl to reuse responses across sessions.
+        """
+        use_cache = self.cache is not None and cache_ttl is not None
+        llm = self.deterministic_llm if use_cache else self.llm
+        if use_cache:
+            key = self.cache.make_key(prompt, self.model_name, temperature=0)
+            cached = self.cache.get(key, call_site)
+            if cached is not None:
+                return cached
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            return response.content
+            response = llm.invoke([HumanMessage(content=prompt)])
         except Exception as e:
             # Handle potential API errors gracefully
             print(f"LLM Error: {e}")
-            return "Вибачте, виникла помилка при обробці вашого запиту."
\ No newline at end of file
+            return "Вибачте, виникла помилка при обробці вашого запиту."
+        if use_cache:
+            self.cache.set(key, response.content, cache_ttl)
+        return response.content
@@ -1,6 +1,6 @@
 # src/state.py
 from typing import Dict, List, TypedDict, Annotated
-from langchain.schema import BaseMessage
+from langchain_core.messages import BaseMessage
 import operator
 
 # State is now in its own file for clarity and reuse.
@@ -3,6 +3,12 @@ from src.steps.base_step import RepeatingStep
 from src.state import AgentState
 from src.services.llm_service import LanguageModelService
 from src.services.search_service import SearchService
+from shared.intent_classifier import IntentClassifier
+from shared.intent_examples import FEEDBACK_INTENT_EXAMPLES
+from src.config import INTENT_CACHE_TTL
+
+# Shared by all feedback loops: answers short replies locally, everything else goes to the LLM
+feedback_intents = IntentClassifier("v2_feedback_intent", FEEDBACK_INTENT_EXAMPLES, threshold=0.9)
 
 class ProcessFeedbackStep(RepeatingStep):
     """
@@ -36,7 +42,10 @@ class ProcessFeedbackStep(RepeatingStep):
 
         Відповідь лише одним словом: CONTINUE, MODIFY, REGENERATE, або UNCLEAR.
         """
-        intent = llm_service.invoke(intent_prompt).strip().upper()
+        intent = feedback_intents.predict(
+            user_feedback,
+            lambda: llm_service.invoke(intent_prompt, cache_ttl=INTENT_CACHE_TTL, call_site="feedback_intent").strip().upper(),
+        )
 
         if intent == "CONTINUE":
             state[self.approval_flag] = True
@@ -3,6 +3,12 @@ from src.steps.base_step import RepeatingStep
 from src.state import AgentState
 from src.services.llm_service import LanguageModelService
 from src.services.search_service import SearchService
+from shared.intent_classifier import IntentClassifier
+from shared.intent_examples import GREETING_INTENT_EXAMPLES
+from src.config import INTENT_CACHE_TTL
+
+# Answers short replies locally, everything else goes to the LLM
+greeting_intents = IntentClassifier("v2_greeting_intent", GREETING_INTENT_EXAMPLES, threshold=0.9)
 
 class ProcessGreetingResponseStep(RepeatingStep):
     """
@@ -27,7 +33,10 @@ class ProcessGreetingResponseStep(RepeatingStep):
         - UNCLEAR: відповідь незрозуміла або потребує уточнення
         Відповідь лише одним словом: POSITIVE, NEGATIVE, або UNCLEAR
         """
-        intent = llm_service.invoke(analysis_prompt).strip().upper()
+        intent = greeting_intents.predict(
+            user_response,
+            lambda: llm_service.invoke(analysis_prompt, cache_ttl=INTENT_CACHE_TTL, call_site="greeting_intent").strip().upper(),
+        )
 
         if intent == "POSITIVE":
             state[self.approval_flag] = True
@@ -0,0 +1,19 @@
+import pytest
+
+from src.steps.process_feedback import feedback_intents
+from src.steps.process_greeting_response import greeting_intents
+
+
+@pytest.mark.parametrize("text", ["не все вірно", "не все добре", "все погано", "не дуже добре"])
+def test_negative_feedback_does_not_continue(text):
+    assert feedback_intents.predict(text, lambda: "MODIFY") == "MODIFY"
+
+
+@pytest.mark.parametrize("text", ["так", "все вірно", "давай далі"])
+def test_approval_is_answered_locally(text):
+    assert feedback_intents.predict(text, lambda: pytest.fail("LLM called")) == "CONTINUE"
+
+
+@pytest.mark.parametrize("text, intent", [("так", "POSITIVE"), ("ні, дякую", "NEGATIVE"), ("не те щоб", "UNCLEAR")])
+def test_greeting_replies(text, intent):
+    assert greeting_intents.predict(text, lambda: "UNCLEAR") == intent
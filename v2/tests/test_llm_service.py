@@ -0,0 +1,26 @@
+from langchain_core.messages import AIMessage
+
+from shared.response_cache import ResponseCache
+from src.services.llm_service import LanguageModelService
+
+
+class StubModel:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(self.reply)
+
+
+def test_cached_calls_use_a_deterministic_model(tmp_path):
+    service = LanguageModelService("gemini-test", cache=ResponseCache(str(tmp_path / "cache.sqlite")))
+    assert service.deterministic_llm.temperature == 0
+    service.llm, service.deterministic_llm = StubModel("sampled"), StubModel("CONTINUE")
+
+    for _ in range(2):
+        assert service.invoke("intent?", cache_ttl=60, call_site="intent") == "CONTINUE"
+    assert service.deterministic_llm.calls == 1
+    assert service.invoke("reply?") == "sampled"
+    assert service.llm.calls == 1
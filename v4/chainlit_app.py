@@ -1,6 +1,6 @@
 import chainlit as cl
 from src.graph import graph
-from langchain.schema.runnable.config import RunnableConfig
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage
 
 
@@ -10,7 +10,7 @@ async def on_start():
     cb = cl.LangchainCallbackHandler()
     final_answer = cl.Message(content="")
     
-    for msg, metadata in graph.stream({}, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
+    async for msg, metadata in graph.astream({}, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
         if (
             msg.content
         ):
@@ -24,10 +24,10 @@ async def on_message(msg: HumanMessage):
     config = {"configurable": {"thread_id": cl.context.session.id}}
     cb = cl.LangchainCallbackHandler()
     final_answer = cl.Message(content="")
-    next_node, = graph.get_state(config).next
+    next_node, = (await graph.aget_state(config)).next
     
-    graph.update_state(config, {"messages": msg.content}, next_node)
-    for msg, metadata in graph.stream(None, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
+    await graph.aupdate_state(config, {"messages": msg.content}, next_node)
+    async for msg, metadata in graph.astream(None, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
         if (
             msg.content
         ):
@@ -1,6 +1,18 @@
 from typing import Literal
 from src.llm_service import llm_service
 from src.graph_state import GraphState
+from shared.intent_classifier import IntentClassifier
+from shared.intent_examples import GREETING_EVENT_EXAMPLES, GREETING_INTENT_EXAMPLES as GREETING_EXAMPLES
+
+# The LLM is asked to read unclear replies as NEGATIVE here
+GREETING_INTENT_EXAMPLES = {
+    "POSITIVE": GREETING_EXAMPLES["POSITIVE"],
+    "EVENT": GREETING_EVENT_EXAMPLES,
+    "NEGATIVE": GREETING_EXAMPLES["NEGATIVE"] + GREETING_EXAMPLES["UNCLEAR"],
+}
+
+# Answers short replies locally, everything else goes to the LLM
+greeting_intents = IntentClassifier("v4_greeting_intent", GREETING_INTENT_EXAMPLES, threshold=0.9)
 
 def analyse_greeting_feedback(state: GraphState) -> Literal["goodbye", "ask_event", "final"]:
     user_message = state["messages"][-1]
@@ -12,7 +24,10 @@ def analyse_greeting_feedback(state: GraphState) -> Literal["goodbye", "ask_even
     - NEGATIVE: відповів негативно або незрозуміло
     Відповідь лише одним словом: POSITIVE, NEGATIVE, або EVENT
     """
-    intent = llm_service.invoke(analysis_prompt).strip().upper()
+    intent = greeting_intents.predict(
+        user_message.content,
+        lambda: llm_service.invoke(analysis_prompt).strip().upper(),
+    )
     
     if intent == "POSITIVE":
         return "ask_event"
@@ -1,6 +1,6 @@
 from langgraph.graph import StateGraph, END, START
 from langgraph.checkpoint.memory import MemorySaver
-from graph_state import GraphState
+from src.graph_state import GraphState
 import src.nodes as nodes
 import src.conditions as conditions
 
@@ -1,4 +1,4 @@
-from graph_state import GraphState
+from src.graph_state import GraphState
 from langchain_core.messages import AIMessage
 
 
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+import pytest
+
+import chainlit_app as app
+from shared.testing import FakeChainlit, StubGemini
+
+SESSIONS = 5
+
+
+@pytest.fixture
+def chainlit(monkeypatch):
+    fake = FakeChainlit()
+    monkeypatch.setattr(app, "cl", fake)
+    return fake
+
+
+def test_sessions_progress_together(chainlit, monkeypatch):
+    # Left to the LLM by the intent classifier, which answers POSITIVE
+    stub = StubGemini(delay=0.3, reply="POSITIVE").install(monkeypatch)
+
+    async def chat(session_id: str):
+        chainlit.start(session_id)
+        await app.on_start()
+        await app.on_message(chainlit.Message("мабуть, розповім пізніше"))
+
+    async def run():
+        await asyncio.gather(*(chat(f"v4-{i}") for i in range(SESSIONS)))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    # Every session waits on the model at the same time instead of one after another
+    assert stub.peak == SESSIONS
+    assert elapsed < stub.calls * stub.delay / 2
+    for i in range(SESSIONS):
+        greeting, reply = chainlit.replies[f"v4-{i}"]
+        assert greeting.startswith("Привіт!") and reply.endswith("Вау, круто")
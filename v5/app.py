@@ -1,17 +1,20 @@
+import asyncio
+import logging
 import chainlit as cl
-from src.graph import graph
-from langchain.schema.runnable import Runnable
-from langchain.schema.runnable.config import RunnableConfig
+from src.graph import graph, extract_in_background
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage, ToolMessage
 from typing import cast
 
+logger = logging.getLogger(__name__)
+
 @cl.on_chat_start
 async def on_start():
     config = {"configurable": {"thread_id": cl.context.session.id}}
     cb = cl.LangchainCallbackHandler()
     final_answer = cl.Message(content="")
     
-    for msg, _ in graph.stream({}, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
+    async for msg, _ in graph.astream({}, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
         if (msg.content):
             await final_answer.stream_token(msg.content)
 
@@ -22,7 +25,10 @@ async def on_message(message: cl.Message):
     config = {"configurable": {"thread_id": cl.context.session.id}}    
     final_answer = cl.Message(content="")
 
-    for msg, metadata in graph.stream({"messages": [HumanMessage(content=message.content)]}, stream_mode="messages", config=config):
+    # The previous turn's extraction must land in the state before the interview reads the event
+    await reconcile_extraction()
+
+    async for msg, metadata in graph.astream({"messages": [HumanMessage(content=message.content)]}, stream_mode="messages", config=config):
         if (
             msg.content
             and not isinstance(msg, HumanMessage)
@@ -31,3 +37,21 @@ async def on_message(message: cl.Message):
             await final_answer.stream_token(msg.content)
 
     await final_answer.send()
+
+    cl.user_session.set("extraction_task", asyncio.create_task(extract_in_background(config)))
+
+async def reconcile_extraction():
+    task = cl.user_session.get("extraction_task")
+    if task is None:
+        return
+    cl.user_session.set("extraction_task", None)
+    try:
+        await task
+    except Exception:
+        logger.exception("Background event extraction failed")
+
+@cl.on_chat_end
+async def on_end():
+    task = cl.user_session.get("extraction_task")
+    if task is not None:
+        task.cancel()
@@ -16,6 +16,8 @@ llm_with_tools = llm.bind_tools(tools)
 
 class GraphState(MessagesState):
     event: EventDetails
+    # Messages before this index are already reflected in event
+    last_extracted_index: int
 
 memory = MemorySaver()
 builder = StateGraph(GraphState)
@@ -26,23 +28,82 @@ def interview(state: GraphState) -> GraphState:
 
     return {"messages": [llm_with_tools.invoke([HumanMessage(content=sys_prompt)] + state["messages"])]}
 
+# Short replies that never carry new event details on their own
+ACKNOWLEDGEMENTS = {"так", "ні", "ок", "окей", "добре", "згоден", "згодна", "дякую", "супер", "чудово", "ok", "yes", "no"}
+
+def has_new_facts(state: GraphState) -> bool:
+    """
+    True if a user message since the last extraction may carry event details. An acknowledgement
+    counts when it answers a question, e.g. confirms the hypothesis the interviewer proposed.
+    """
+    messages = state["messages"]
+    for index in range(state.get("last_extracted_index", 0), len(messages)):
+        msg = messages[index]
+        if isinstance(msg, HumanMessage):
+            text = msg.content.strip().lower().strip(".,!?) ")
+            if text and (text not in ACKNOWLEDGEMENTS or _answers_question(messages, index)):
+                return True
+    return False
+
+def _answers_question(messages: list, index: int) -> bool:
+    """True if the last assistant reply before messages[index] ended with a question."""
+    for msg in reversed(messages[:index]):
+        if isinstance(msg, AIMessage) and isinstance(msg.content, str) and msg.content.strip():
+            return msg.content.strip().endswith("?")
+    return False
+
 def extract_event_info(state: GraphState) -> GraphState:
-    sys_prompt = prompts.event_extractor_prompt
+    event_info, messages = _extractor_messages(state)
+    if not messages:
+        return {"last_extracted_index": len(state["messages"])}
+
+    structured_llm = llm.with_structured_output(EventDetails)
+    response = structured_llm.invoke(messages)
+    return _extractor_update(state, event_info, response)
+
+async def aextract_event_info(state: GraphState) -> GraphState:
+    event_info, messages = _extractor_messages(state)
+    if not messages:
+        return {"last_extracted_index": len(state["messages"])}
 
-    # Filter out ToolMessages and combine all other messages into a single text
+    structured_llm = llm.with_structured_output(EventDetails)
+    response = await structured_llm.ainvoke(messages)
+    return _extractor_update(state, event_info, response)
+
+def _extractor_messages(state: GraphState) -> tuple[EventDetails, list]:
+    event_info = EventDetails.model_validate(state.get("event") or {})
+    sys_prompt = prompts.event_extractor_prompt.format(event_info=event_info.model_dump())
+
+    # Only messages since the last extraction, without ToolMessages, combined into a single text
+    new_messages = state["messages"][state.get("last_extracted_index", 0):]
     messages_text = "\n\n".join([
         f"{msg.type.upper()}: {msg.content}"
-        for msg in state["messages"]
-        if not isinstance(msg, ToolMessage)
+        for msg in new_messages
+        if not isinstance(msg, ToolMessage) and msg.content
     ])
+    if not messages_text:
+        return event_info, []
 
     # Create a single HumanMessage with the combined text
     combined_message = HumanMessage(content=messages_text)
-    
-    structured_llm = llm.with_structured_output(EventDetails)
-    response = structured_llm.invoke([SystemMessage(content=sys_prompt), combined_message])
+    return event_info, [SystemMessage(content=sys_prompt), combined_message]
+
+def _extractor_update(state: GraphState, event_info: EventDetails, response: EventDetails) -> GraphState:
+    # Fields the new messages did not mention come back empty and keep their current value
+    event = event_info.model_dump()
+    event.update({field: value for field, value in response.model_dump().items() if value})
+    return {"event": event, "last_extracted_index": len(state["messages"])}
 
-    return {"event": response.model_dump()}
+async def extract_in_background(config: dict):
+    """
+    Runs the extraction after the reply has been sent and writes its result back as the
+    "extractor" node. Turns without new user facts are skipped, their messages stay
+    pending and are extracted together with the next turn.
+    """
+    state = (await graph.aget_state(config)).values
+    if not has_new_facts(state):
+        return
+    await graph.aupdate_state(config, await aextract_event_info(state), as_node="extractor")
 
 builder.add_node("interview", interview)
 tool_node = ToolNode(tools=[tool])
@@ -56,7 +117,7 @@ builder.add_conditional_edges(
     tools_condition,
 )
 builder.add_edge("tools", "interview")
-builder.add_edge("interview", "extractor")
+# The extractor is not on the reply path, app.py runs it through extract_in_background
 builder.add_edge("extractor", END)
 
-graph = builder.compile()
+graph = builder.compile(checkpointer=memory)
@@ -49,5 +49,7 @@ context_builder_sys_prompt = """
 """
 
 event_extractor_prompt = """
-Продивись історію повідомлень та збери усі поля які вже відомі з переписки
+Продивись нові повідомлення переписки та збери поля, які з них стали відомі.
+Усе, що було сказано раніше, вже враховано в цих деталях події: {event_info}
+Поля, про які в нових повідомленнях нічого не сказано, залиш порожніми.
 """
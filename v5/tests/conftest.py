@@ -0,0 +1,9 @@
+import os
+import sys
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _APP_DIR)
+# The shared package lives in the repo root
+sys.path.append(os.path.dirname(_APP_DIR))
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+import pytest
+
+import app
+from shared.testing import FakeChainlit, StubGemini
+
+SESSIONS = 5
+
+
+@pytest.fixture
+def chainlit(monkeypatch):
+    fake = FakeChainlit()
+    monkeypatch.setattr(app, "cl", fake)
+    return fake
+
+
+def test_sessions_progress_together(chainlit, monkeypatch):
+    stub = StubGemini(delay=0.3).install(monkeypatch)
+
+    async def chat(session_id: str):
+        chainlit.start(session_id)
+        await app.on_message(chainlit.Message("Виступаю на DevFest Lviv"))
+        # The background extraction of the first turn runs while the second is answered
+        await app.on_message(chainlit.Message("Тема доповіді AI в освіті"))
+        await app.reconcile_extraction()
+
+    async def run():
+        await asyncio.gather(*(chat(f"v5-{i}") for i in range(SESSIONS)))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    # Every session waits on the model at the same time instead of one after another
+    assert stub.peak >= SESSIONS
+    assert elapsed < stub.calls * stub.delay / 2
+    for i in range(SESSIONS):
+        assert chainlit.replies[f"v5-{i}"] == [stub.reply, stub.reply]
@@ -0,0 +1,20 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.event import EventDetails
+from src.graph import _extractor_messages, _extractor_update
+
+TURNS = 30
+
+
+def test_extraction_prompt_stays_flat():
+    state = {"messages": [AIMessage("Привіт! Готуєшся до виступу?")], "last_extracted_index": 0}
+    sizes = []
+    for turn in range(TURNS):
+        state["messages"] = state["messages"] + [HumanMessage(f"Відповідь номер {turn} про мою доповідь на конференції")]
+        event_info, messages = _extractor_messages(state)
+        sizes.append(sum(len(message.content) for message in messages))
+        state.update(_extractor_update(state, event_info, EventDetails(name="DevFest Lviv", theme="AI")))
+        state["messages"] = state["messages"] + [AIMessage(f"Питання номер {turn}: розкажи більше про аудиторію")]
+    # Each extraction sees the event and the messages since the last one, not the whole transcript
+    assert max(sizes[2:]) - min(sizes[2:]) <= 20
+    assert sizes[-1] < sizes[0] * 1.5
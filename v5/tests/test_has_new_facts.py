@@ -0,0 +1,24 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.graph import has_new_facts
+
+
+def test_acknowledgement_of_a_statement_is_skipped():
+    state = {"messages": [AIMessage("Чудово, записав тему."), HumanMessage("дякую")], "last_extracted_index": 1}
+    assert not has_new_facts(state)
+
+
+def test_acknowledgement_of_a_confirmation_question_is_extracted():
+    question = AIMessage("На мою думку, аудиторія вже має досвід у сфері AI. Ти згоден?")
+    state = {"messages": [question, HumanMessage("так")], "last_extracted_index": 1}
+    assert has_new_facts(state)
+    # Tool calls between the question and the answer don't hide it
+    tool_call = AIMessage("", tool_calls=[{"name": "tavily_search", "args": {"query": "DevFest"}, "id": "c1"}])
+    state = {"messages": [question, tool_call, ToolMessage("{}", tool_call_id="c1"), HumanMessage("Так!")], "last_extracted_index": 3}
+    assert has_new_facts(state)
+
+
+def test_other_messages_are_extracted():
+    state = {"messages": [AIMessage("Яка тема?"), HumanMessage("AI в освіті")], "last_extracted_index": 0}
+    assert has_new_facts(state)
+    assert not has_new_facts({**state, "last_extracted_index": 2})
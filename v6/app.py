@@ -1,6 +1,6 @@
 import chainlit as cl
-from src.graph import graph
-from langchain.schema.runnable.config import RunnableConfig
+from src.graph import ainterrupted_subgraph, graph
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage, ToolMessage
 
 @cl.on_chat_start
@@ -9,7 +9,9 @@ async def on_start():
     cb = cl.LangchainCallbackHandler()
     final_answer = cl.Message(content="")
     
-    for msg, _ in graph.stream({}, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
+    # The greeting is returned by interview_node without an LLM call, so it only
+    # shows up in the subgraph's node output, not as streamed tokens
+    async for _, (msg, _) in graph.astream({}, stream_mode="messages", subgraphs=True, config=RunnableConfig(callbacks=[cb], **config)):
         if (msg.content):
             await final_answer.stream_token(msg.content)
 
@@ -20,13 +22,12 @@ async def on_message(msg: cl.Message):
     config = {"configurable": {"thread_id": cl.context.session.id}}
     cb = cl.LangchainCallbackHandler()  
     final_answer = cl.Message(content="")
-    sub_state = graph.get_state(config, subgraphs=True).tasks[0].state
-    sub_cfg = sub_state.config
-    sub_next_node, = sub_state.next
+    sub_cfg, sub_next_node = await ainterrupted_subgraph(config)
     
     
-    graph.update_state(sub_cfg, {"messages": msg.content}, sub_next_node)
-    for msg, _ in graph.stream(None, stream_mode="messages", config=RunnableConfig(callbacks=[cb], **config)):
+    await graph.aupdate_state(sub_cfg, {"messages": msg.content}, sub_next_node)
+    # The reply comes from the interview subgraph, its messages are only streamed with subgraphs=True
+    async for _, (msg, _) in graph.astream(None, stream_mode="messages", subgraphs=True, config=RunnableConfig(callbacks=[cb], **config)):
         if (
             msg.content
             and not isinstance(msg, HumanMessage)
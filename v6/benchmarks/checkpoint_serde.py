@@ -0,0 +1,59 @@
+"""
+Size and speed of the checkpoint serializers on the interview transcript in conversation.md.
+Run from v6: python -m benchmarks.checkpoint_serde
+"""
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import src  # noqa: E402,F401  puts the repo root on sys.path
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage  # noqa: E402
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer  # noqa: E402
+
+from src.checkpointing.serde import STATE_TYPES, CompressedSerializer  # noqa: E402
+from src.state import Event, EventDetails  # noqa: E402
+
+ROUNDS = 200
+
+
+def transcript() -> list:
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "conversation.md")
+    with open(path, encoding="utf-8") as f:
+        turns = [turn.strip() for turn in f.read().split("Avatar for Assistant") if turn.strip()]
+    messages = []
+    for i, turn in enumerate(turns):
+        user, _, reply = turn.partition("\n\n") if i else ("", "", turn)
+        if user:
+            messages.append(HumanMessage(user, id=f"h{i}"))
+        tool_calls = [{"name": "tavily_search", "args": {"query": f"DOU Day 2025 {i}"}, "id": f"c{i}"}] if i % 3 == 0 else []
+        messages.append(AIMessage(reply or turn, id=f"a{i}", tool_calls=tool_calls))
+        if tool_calls:
+            messages.append(ToolMessage(turn[:1500], tool_call_id=f"c{i}", name="tavily_search", id=f"t{i}"))
+    return messages
+
+
+def measure(serde, obj) -> tuple[int, float, float]:
+    """Returns the payload bytes and the microseconds per dumps and per loads."""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        data = serde.dumps_typed(obj)
+    dumped = time.perf_counter()
+    for _ in range(ROUNDS):
+        serde.loads_typed(data)
+    loaded = time.perf_counter()
+    return len(data[1]), (dumped - started) / ROUNDS * 1e6, (loaded - dumped) / ROUNDS * 1e6
+
+
+def main():
+    messages = transcript()
+    event = Event(is_going=True, event=EventDetails(name="DevFest Lviv", place="Львів"), topic="AI в освіті")
+    serializers = {"default": JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES), "compressed": CompressedSerializer()}
+    for label, obj in [(f"{len(messages)} messages", messages), ("Event", event), ("AIMessage", messages[0])]:
+        for name, serde in serializers.items():
+            size, dumps, loads = measure(serde, obj)
+            print(f"{label:14} {name:10} {size:7d} B  dumps {dumps:8.1f} us  loads {loads:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Per-node setup cost of the deep research models: a new client and structured-output chain
+on every run against the shared get_model instances. No network calls are made.
+Run from v6: python -m benchmarks.get_model
+"""
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import src  # noqa: E402,F401  puts the repo root on sys.path
+from langchain_google_genai import ChatGoogleGenerativeAI  # noqa: E402
+
+from src.deep_research.configuration import Configuration  # noqa: E402
+from src.deep_research.tools_and_schemas import Reflection  # noqa: E402
+from src.llm import get_model  # noqa: E402
+
+ROUNDS = 200
+CONFIG = {"configurable": {"thread_id": "benchmark"}}
+
+
+def new_model():
+    configurable = Configuration.from_runnable_config(CONFIG)
+    ChatGoogleGenerativeAI(model=configurable.reasoning_model, temperature=1.0, max_retries=2).with_structured_output(Reflection)
+
+
+def shared_model():
+    configurable = Configuration.from_runnable_config(CONFIG)
+    get_model(configurable.reasoning_model, 1.0, Reflection)
+
+
+def main():
+    for label, setup in [("new model per node", new_model), ("get_model", shared_model)]:
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            setup()
+        print(f"{label:20} {(time.perf_counter() - started) / ROUNDS * 1000:8.3f} ms per node")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Size of the interview system prompt at every dialogue stage: the stages sliced to
+INTERVIEW_PROMPT_STAGES against all stages sent on every turn. No network calls are made.
+Run from v6: python -m benchmarks.interview_prompt
+"""
+import os
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import src  # noqa: E402,F401  puts the repo root on sys.path
+from src.interview_prompt import STAGE_FIELDS, build_interview_prompt  # noqa: E402
+from src.state import merge_event  # noqa: E402
+from src.transcript import estimate_tokens  # noqa: E402
+
+# The fields the speaker gives at each stage, in dialogue order
+STAGE_ANSWERS = {
+    "event": {"is_going": True, "event": {"name": "DevFest Lviv"}, "topic": "AI в освіті"},
+    "goal": {"goal": "Знайти однодумців для пілотного проєкту"},
+    "target_audience": {"target_audience": "Викладачі університетів і розробники EdTech"},
+    "audience_knowledge": {"audience_knowledge": "Користувалися ChatGPT, але не знають про RAG"},
+    "key_message": {"key_message": "AI-асистент звільняє викладача для живого спілкування"},
+}
+# Read as in src.interview_graph, which can't be imported without a Tavily key
+interview_prompt_stages = int(os.getenv("INTERVIEW_PROMPT_STAGES", 1))
+
+
+def main():
+    assert list(STAGE_ANSWERS) == list(STAGE_FIELDS)
+    print(f"INTERVIEW_PROMPT_STAGES={interview_prompt_stages}")
+    print(f"{'turn at stage':20} {'sliced':>8} {'all stages':>11} {'saved':>7}")
+    event = merge_event(None, {})
+    for stage, answers in [*STAGE_ANSWERS.items(), ("done", {})]:
+        sliced = estimate_tokens(build_interview_prompt(event, interview_prompt_stages))
+        full = estimate_tokens(build_interview_prompt(event, 0))
+        print(f"{stage:20} {sliced:8d} {full:11d} {1 - sliced / full:7.0%}")
+        event = merge_event(event, answers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,27 @@
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END, START
 from typing import Literal
-from src.llm import llm
-from src.prompts import arguments_prompt, argument_feedback_evaluation_prompt
+from src.llm import context_cache, llm
+from src.prompts import arguments_context_prompt, arguments_feedback_prompt, argument_feedback_evaluation_prompt
 from src.state import GraphState, memory
+from src.transcript import render_event
+from shared.intent_classifier import IntentClassifier
+from shared.intent_examples import APPROVAL_EXAMPLES, NEGATIVE_FEEDBACK_EXAMPLES
 
 
+FEEDBACK_INTENT_EXAMPLES = {
+    "APPROVED": APPROVAL_EXAMPLES + ["супер", "так, підходить", "все подобається", "дякую, все чудово", "looks good"],
+    "ADJUST": NEGATIVE_FEEDBACK_EXAMPLES + [
+        "ні", "не подобається", "зміни", "змінити", "додай", "додай ще", "прибери", "виправ", "перероби",
+        "перепиши", "інший варіант", "не підходить", "так, але додай", "no", "не чудово", "не все ок", "не дуже",
+        "not good",
+    ],
+}
+
+# Answers short replies locally, everything else goes to the LLM
+feedback_intents = IntentClassifier("arguments_feedback_intent", FEEDBACK_INTENT_EXAMPLES, threshold=0.9)
+
 # Build the arguments_graph
 arguments_builder = StateGraph(GraphState)
 
@@ -14,26 +30,32 @@ def generate_arguments_node(state: GraphState) -> GraphState:
     """
     Generates a list of arguments based on the deep research output and event details.
     """
+    context, feedback = _arguments_prompt(state)
+    response = context_cache.invoke(llm, context, [HumanMessage(feedback)])
+    return {"messages": [response], "generated_arguments": response.content.split("\n")}
+
+async def agenerate_arguments_node(state: GraphState) -> GraphState:
+    context, feedback = _arguments_prompt(state)
+    response = await context_cache.ainvoke(llm, context, [HumanMessage(feedback)])
+    return {"messages": [response], "generated_arguments": response.content.split("\n")}
+
+def _arguments_prompt(state: GraphState) -> tuple[str, str]:
+    """Returns the research context, identical across regenerations, and the feedback part."""
     event = state.get("event", None)
     event_details = event.get("event", None)
     research_text = state.get("final_research_result", None)
     user_feedback = state["messages"][-1].content if not state.get("arguments_approved", False) else ""
-
-    prompt = arguments_prompt.format(
+    context = arguments_context_prompt.format(
         event_name=event_details["name"] or "N/A",
-        event_details=f"{event_details["dates"]} {event_details["place"]} {event_details["theme"]} {event_details["attendees"]}",
+        event_details=render_event({key: event_details[key] for key in ("dates", "place", "theme", "attendees")}),
         topic=event["topic"] or "N/A",
         goal=event["goal"] or "N/A",
         target_audience=event["target_audience"] or "N/A",
         audience_knowledge=event["audience_knowledge"] or "N/A",
         key_message=event["key_message"] or "N/A",
         research_text=research_text,
-        user_feedback=user_feedback,
     )
-    
-    response = llm.invoke([HumanMessage(prompt)])
-    
-    return {"messages": [response], "generated_arguments": response.content.split("\n")}
+    return context, arguments_feedback_prompt.format(user_feedback=user_feedback)
 
 def human_input_node(state: GraphState) -> GraphState:
     pass
@@ -44,19 +66,30 @@ def final_node(state: GraphState) -> GraphState:
     }
 
 def parsing_node(state: GraphState) -> GraphState:
+    intent = feedback_intents.predict(
+        state["messages"][-1].content,
+        lambda: llm.invoke(_feedback_prompt(state)).content.strip().upper(),
+    )
+    return {
+        "arguments_approved": intent == "APPROVED"
+    }
+
+async def aparsing_node(state: GraphState) -> GraphState:
+    async def classify_with_llm():
+        return (await llm.ainvoke(_feedback_prompt(state))).content.strip().upper()
+
+    intent = await feedback_intents.apredict(state["messages"][-1].content, classify_with_llm)
+    return {
+        "arguments_approved": intent == "APPROVED"
+    }
+
+def _feedback_prompt(state: GraphState) -> str:
     user_feedback = state["messages"][-1].content
     generated_arguments_str = "\n".join(state["generated_arguments"])
-
-    feedback_prompt = argument_feedback_evaluation_prompt.format(
+    return argument_feedback_evaluation_prompt.format(
         user_feedback=user_feedback,
         generated_arguments=generated_arguments_str
     )
-    
-    llm_response = llm.invoke(feedback_prompt).content.strip().upper()
-
-    return {
-        "arguments_approved": llm_response == "APPROVED"
-    }
 
 def next_step_router(state: GraphState) -> Literal["final", "generate_arguments"]:
     """
@@ -69,9 +102,10 @@ def next_step_router(state: GraphState) -> Literal["final", "generate_arguments"
     else:
         return "generate_arguments"
 
-arguments_builder.add_node("generate_arguments", generate_arguments_node)
+# Sync implementations serve `graph.stream` (CLI), async ones `graph.astream` (Chainlit, langgraph-api)
+arguments_builder.add_node("generate_arguments", RunnableLambda(generate_arguments_node, afunc=agenerate_arguments_node))
 arguments_builder.add_node("human_input", human_input_node)
-arguments_builder.add_node("parsing", parsing_node)
+arguments_builder.add_node("parsing", RunnableLambda(parsing_node, afunc=aparsing_node))
 arguments_builder.add_node("final", final_node)
 
 arguments_builder.add_edge(START, "generate_arguments")
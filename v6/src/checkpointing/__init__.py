@@ -0,0 +1,62 @@
+import os
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.checkpointing.remote import KVCheckpointSaver
+from src.checkpointing.retention import CompactingMemorySaver, RetentionPolicy
+from src.checkpointing.serde import STATE_TYPES, CompressedSerializer
+from src.checkpointing.sqlite import SqliteWriteBehindSaver
+
+
+def retention_policy_from_env() -> RetentionPolicy:
+    return RetentionPolicy(
+        keep_last=int(os.getenv("CHECKPOINT_KEEP_LAST", 20)),
+        compact_subgraphs=os.getenv("CHECKPOINT_COMPACT_SUBGRAPHS", "true").lower() in ("1", "true", "yes"),
+        idle_ttl=float(os.getenv("CHECKPOINT_IDLE_TTL", 0)),
+    )
+
+
+def serde_from_env() -> SerializerProtocol:
+    """CHECKPOINT_SERDE: "compressed" (default) or "default" for the stock langgraph serializer."""
+    if os.getenv("CHECKPOINT_SERDE", "compressed") == "default":
+        return JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES)
+    return CompressedSerializer(compress_min_bytes=int(os.getenv("CHECKPOINT_COMPRESS_MIN_BYTES", 1024)))
+
+
+def make_checkpointer(kind: Optional[str] = None, path: Optional[str] = None) -> BaseCheckpointSaver:
+    """
+    Builds the checkpointer shared by the root graph and its subgraphs.
+    CHECKPOINTER selects the backend: "memory" (default, lost on restart), "sqlite"
+    (durable, CHECKPOINTER_PATH) or "kv" (shared by all workers, CHECKPOINTER_URL of Redis
+    or of the HTTP key-value service).
+    All of them apply the CHECKPOINT_* retention policy and serializer.
+    """
+    kind = kind or os.getenv("CHECKPOINTER", "memory")
+    if kind == "memory":
+        return CompactingMemorySaver(serde=serde_from_env(), retention=retention_policy_from_env())
+    if kind == "sqlite":
+        return SqliteWriteBehindSaver(
+            path or os.getenv("CHECKPOINTER_PATH", "checkpoints.sqlite"),
+            serde=serde_from_env(),
+            retention=retention_policy_from_env(),
+        )
+    if kind == "kv":
+        return KVCheckpointSaver(
+            path or os.getenv("CHECKPOINTER_URL", "http://127.0.0.1:8765"),
+            serde=serde_from_env(),
+            retention=retention_policy_from_env(),
+        )
+    raise ValueError(f"Unknown CHECKPOINTER backend: {kind}")
+
+
+def sqlite_checkpointer() -> BaseCheckpointSaver:
+    """Entry point for the "checkpointer" section of langgraph.json."""
+    return make_checkpointer("sqlite")
+
+
+def kv_checkpointer() -> BaseCheckpointSaver:
+    """langgraph.json entry point for deployments with several langgraph-api workers."""
+    return make_checkpointer("kv")
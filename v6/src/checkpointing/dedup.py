@@ -0,0 +1,162 @@
+import hashlib
+import threading
+from collections.abc import MutableMapping
+from typing import Optional
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+# (serializer type, sha256 of the payload)
+Address = tuple[str, str]
+
+
+class BlobStore:
+    """Content-addressed store of serialized values: each distinct payload is kept once, with a reference count."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # address -> [(type, bytes), references]
+        self._entries: dict[Address, list] = {}
+
+    def add(self, value: tuple[str, bytes]) -> Address:
+        address = (value[0], hashlib.sha256(value[1]).hexdigest())
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is None:
+                self._entries[address] = [value, 1]
+            else:
+                entry[1] += 1
+        return address
+
+    def get(self, address: Address) -> tuple[str, bytes]:
+        return self._entries[address][0]
+
+    def __contains__(self, address: Address) -> bool:
+        return address in self._entries
+
+    def release(self, address: Address):
+        with self._lock:
+            entry = self._entries[address]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._entries[address]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "blobs": len(entries),
+            "references": sum(refs for _, refs in entries),
+            "stored_bytes": sum(len(value[1]) for value, _ in entries),
+            "referenced_bytes": sum(len(value[1]) * refs for value, refs in entries),
+        }
+
+
+class DedupBlobs(MutableMapping):
+    """InMemorySaver.blobs backed by a BlobStore: keys map to content addresses."""
+
+    def __init__(self, store: BlobStore):
+        self.store = store
+        self._addresses: dict = {}
+
+    def __getitem__(self, key) -> tuple[str, bytes]:
+        return self.store.get(self._addresses[key])
+
+    def address(self, key) -> Address:
+        return self._addresses[key]
+
+    def __setitem__(self, key, value: tuple[str, bytes]):
+        address = self.store.add(value)
+        previous = self._addresses.get(key)
+        self._addresses[key] = address
+        if previous is not None:
+            self.store.release(previous)
+
+    def __delitem__(self, key):
+        self.store.release(self._addresses.pop(key))
+
+    def __contains__(self, key) -> bool:
+        return key in self._addresses
+
+    def __iter__(self):
+        return iter(self._addresses)
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+
+class DedupWrites(MutableMapping):
+    """Pending writes of one checkpoint, (task_id, idx) -> (task_id, channel, value, task_path), values in a BlobStore."""
+
+    def __init__(self, store: BlobStore):
+        self.store = store
+        self._writes: dict = {}
+
+    def __getitem__(self, key):
+        task_id, channel, address, task_path = self._writes[key]
+        return task_id, channel, self.store.get(address), task_path
+
+    def address(self, key) -> Address:
+        return self._writes[key][2]
+
+    def __setitem__(self, key, write):
+        task_id, channel, value, task_path = write
+        previous = self._writes.get(key)
+        self._writes[key] = (task_id, channel, self.store.add(value), task_path)
+        if previous is not None:
+            self.store.release(previous[2])
+
+    def __delitem__(self, key):
+        self.store.release(self._writes.pop(key)[2])
+
+    def __contains__(self, key) -> bool:
+        return key in self._writes
+
+    def __iter__(self):
+        return iter(self._writes)
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def clear(self):
+        for address in (write[2] for write in self._writes.values()):
+            self.store.release(address)
+        self._writes.clear()
+
+
+class DedupWritesIndex(dict):
+    """InMemorySaver.writes: (thread_id, checkpoint_ns, checkpoint_id) -> DedupWrites, released when removed."""
+
+    def __init__(self, store: BlobStore):
+        super().__init__()
+        self.store = store
+
+    def __missing__(self, key) -> DedupWrites:
+        writes = self[key] = DedupWrites(self.store)
+        return writes
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        writes = super().pop(key)
+        # Handed back as a plain dict, the stored references are released here
+        values = dict(writes.items())
+        writes.clear()
+        return values
+
+
+class DedupMemorySaver(InMemorySaver):
+    """
+    InMemorySaver that keeps every serialized channel value and pending write once per distinct
+    payload. The same research result or message list checkpointed by the parent graph and
+    each subgraph namespace is stored a single time and freed when its last reference goes.
+    """
+
+    def __init__(self, *, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde)
+        self.blob_store = BlobStore()
+        self.blobs = DedupBlobs(self.blob_store)
+        self.writes = DedupWritesIndex(self.blob_store)
@@ -0,0 +1,210 @@
+import argparse
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+import httpx
+
+try:
+    import redis
+except ImportError:  # only the HTTP key-value service is available
+    redis = None
+
+
+class KVConflictError(Exception):
+    """A conditional put found the key at another version."""
+
+
+class KVClient:
+    """
+    Client of the checkpoint key-value service. Every key carries a version that grows by one
+    on each put; a put with if_version only succeeds while the key is still at that version
+    (0 means the key must not exist yet).
+    """
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.http = httpx.Client(base_url=url.rstrip("/"), timeout=timeout)
+
+    @staticmethod
+    def _path(key: str) -> str:
+        return "/kv/" + quote(key, safe="")
+
+    def get(self, key: str, if_changed_from: int = 0) -> tuple[Optional[bytes], int]:
+        """Returns (value, version); value is None when the key is missing or still at if_changed_from."""
+        headers = {"If-None-Match": str(if_changed_from)} if if_changed_from else {}
+        response = self.http.get(self._path(key), headers=headers)
+        if response.status_code == 404:
+            return None, 0
+        if response.status_code == 304:
+            return None, if_changed_from
+        response.raise_for_status()
+        return response.content, int(response.headers["X-Version"])
+
+    def put(self, key: str, value: bytes, if_version: Optional[int] = None) -> int:
+        headers = {"If-Match": str(if_version)} if if_version is not None else {}
+        response = self.http.put(self._path(key), content=value, headers=headers)
+        if response.status_code == 409:
+            raise KVConflictError(f"{key} is at version {response.headers['X-Version']}, expected {if_version}")
+        response.raise_for_status()
+        return int(response.headers["X-Version"])
+
+    def delete(self, key: str):
+        self.http.delete(self._path(key)).raise_for_status()
+
+    def keys(self, prefix: str = "") -> list[str]:
+        response = self.http.get("/keys", params={"prefix": prefix})
+        response.raise_for_status()
+        return [unquote(key) for key in response.text.splitlines()]
+
+    def close(self):
+        self.http.close()
+
+
+class RedisKVClient:
+    """
+    KVClient over Redis: each key is a hash with its value and version, and the conditional
+    get and put run as Lua scripts, so the version check and the write are one atomic step.
+    """
+
+    _GET = """
+    local version = redis.call('HGET', KEYS[1], 'version')
+    if not version then return {0} end
+    if version == ARGV[1] then return {tonumber(version)} end
+    return {tonumber(version), redis.call('HGET', KEYS[1], 'value')}
+    """
+    _PUT = """
+    local version = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+    if ARGV[2] ~= '' and tonumber(ARGV[2]) ~= version then return {0, version} end
+    redis.call('HSET', KEYS[1], 'value', ARGV[1], 'version', version + 1)
+    return {1, version + 1}
+    """
+
+    def __init__(self, url: str, timeout: float = 10):
+        if redis is None:
+            raise ImportError("The redis checkpoint store needs the redis package: pip install redis")
+        self.redis = redis.Redis.from_url(url, socket_timeout=timeout)
+        self._get = self.redis.register_script(self._GET)
+        self._put = self.redis.register_script(self._PUT)
+
+    def get(self, key: str, if_changed_from: int = 0) -> tuple[Optional[bytes], int]:
+        """Returns (value, version); value is None when the key is missing or still at if_changed_from."""
+        result = self._get(keys=[key], args=[str(if_changed_from)])
+        return (result[1] if len(result) > 1 else None), result[0]
+
+    def put(self, key: str, value: bytes, if_version: Optional[int] = None) -> int:
+        stored, version = self._put(keys=[key], args=[value, "" if if_version is None else str(if_version)])
+        if not stored:
+            raise KVConflictError(f"{key} is at version {version}, expected {if_version}")
+        return version
+
+    def delete(self, key: str):
+        self.redis.delete(key)
+
+    def keys(self, prefix: str = "") -> list[str]:
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        return [key.decode() for key in self.redis.scan_iter(match=pattern, count=1000)]
+
+    def close(self):
+        self.redis.close()
+
+
+def connect(url: str) -> Union[KVClient, RedisKVClient]:
+    """Client for CHECKPOINTER_URL: redis:// and rediss:// URLs go to Redis, others to the HTTP service."""
+    if urlparse(url).scheme in ("redis", "rediss", "unix"):
+        return RedisKVClient(url)
+    return KVClient(url)
+
+
+class LocalKVServer:
+    """
+    In-memory stand-in for the key-value service, for tests and local multi-worker runs:
+    python -m src.checkpointing.kvstore --port 8765
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.data: dict[str, tuple[bytes, int]] = {}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes, Nagle would hold the body back
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: bytes = b"", version: Optional[int] = None):
+                self.send_response(status)
+                if version is not None:
+                    self.send_header("X-Version", str(version))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _key(self) -> Optional[str]:
+                path = urlparse(self.path).path
+                return unquote(path[len("/kv/"):]) if path.startswith("/kv/") else None
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/keys":
+                    prefix = parse_qs(url.query).get("prefix", [""])[0]
+                    with store.lock:
+                        keys = [quote(key, safe="") for key in store.data if key.startswith(prefix)]
+                    return self._reply(200, "\n".join(keys).encode())
+                with store.lock:
+                    entry = store.data.get(self._key())
+                if entry is None:
+                    return self._reply(404)
+                if self.headers.get("If-None-Match") == str(entry[1]):
+                    return self._reply(304, version=entry[1])
+                self._reply(200, entry[0], entry[1])
+
+            def do_PUT(self):
+                key = self._key()
+                value = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                expected = self.headers.get("If-Match")
+                with store.lock:
+                    version = store.data.get(key, (b"", 0))[1]
+                    if expected is not None and int(expected) != version:
+                        return self._reply(409, version=version)
+                    store.data[key] = (value, version + 1)
+                self._reply(200, version=version + 1)
+
+            def do_DELETE(self):
+                with store.lock:
+                    store.data.pop(self._key(), None)
+                self._reply(200)
+
+        return Handler
+
+    def start(self) -> "LocalKVServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="kv-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local checkpoint key-value server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = LocalKVServer(args.host, args.port)
+    print(f"Serving checkpoints on {server.url}")
+    server.server.serve_forever()
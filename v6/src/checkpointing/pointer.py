@@ -0,0 +1,49 @@
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+
+ERROR_CHANNEL = "__error__"
+
+
+class SubgraphPointerMixin:
+    """
+    Finds the subgraph a thread is paused in from the checkpoint index alone, without
+    deserializing any state: checkpoint ids are time-ordered, so the newest checkpoint of the
+    thread belongs to the subgraph that ran last, and if that is not the root namespace the
+    run stopped inside it.
+    """
+
+    def interrupted_subgraph(self, thread_id: str) -> Optional[RunnableConfig]:
+        """
+        Config of the newest checkpoint of the paused subgraph, as get_state(subgraphs=True)
+        gives it, or None when the thread is not inside a subgraph or its last step failed.
+        """
+        namespaces = self.storage.get(thread_id)
+        if not namespaces or not namespaces.get(""):
+            return None
+        heads = {ns: max(checkpoints) for ns, checkpoints in namespaces.items() if checkpoints}
+        checkpoint_ns = max(heads, key=heads.get)
+        if not checkpoint_ns:
+            return None
+        parts = checkpoint_ns.split("|")
+        checkpoint_map = {"": heads[""]}
+        for depth in range(1, len(parts) + 1):
+            ns = "|".join(parts[:depth])
+            if ns not in heads:
+                return None
+            checkpoint_map[ns] = heads[ns]
+        for ns, checkpoint_id in checkpoint_map.items():
+            writes = self.writes.get((thread_id, ns, checkpoint_id), {})
+            if any(write[1] == ERROR_CHANNEL for write in writes.values()):
+                return None
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": heads[checkpoint_ns],
+                "checkpoint_map": checkpoint_map,
+            }
+        }
+
+    async def ainterrupted_subgraph(self, thread_id: str) -> Optional[RunnableConfig]:
+        return self.interrupted_subgraph(thread_id)
@@ -0,0 +1,450 @@
+import asyncio
+import logging
+import threading
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+import ormsgpack
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+from src.checkpointing.dedup import DedupMemorySaver
+from src.checkpointing.kvstore import KVConflictError, connect
+from src.checkpointing.pointer import SubgraphPointerMixin
+from src.checkpointing.retention import RetentionMixin, RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointConflictError(RuntimeError):
+    """Another worker advanced the thread since this one last read it."""
+
+
+class _StaleIndexError(Exception):
+    """A log entry, snapshot or blob the index referenced was removed while it was being read."""
+
+
+def _empty_delta() -> dict:
+    return {"checkpoints": [], "writes": [], "blobs": [], "drop_checkpoints": [], "drop_blobs": []}
+
+
+def _merge(deltas: list[dict]) -> dict:
+    """
+    Folds consecutive deltas into one, dropping rows a later delta removes, so a reader
+    catching up never fetches a blob that was released (and deleted) further on.
+    """
+    checkpoints, writes, blobs = {}, {}, {}
+    drop_checkpoints, drop_blobs = set(), set()
+    for delta in deltas:
+        for ns, checkpoint_id in delta["drop_checkpoints"]:
+            checkpoints.pop((ns, checkpoint_id), None)
+            writes.pop((ns, checkpoint_id), None)
+            drop_checkpoints.add((ns, checkpoint_id))
+        for ns, channel, version in delta["drop_blobs"]:
+            blobs.pop((ns, channel, version), None)
+            drop_blobs.add((ns, channel, version))
+        for row in delta["checkpoints"]:
+            checkpoints[(row[0], row[1])] = row
+        for row in delta["writes"]:
+            writes.setdefault((row[0], row[1]), {})[(row[2], row[3])] = row
+        for row in delta["blobs"]:
+            blobs[(row[0], row[1], row[2])] = row
+    return {
+        "checkpoints": list(checkpoints.values()),
+        "writes": [row for rows in writes.values() for row in rows.values()],
+        "blobs": list(blobs.values()),
+        "drop_checkpoints": list(drop_checkpoints),
+        "drop_blobs": list(drop_blobs),
+    }
+
+
+class KVCheckpointSaver(RetentionMixin, SubgraphPointerMixin, DedupMemorySaver):
+    """
+    Checkpointer over a networked key-value store, so any worker can resume any thread.
+    Every put appends a log entry with only the rows it added or retention dropped, and the
+    blob payloads the thread didn't hold yet go under content-addressed keys. A small versioned
+    head key lists the thread's latest snapshot and the log entries after it; every
+    snapshot_every entries the writer folds them into a new snapshot. Every read first checks
+    the head version and applies the entries it hasn't seen; every put is a conditional write
+    of the head at the version this worker last saw, so two workers running the same thread at
+    once can't interleave: the late one gets CheckpointConflictError, and so does every later
+    write of its run, until the next run reads the thread from the root namespace or looks up
+    its interrupted subgraph.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        prefix: str = "v6/",
+        serde: Optional[SerializerProtocol] = None,
+        retention: Optional[RetentionPolicy] = None,
+        snapshot_every: int = 50,
+    ):
+        super().__init__(serde=serde, retention=retention)
+        self.kv = connect(url)
+        self.prefix = prefix
+        self.snapshot_every = snapshot_every
+        # thread_id -> head version this worker holds, 0 for a thread it hasn't stored yet
+        self._remote_versions: dict[str, int] = {}
+        # thread_id -> head this worker applied: {"seq", "snapshot", "log"}
+        self._heads: dict[str, dict] = {}
+        # thread_id -> rows added or dropped locally and not published yet
+        self._pending: dict[str, dict] = {}
+        # thread_id -> digests of the stored writes, by (ns, checkpoint_id) then (task_id, idx)
+        self._write_digests: dict[str, dict] = defaultdict(lambda: defaultdict(dict))
+        # thread_id -> digests of the stored channel blobs, by (ns, channel, version)
+        self._blob_digests: dict[str, dict] = defaultdict(dict)
+        # thread_id -> rows referencing each blob payload in the store
+        self._refs: dict[str, Counter] = defaultdict(Counter)
+        self._thread_locks: dict[str, threading.Lock] = {}
+        # Threads whose current run lost a conflict here. langgraph drops checkpointer errors
+        # raised while a graph is interrupting, so the rest of that run is refused explicitly
+        self._fenced: set[str] = set()
+
+    def _lock(self, thread_id: str) -> threading.Lock:
+        return self._thread_locks.setdefault(thread_id, threading.Lock())
+
+    def _index_key(self, thread_id: str) -> str:
+        return f"{self.prefix}threads/{thread_id}"
+
+    def _blob_key(self, thread_id: str, digest: str) -> str:
+        return f"{self.prefix}blobs/{thread_id}/{digest}"
+
+    def _log_key(self, thread_id: str, seq: int) -> str:
+        # The suffix keeps an entry written by a worker that then loses the head update apart
+        return f"{self.prefix}log/{thread_id}/{seq}-{uuid.uuid4().hex[:8]}"
+
+    def _snapshot_key(self, thread_id: str, seq: int) -> str:
+        return f"{self.prefix}snapshots/{thread_id}/{seq}"
+
+    # Sync with the store
+
+    def _refresh(self, thread_id: str):
+        """Applies the log entries stored since the local copy, or reloads the thread."""
+        for _ in range(3):
+            version = self._remote_versions.get(thread_id, 0)
+            data, remote_version = self.kv.get(self._index_key(thread_id), if_changed_from=version)
+            if data is None and remote_version == version:
+                return
+            try:
+                self._catch_up(thread_id, ormsgpack.unpackb(data) if data is not None else None)
+            except _StaleIndexError:
+                # Compacted or trimmed by another worker meanwhile, start over from its new head
+                self._unload(thread_id)
+                continue
+            self._remote_versions[thread_id] = remote_version
+            return
+        raise CheckpointConflictError(f"thread {thread_id} kept changing while it was loaded")
+
+    def _catch_up(self, thread_id: str, head: Optional[dict]):
+        if head is None:
+            self._unload(thread_id)
+            return
+        current = self._heads.get(thread_id)
+        if (
+            current is not None
+            and current["snapshot"] == head["snapshot"]
+            and head["log"][: len(current["log"])] == current["log"]
+        ):
+            keys = head["log"][len(current["log"]):]
+        else:
+            self._unload(thread_id)
+            keys = ([head["snapshot"]] if head["snapshot"] else []) + head["log"]
+        self._apply(thread_id, _merge([self._get_entry(key) for key in keys]))
+        self._heads[thread_id] = head
+
+    def _get_entry(self, key: str) -> dict:
+        data, _ = self.kv.get(key)
+        if data is None:
+            raise _StaleIndexError(key)
+        return ormsgpack.unpackb(data)
+
+    def _unload(self, thread_id: str):
+        InMemorySaver.delete_thread(self, thread_id)
+        self._forget_thread_index(thread_id)
+        for state in (self._remote_versions, self._heads, self._pending, self._write_digests, self._blob_digests, self._refs):
+            state.pop(thread_id, None)
+
+    def _fetch_blob(self, thread_id: str, value_type: str, digest: str) -> tuple[str, bytes]:
+        if (value_type, digest) in self.blob_store:
+            return self.blob_store.get((value_type, digest))
+        data, _ = self.kv.get(self._blob_key(thread_id, digest))
+        if data is None:
+            raise _StaleIndexError(self._blob_key(thread_id, digest))
+        return value_type, data
+
+    def _apply(self, thread_id: str, delta: dict):
+        """Applies a delta another worker published to the local copy."""
+        for ns, checkpoint_id in delta["drop_checkpoints"]:
+            self.storage[thread_id][ns].pop(checkpoint_id, None)
+            self.writes.pop((thread_id, ns, checkpoint_id), None)
+            self._versions[(thread_id, ns)].pop(checkpoint_id, None)
+        for ns, channel, version in delta["drop_blobs"]:
+            self.blobs.pop((thread_id, ns, channel, version), None)
+            self._blob_index[(thread_id, ns)].discard((channel, version))
+        for ns, checkpoint_id, parent_id, c_type, c_value, m_type, m_value in delta["checkpoints"]:
+            self.storage[thread_id][ns][checkpoint_id] = ((c_type, c_value), (m_type, m_value), parent_id)
+        for ns, checkpoint_id, task_id, idx, channel, v_type, digest, task_path in delta["writes"]:
+            self.writes[(thread_id, ns, checkpoint_id)][(task_id, idx)] = (
+                task_id, channel, self._fetch_blob(thread_id, v_type, digest), task_path
+            )
+        for ns, channel, version, v_type, digest in delta["blobs"]:
+            self.blobs[(thread_id, ns, channel, version)] = self._fetch_blob(thread_id, v_type, digest)
+            self._blob_index[(thread_id, ns)].add((channel, version))
+        self._track(thread_id, delta)
+
+    def _track(self, thread_id: str, delta: dict) -> list[str]:
+        """Counts the blob references a delta adds and drops, returns the digests no row uses anymore."""
+        refs = self._refs[thread_id]
+        write_digests = self._write_digests[thread_id]
+        blob_digests = self._blob_digests[thread_id]
+        released = []
+
+        def release(digest: str):
+            refs[digest] -= 1
+            if refs[digest] <= 0:
+                del refs[digest]
+                released.append(digest)
+
+        for ns, checkpoint_id in delta["drop_checkpoints"]:
+            for digest in write_digests.pop((ns, checkpoint_id), {}).values():
+                release(digest)
+        for key in delta["drop_blobs"]:
+            if tuple(key) in blob_digests:
+                release(blob_digests.pop(tuple(key)))
+        for ns, checkpoint_id, task_id, idx, _, _, digest, _ in delta["writes"]:
+            refs[digest] += 1
+            previous = write_digests[(ns, checkpoint_id)].get((task_id, idx))
+            write_digests[(ns, checkpoint_id)][(task_id, idx)] = digest
+            if previous is not None:
+                release(previous)
+        for ns, channel, version, _, digest in delta["blobs"]:
+            refs[digest] += 1
+            previous = blob_digests.get((ns, channel, version))
+            blob_digests[(ns, channel, version)] = digest
+            if previous is not None:
+                release(previous)
+        return [digest for digest in released if digest not in refs]
+
+    def _build_index(self, thread_id: str) -> dict:
+        """The whole thread as one delta, written as a snapshot."""
+        index = _empty_delta()
+        for ns, checkpoints in self.storage[thread_id].items():
+            for checkpoint_id, ((c_type, c_value), (m_type, m_value), parent_id) in checkpoints.items():
+                index["checkpoints"].append((ns, checkpoint_id, parent_id, c_type, c_value, m_type, m_value))
+                writes = self.writes.get((thread_id, ns, checkpoint_id), {})
+                for (task_id, idx), (_, channel, _, task_path) in writes.items():
+                    v_type, digest = writes.address((task_id, idx))
+                    index["writes"].append((ns, checkpoint_id, task_id, idx, channel, v_type, digest, task_path))
+            for channel, version in self._blob_index[(thread_id, ns)]:
+                key = (thread_id, ns, channel, version)
+                if key in self.blobs:
+                    v_type, digest = self.blobs.address(key)
+                    index["blobs"].append((ns, channel, version, v_type, digest))
+        return index
+
+    def _publish(self, thread_id: str):
+        delta = self._pending.pop(thread_id, None)
+        if delta is None:
+            return
+        refs = self._refs[thread_id]
+        uploaded = set()
+        for v_type, digest in [row[5:7] for row in delta["writes"]] + [row[3:5] for row in delta["blobs"]]:
+            if digest not in refs and digest not in uploaded:
+                self.kv.put(self._blob_key(thread_id, digest), self.blob_store.get((v_type, digest))[1])
+                uploaded.add(digest)
+        head = self._heads.get(thread_id) or {"seq": 0, "snapshot": None, "log": []}
+        seq = head["seq"] + 1
+        log_key = self._log_key(thread_id, seq)
+        self.kv.put(log_key, ormsgpack.packb(delta))
+        next_head = {"seq": seq, "snapshot": head["snapshot"], "log": head["log"] + [log_key]}
+        try:
+            self._remote_versions[thread_id] = self.kv.put(
+                self._index_key(thread_id),
+                ormsgpack.packb(next_head),
+                if_version=self._remote_versions.get(thread_id, 0),
+            )
+        except KVConflictError as e:
+            # Our copy is stale: take the stored one and let the caller retry the turn
+            self.kv.delete(log_key)
+            self._unload(thread_id)
+            self._fenced.add(thread_id)
+            raise CheckpointConflictError(f"thread {thread_id} was updated by another worker") from e
+        self._heads[thread_id] = next_head
+        # Blobs dropped by retention, no stored row references them anymore
+        for digest in self._track(thread_id, delta):
+            self.kv.delete(self._blob_key(thread_id, digest))
+        if len(next_head["log"]) >= self.snapshot_every:
+            self._compact(thread_id)
+
+    def _compact(self, thread_id: str):
+        """Folds the log into a new snapshot, so readers that load the thread fetch a bounded number of keys."""
+        head = self._heads[thread_id]
+        snapshot_key = self._snapshot_key(thread_id, head["seq"])
+        self.kv.put(snapshot_key, ormsgpack.packb(self._build_index(thread_id)))
+        compacted = {"seq": head["seq"], "snapshot": snapshot_key, "log": []}
+        try:
+            self._remote_versions[thread_id] = self.kv.put(
+                self._index_key(thread_id), ormsgpack.packb(compacted), if_version=self._remote_versions[thread_id]
+            )
+        except KVConflictError:
+            # Another worker wrote meanwhile, its next writes will conflict here and compact later
+            self.kv.delete(snapshot_key)
+            return
+        self._heads[thread_id] = compacted
+        for key in head["log"] + ([head["snapshot"]] if head["snapshot"] else []):
+            self.kv.delete(key)
+
+    def _pending_delta(self, thread_id: str) -> dict:
+        return self._pending.setdefault(thread_id, _empty_delta())
+
+    def _check_fence(self, thread_id: str):
+        if thread_id in self._fenced:
+            raise CheckpointConflictError(f"thread {thread_id} was updated by another worker during this run")
+
+    # Checkpointer API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock(thread_id):
+            if not config["configurable"].get("checkpoint_ns"):
+                self._fenced.discard(thread_id)
+            self._refresh(thread_id)
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config:
+            thread_ids = [config["configurable"]["thread_id"]]
+        else:
+            index_prefix = self._index_key("")
+            thread_ids = [key[len(index_prefix):] for key in self.kv.keys(index_prefix)]
+        for thread_id in thread_ids:
+            with self._lock(thread_id):
+                self._refresh(thread_id)
+        return super().list(config, filter=filter, before=before, limit=limit)
+
+    def interrupted_subgraph(self, thread_id: str) -> Optional[RunnableConfig]:
+        with self._lock(thread_id):
+            # Looked up at the start of a turn, like a root read
+            self._fenced.discard(thread_id)
+            self._refresh(thread_id)
+            return super().interrupted_subgraph(thread_id)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock(thread_id):
+            self._check_fence(thread_id)
+            if thread_id not in self._remote_versions:
+                self._refresh(thread_id)
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            (c_type, c_value), (m_type, m_value), parent_id = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+            delta = self._pending_delta(thread_id)
+            delta["checkpoints"].append((checkpoint_ns, checkpoint["id"], parent_id, c_type, c_value, m_type, m_value))
+            for channel, version in new_versions.items():
+                v_type, digest = self.blobs.address((thread_id, checkpoint_ns, channel, version))
+                delta["blobs"].append((checkpoint_ns, channel, version, v_type, digest))
+            self._publish(thread_id)
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock(thread_id):
+            self._check_fence(thread_id)
+            if thread_id not in self._remote_versions:
+                self._refresh(thread_id)
+            super().put_writes(config, writes, task_id, task_path)
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            checkpoint_id = config["configurable"]["checkpoint_id"]
+            stored = self.writes[(thread_id, checkpoint_ns, checkpoint_id)]
+            delta = self._pending_delta(thread_id)
+            for (write_task_id, idx), (_, channel, _, path) in stored.items():
+                if write_task_id == task_id:
+                    v_type, digest = stored.address((task_id, idx))
+                    delta["writes"].append((checkpoint_ns, checkpoint_id, task_id, idx, channel, v_type, digest, path))
+            self._publish(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock(thread_id):
+            self._unload(thread_id)
+            self.kv.delete(self._index_key(thread_id))
+            for kind in ("log", "snapshots", "blobs"):
+                for key in self.kv.keys(f"{self.prefix}{kind}/{thread_id}/"):
+                    self.kv.delete(key)
+            self._fenced.discard(thread_id)
+
+    # Network calls stay off the event loop
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: [*self.list(config, filter=filter, before=before, limit=limit)])
+        for item in items:
+            yield item
+
+    async def ainterrupted_subgraph(self, thread_id: str) -> Optional[RunnableConfig]:
+        return await asyncio.to_thread(self.interrupted_subgraph, thread_id)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # Retention
+
+    def _drop_thread(self, thread_id: str):
+        # Idle threads are only unloaded, the store keeps them
+        self._unload(thread_id)
+
+    def _on_checkpoint_removed(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        self._pending_delta(thread_id)["drop_checkpoints"].append((checkpoint_ns, checkpoint_id))
+
+    def _on_blob_removed(self, thread_id: str, checkpoint_ns: str, channel: str, version):
+        self._pending_delta(thread_id)["drop_blobs"].append((checkpoint_ns, channel, version))
@@ -0,0 +1,172 @@
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+
+from src.checkpointing.dedup import DedupMemorySaver
+from src.checkpointing.pointer import SubgraphPointerMixin
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True)
+class RetentionPolicy:
+    # Checkpoints kept per thread and namespace, 0 keeps all of them
+    keep_last: int = 20
+    # Once the parent graph moves past a subgraph, only its final checkpoint is kept
+    compact_subgraphs: bool = True
+    # Threads untouched for longer than this many seconds are evicted, 0 disables it
+    idle_ttl: float = 0
+    # Idle threads are looked for at most this often
+    sweep_interval: float = 60
+
+
+class RetentionMixin:
+    """
+    Applies a RetentionPolicy to an InMemorySaver-based checkpointer on every put:
+    old checkpoints of the namespace are dropped with their pending writes, channel blobs
+    no kept checkpoint references are released, completed subgraph namespaces are cut to
+    their final checkpoint and idle threads are evicted. Bytes of serialized payloads
+    released are counted in reclaimed_bytes.
+    """
+
+    def __init__(self, *args, retention: Optional[RetentionPolicy] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retention = retention or RetentionPolicy()
+        self.reclaimed_bytes = 0
+        self._last_access: dict[str, float] = {}
+        self._last_sweep = time.monotonic()
+        # (thread_id, checkpoint_ns) -> {checkpoint_id: channel_versions}, saves deserializing kept checkpoints
+        self._versions = defaultdict(dict)
+        # (thread_id, checkpoint_ns) -> {(channel, version)} stored in self.blobs
+        self._blob_index = defaultdict(set)
+        self._compacted_namespaces: set[tuple[str, str]] = set()
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        self._last_access[config["configurable"]["thread_id"]] = time.monotonic()
+        return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        self._last_access[thread_id] = time.monotonic()
+        self._versions[(thread_id, checkpoint_ns)][checkpoint["id"]] = dict(checkpoint["channel_versions"])
+        self._blob_index[(thread_id, checkpoint_ns)].update(new_versions.items())
+
+        reclaimed = self._trim(thread_id, checkpoint_ns, self.retention.keep_last)
+        if checkpoint_ns == "" and self.retention.compact_subgraphs:
+            reclaimed += self._compact_subgraphs(thread_id)
+        if reclaimed:
+            self.reclaimed_bytes += reclaimed
+            logger.debug("checkpoint retention reclaimed %d bytes in thread %s", reclaimed, thread_id)
+        self._sweep_idle()
+        return next_config
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._forget_thread_index(thread_id)
+
+    def _forget_thread_index(self, thread_id: str):
+        self._last_access.pop(thread_id, None)
+        for index in (self._versions, self._blob_index):
+            for key in [key for key in index if key[0] == thread_id]:
+                del index[key]
+        self._compacted_namespaces = {key for key in self._compacted_namespaces if key[0] != thread_id}
+
+    def _trim(self, thread_id: str, checkpoint_ns: str, keep_last: int) -> int:
+        """Drops all but the newest keep_last checkpoints of the namespace and the blobs only they used."""
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if keep_last <= 0 or len(checkpoints) <= keep_last:
+            return 0
+        reclaimed = 0
+        for checkpoint_id in sorted(checkpoints)[:-keep_last]:
+            reclaimed += self._remove_checkpoint(thread_id, checkpoint_ns, checkpoint_id)
+        return reclaimed + self._release_blobs(thread_id, checkpoint_ns)
+
+    def _compact_subgraphs(self, thread_id: str) -> int:
+        # A new root checkpoint means every subgraph task of earlier steps has finished
+        reclaimed = 0
+        for checkpoint_ns in list(self.storage[thread_id]):
+            key = (thread_id, checkpoint_ns)
+            if checkpoint_ns and key not in self._compacted_namespaces:
+                reclaimed += self._trim(thread_id, checkpoint_ns, 1)
+                self._compacted_namespaces.add(key)
+        return reclaimed
+
+    def _remove_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> int:
+        checkpoint, metadata, _ = self.storage[thread_id][checkpoint_ns].pop(checkpoint_id)
+        self._versions[(thread_id, checkpoint_ns)].pop(checkpoint_id, None)
+        reclaimed = len(checkpoint[1]) + len(metadata[1])
+        writes = self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None) or {}
+        reclaimed += sum(len(value[1]) for _, _, value, _ in writes.values())
+        self._on_checkpoint_removed(thread_id, checkpoint_ns, checkpoint_id)
+        return reclaimed
+
+    def _channel_versions(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> dict:
+        versions = self._versions[(thread_id, checkpoint_ns)]
+        if checkpoint_id not in versions:
+            checkpoint = self.storage[thread_id][checkpoint_ns][checkpoint_id][0]
+            versions[checkpoint_id] = self.serde.loads_typed(checkpoint)["channel_versions"]
+        return versions[checkpoint_id]
+
+    def _release_blobs(self, thread_id: str, checkpoint_ns: str) -> int:
+        referenced = set()
+        for checkpoint_id in self.storage[thread_id][checkpoint_ns]:
+            referenced.update(self._channel_versions(thread_id, checkpoint_ns, checkpoint_id).items())
+        index = self._blob_index[(thread_id, checkpoint_ns)]
+        reclaimed = 0
+        for channel, version in index - referenced:
+            blob = self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+            if blob is not None:
+                reclaimed += len(blob[1])
+                self._on_blob_removed(thread_id, checkpoint_ns, channel, version)
+        index &= referenced
+        return reclaimed
+
+    def _sweep_idle(self):
+        if self.retention.idle_ttl <= 0:
+            return
+        now = time.monotonic()
+        if now - self._last_sweep < self.retention.sweep_interval:
+            return
+        self._last_sweep = now
+        for thread_id, last_access in list(self._last_access.items()):
+            if now - last_access > self.retention.idle_ttl:
+                self.reclaimed_bytes += self._evict_thread(thread_id)
+
+    def _evict_thread(self, thread_id: str) -> int:
+        reclaimed = sum(
+            len(checkpoint[1]) + len(metadata[1])
+            for namespace in self.storage.get(thread_id, {}).values()
+            for checkpoint, metadata, _ in namespace.values()
+        )
+        reclaimed += sum(len(blob[1]) for key, blob in self.blobs.items() if key[0] == thread_id)
+        self._drop_thread(thread_id)
+        logger.info("evicted idle checkpoint thread %s, %d bytes reclaimed", thread_id, reclaimed)
+        return reclaimed
+
+    # Hooks for savers that keep a durable copy
+
+    def _drop_thread(self, thread_id: str):
+        self.delete_thread(thread_id)
+
+    def _on_checkpoint_removed(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        pass
+
+    def _on_blob_removed(self, thread_id: str, checkpoint_ns: str, channel: str, version):
+        pass
+
+
+class CompactingMemorySaver(RetentionMixin, SubgraphPointerMixin, DedupMemorySaver):
+    """Deduplicating MemorySaver with a retention policy."""
@@ -0,0 +1,47 @@
+import threading
+from typing import Any
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+try:
+    import zstandard
+except ImportError:  # payloads are left uncompressed
+    zstandard = None
+
+# App types stored in checkpoints, read back without the unregistered-type warning
+STATE_TYPES = [("src.state", "Event"), ("src.state", "EventDetails")]
+
+
+class CompressedSerializer(JsonPlusSerializer):
+    """
+    Checkpoint serde for every checkpointer: the stock msgpack encoding, with payloads of
+    compress_min_bytes or more zstd-compressed. The repeated type paths and field names of
+    messages are what takes the room, and they compress well.
+    Payloads written by the default serializer are still read.
+    """
+
+    def __init__(self, *, compress_min_bytes: int = 1024, compress_level: int = 3, **kwargs):
+        kwargs.setdefault("allowed_msgpack_modules", STATE_TYPES)
+        super().__init__(**kwargs)
+        self.compress_min_bytes = compress_min_bytes if zstandard else 0
+        self.compress_level = compress_level
+        # zstd contexts are not safe to share between threads
+        self._local = threading.local()
+
+    def _zstd(self):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.compress_level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = super().dumps_typed(obj)
+        if self.compress_min_bytes and len(data) >= self.compress_min_bytes:
+            return f"{type_}+zstd", self._zstd().compressor.compress(data)
+        return type_, data
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, data_ = data
+        if type_.endswith("+zstd"):
+            type_, data_ = type_[: -len("+zstd")], self._zstd().decompressor.decompress(data_)
+        return super().loads_typed((type_, data_))
@@ -0,0 +1,334 @@
+import asyncio
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+from src.checkpointing.dedup import DedupMemorySaver
+from src.checkpointing.pointer import SubgraphPointerMixin
+from src.checkpointing.retention import RetentionMixin, RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value_type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+"""
+
+
+class SqliteWriteBehindSaver(RetentionMixin, SubgraphPointerMixin, DedupMemorySaver):
+    """
+    Durable checkpointer: reads are served from the in-memory saver it extends, while
+    every put is queued and persisted to SQLite (WAL) by a background thread in batches,
+    so a graph step never waits for the disk. Threads not in memory yet (after a
+    restart) are loaded from SQLite on first access and resume where they stopped.
+    Retention applies to both copies, except that idle threads are only unloaded from memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        retention: Optional[RetentionPolicy] = None,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+    ):
+        super().__init__(serde=serde, retention=retention)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._db_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded_threads: set[str] = set()
+        self._all_loaded = False
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._writer.start()
+        # Rows still queued at interpreter exit are flushed, not dropped with the daemon thread
+        atexit.register(self.close)
+
+    # Loading
+
+    def _ensure_loaded(self, thread_id: str):
+        if thread_id in self._loaded_threads:
+            return
+        with self._load_lock:
+            if thread_id in self._loaded_threads:
+                return
+            self._load("WHERE thread_id = ?", (thread_id,))
+            self._loaded_threads.add(thread_id)
+
+    def _ensure_all_loaded(self):
+        if self._all_loaded:
+            return
+        with self._load_lock:
+            with self._db_lock:
+                thread_ids = [row[0] for row in self._conn.execute("SELECT DISTINCT thread_id FROM checkpoints")]
+            for thread_id in thread_ids:
+                if thread_id not in self._loaded_threads:
+                    self._load("WHERE thread_id = ?", (thread_id,))
+                    self._loaded_threads.add(thread_id)
+            self._all_loaded = True
+
+    def _load(self, where: str, params: tuple):
+        # Rows already in memory are newer than the persisted ones, so they are kept
+        with self._db_lock:
+            checkpoints = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                f"checkpoint_type, checkpoint, metadata_type, metadata FROM checkpoints {where}",
+                params,
+            ).fetchall()
+            writes = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path "
+                f"FROM writes {where}",
+                params,
+            ).fetchall()
+            blobs = self._conn.execute(
+                f"SELECT thread_id, checkpoint_ns, channel, version, value_type, value FROM blobs {where}",
+                params,
+            ).fetchall()
+        for thread_id, ns, checkpoint_id, parent_id, c_type, c_value, m_type, m_value in checkpoints:
+            self.storage[thread_id][ns].setdefault(checkpoint_id, ((c_type, c_value), (m_type, m_value), parent_id))
+        for thread_id, ns, checkpoint_id, task_id, idx, channel, v_type, v_value, task_path in writes:
+            self.writes[(thread_id, ns, checkpoint_id)].setdefault(
+                (task_id, idx), (task_id, channel, (v_type, v_value), task_path)
+            )
+        for thread_id, ns, channel, version, v_type, v_value in blobs:
+            self.blobs.setdefault((thread_id, ns, channel, version), (v_type, v_value))
+            self._blob_index[(thread_id, ns)].add((channel, version))
+
+    # Reads
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        self._ensure_loaded(config["configurable"]["thread_id"])
+        return super().get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config:
+            self._ensure_loaded(config["configurable"]["thread_id"])
+        else:
+            self._ensure_all_loaded()
+        return super().list(config, filter=filter, before=before, limit=limit)
+
+    def interrupted_subgraph(self, thread_id: str) -> Optional[RunnableConfig]:
+        self._ensure_loaded(thread_id)
+        return super().interrupted_subgraph(thread_id)
+
+    # Writes
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        self._ensure_loaded(thread_id)
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoint_id = checkpoint["id"]
+        (c_type, c_value), (m_type, m_value), parent_id = self.storage[thread_id][checkpoint_ns][checkpoint_id]
+        self._queue.put((
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, checkpoint_ns, checkpoint_id, parent_id, c_type, c_value, m_type, m_value),
+        ))
+        for channel, version in new_versions.items():
+            v_type, v_value = self.blobs[(thread_id, checkpoint_ns, channel, version)]
+            self._queue.put((
+                "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, channel, str(version), v_type, v_value),
+            ))
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        self._ensure_loaded(thread_id)
+        super().put_writes(config, writes, task_id, task_path)
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        for (write_task_id, idx), (_, channel, (v_type, v_value), path) in self.writes[
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ].items():
+            if write_task_id == task_id:
+                self._queue.put((
+                    "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, v_type, v_value, path),
+                ))
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._loaded_threads.add(thread_id)
+        for table in ("checkpoints", "writes", "blobs"):
+            self._queue.put((f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)))
+
+    # Async: a thread not in memory yet is read from SQLite on a worker thread, the rest is served from memory
+
+    async def _aensure_loaded(self, thread_id: str):
+        if thread_id not in self._loaded_threads:
+            await asyncio.to_thread(self._ensure_loaded, thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self._aensure_loaded(config["configurable"]["thread_id"])
+        return await super().aget_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if config:
+            await self._aensure_loaded(config["configurable"]["thread_id"])
+        elif not self._all_loaded:
+            await asyncio.to_thread(self._ensure_all_loaded)
+        async for checkpoint_tuple in super().alist(config, filter=filter, before=before, limit=limit):
+            yield checkpoint_tuple
+
+    async def ainterrupted_subgraph(self, thread_id: str) -> Optional[RunnableConfig]:
+        await self._aensure_loaded(thread_id)
+        return await super().ainterrupted_subgraph(thread_id)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        await self._aensure_loaded(config["configurable"]["thread_id"])
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._aensure_loaded(config["configurable"]["thread_id"])
+        await super().aput_writes(config, writes, task_id, task_path)
+
+    # Retention
+
+    def _drop_thread(self, thread_id: str):
+        # Persist what is queued before unloading, a later access reloads the thread from disk
+        self.flush()
+        InMemorySaver.delete_thread(self, thread_id)
+        self._forget_thread_index(thread_id)
+        self._loaded_threads.discard(thread_id)
+        self._all_loaded = False
+
+    def _on_checkpoint_removed(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        for table in ("checkpoints", "writes"):
+            self._queue.put((
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ))
+
+    def _on_blob_removed(self, thread_id: str, checkpoint_ns: str, channel: str, version):
+        self._queue.put((
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, str(version)),
+        ))
+
+    # Write-behind
+
+    def _write_loop(self):
+        while True:
+            statement = self._queue.get()
+            if statement is None:
+                self._queue.task_done()
+                return
+            batch = [statement]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                    if batch[-1] is None:
+                        break
+            except queue.Empty:
+                pass
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            try:
+                with self._db_lock:
+                    with self._conn:
+                        for sql, params in batch:
+                            self._conn.execute(sql, params)
+            except Exception:
+                logger.exception("Failed to persist %d checkpoint rows", len(batch))
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Blocks until every queued row is persisted."""
+        self._queue.join()
+
+    def close(self):
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._conn.close()
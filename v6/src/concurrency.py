@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED from the google-genai client or an HTTP client."""
+    code = getattr(error, "code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return code == 429 or getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+
+
+class AdaptiveLimiter:
+    """
+    Per-process cap on in-flight calls with an AIMD limit: every successful call grows the
+    limit by increase/limit (about +increase per window of calls), a rate-limit error cuts it
+    by the decrease factor, at most once per cooldown so a burst of 429s from one window
+    counts once. Rate-limited calls are retried here with jittered exponential backoff,
+    so the client underneath should not retry them itself.
+    Sync and async callers share the limit and wait in one FIFO queue.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._last_decrease = 0.0
+        self.in_flight = 0
+        # threading.Event for sync callers, (loop, future) for async ones
+        self._waiters: deque = deque()
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.max_in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    # Slots
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return True
+        return False
+
+    def _record_wait(self, started: float):
+        waited = time.monotonic() - started
+        with self._lock:
+            self.calls += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def acquire(self):
+        started = time.monotonic()
+        with self._lock:
+            if self._try_acquire():
+                waiter = None
+            else:
+                waiter = threading.Event()
+                self._waiters.append(waiter)
+        if waiter is not None:
+            waiter.wait()
+        self._record_wait(started)
+
+    async def aacquire(self):
+        started = time.monotonic()
+        with self._lock:
+            if self._try_acquire():
+                future = None
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._waiters.append((asyncio.get_running_loop(), future))
+        if future is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (asyncio.get_running_loop(), future) in self._waiters:
+                        self._waiters.remove((asyncio.get_running_loop(), future))
+                        raise
+                # The slot was handed over just before the cancellation, pass it on
+                self.release()
+                raise
+        self._record_wait(started)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self):
+        # Hands free slots to queued callers, in_flight is counted on their behalf
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                loop.call_soon_threadsafe(_resolve, future)
+
+    # AIMD
+
+    def _on_success(self):
+        with self._lock:
+            self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+            self._wake()
+
+    def _on_throttle(self):
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            previous = self.limit
+            self._limit = max(self.min_limit, self._limit * self.decrease)
+        logger.warning("%s rate limited, concurrency limit %d -> %d", self.name, previous, self.limit)
+
+    def _delay(self, attempt: int) -> float:
+        return min(self.max_backoff, self.backoff * 2**attempt) * random.uniform(0.5, 1.0)
+
+    # Calls
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self._on_throttle()
+            else:
+                self._on_success()
+                return result
+            finally:
+                self.release()
+            self.retries += 1
+            time.sleep(self._delay(attempt))
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        for attempt in range(self.max_retries + 1):
+            await self.aacquire()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self._on_throttle()
+            else:
+                self._on_success()
+                return result
+            finally:
+                self.release()
+            self.retries += 1
+            await asyncio.sleep(self._delay(attempt))
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "max_in_flight": self.max_in_flight,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "avg_wait": self.wait_total / self.calls if self.calls else 0.0,
+                "max_wait": self.wait_max,
+            }
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
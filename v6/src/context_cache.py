@@ -0,0 +1,216 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+from google.genai import Client, types
+from langchain_core.messages import AnyMessage, HumanMessage
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.transcript import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Smallest prefix Gemini accepts as cached content, by model name prefix (the longest match wins)
+MIN_CACHE_TOKENS = {
+    "gemini-2.5-flash": 1024,
+    "gemini-2.5-pro": 4096,
+    "gemini-2.0-flash": 4096,
+}
+DEFAULT_MIN_CACHE_TOKENS = 4096
+
+
+def min_cache_tokens(model: str) -> int:
+    model = model.removeprefix("models/")
+    matches = [name for name in MIN_CACHE_TOKENS if model.startswith(name)]
+    return MIN_CACHE_TOKENS[max(matches, key=len)] if matches else DEFAULT_MIN_CACHE_TOKENS
+
+
+def function_declarations(tools: Sequence[Any]) -> types.Tool:
+    """Gemini declarations of LangChain tools, pydantic models or functions."""
+    declarations = []
+    for tool in tools:
+        function = convert_to_openai_tool(tool)["function"]
+        declarations.append(
+            types.FunctionDeclaration(
+                name=function["name"],
+                description=function.get("description"),
+                parameters_json_schema=function.get("parameters"),
+            )
+        )
+    return types.Tool(function_declarations=declarations)
+
+
+class GeminiContextCacheBackend:
+    """Creates Gemini cached contents holding the prefix as a user turn, plus the tool declarations."""
+
+    def __init__(self, client: Client):
+        self.client = client
+
+    def _config(self, prefix: str, tools: Sequence[Any], ttl: float) -> types.CreateCachedContentConfig:
+        return types.CreateCachedContentConfig(
+            contents=[types.Content(role="user", parts=[types.Part(text=prefix)])],
+            tools=[function_declarations(tools)] if tools else None,
+            ttl=f"{int(ttl)}s",
+        )
+
+    def create(self, model: str, prefix: str, tools: Sequence[Any], ttl: float) -> str:
+        return self.client.caches.create(model=model, config=self._config(prefix, tools, ttl)).name
+
+    async def acreate(self, model: str, prefix: str, tools: Sequence[Any], ttl: float) -> str:
+        return (await self.client.aio.caches.create(model=model, config=self._config(prefix, tools, ttl))).name
+
+
+class LocalContextCacheBackend:
+    """In-process stand-in for tests: hands out names and keeps the cached prefixes, never calls the API."""
+
+    def __init__(self):
+        self.entries = {}
+        self._ids = itertools.count(1)
+
+    def create(self, model: str, prefix: str, tools: Sequence[Any], ttl: float) -> str:
+        name = f"cachedContents/local-{next(self._ids)}"
+        self.entries[name] = {"model": model, "prefix": prefix, "tools": list(tools), "ttl": ttl}
+        return name
+
+    async def acreate(self, model: str, prefix: str, tools: Sequence[Any], ttl: float) -> str:
+        return self.create(model, prefix, tools, ttl)
+
+
+class ContextCacheManager:
+    """
+    Serves long static prompt prefixes from provider-side cached contents.
+    A handle is created once per (model, prefix, tools) and reused until shortly before
+    its TTL expires. Prefixes under the model's minimum (min_tokens overrides it), models
+    without a name, failed creations and failed cached calls fall back to sending the prefix inline.
+    """
+
+    def __init__(
+        self,
+        backend,
+        ttl: float = 3600,
+        min_tokens: Optional[int] = None,
+        refresh_margin: float = 60,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self.refresh_margin = refresh_margin
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # key -> (name or None for a failed creation, expires_at)
+        self._handles: dict[str, tuple[Optional[str], float]] = {}
+        self.created = 0
+        self.reused = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def make_key(model: str, prefix: str, tools: Sequence[Any]) -> str:
+        tool_names = ",".join(getattr(tool, "name", None) or getattr(tool, "__name__", str(tool)) for tool in tools)
+        return hashlib.sha256(f"{model}\n{tool_names}\n{prefix}".encode("utf-8")).hexdigest()
+
+    def cacheable(self, model: Optional[str], prefix: str) -> bool:
+        """Whether get would try to serve the prefix from a cached content."""
+        if not self.enabled or not model:
+            return False
+        return estimate_tokens(prefix) >= (self.min_tokens or min_cache_tokens(model))
+
+    def _lookup(self, key: str) -> tuple[bool, Optional[str]]:
+        """Returns (found, name); a found entry with no name is a recent failure."""
+        with self._lock:
+            entry = self._handles.get(key)
+            if entry is None or entry[1] - self.refresh_margin < time.time():
+                return False, None
+            if entry[0] is not None:
+                self.reused += 1
+            return True, entry[0]
+
+    def _store(self, key: str, name: Optional[str]):
+        with self._lock:
+            if name is not None:
+                self.created += 1
+            self._handles[key] = (name, time.time() + self.ttl)
+
+    def invalidate(self, model: str, prefix: str, tools: Sequence[Any] = ()):
+        # Remembered as a failure, so the prefix is sent inline until the TTL passes
+        self._store(self.make_key(model, prefix, tools), None)
+
+    def get(self, model: Optional[str], prefix: str, tools: Sequence[Any] = ()) -> Optional[str]:
+        """Returns the cached content name for the prefix, creating it if needed, or None to send it inline."""
+        if not self.cacheable(model, prefix):
+            return None
+        key = self.make_key(model, prefix, tools)
+        found, name = self._lookup(key)
+        if found:
+            return name
+        try:
+            name = self.backend.create(model, prefix, tools, self.ttl)
+        except Exception as e:
+            logger.warning("context cache unavailable for %s, sending the prefix inline: %s", model, e)
+            name = None
+        self._store(key, name)
+        return name
+
+    async def aget(self, model: Optional[str], prefix: str, tools: Sequence[Any] = ()) -> Optional[str]:
+        if not self.cacheable(model, prefix):
+            return None
+        key = self.make_key(model, prefix, tools)
+        found, name = self._lookup(key)
+        if found:
+            return name
+        try:
+            name = await self.backend.acreate(model, prefix, tools, self.ttl)
+        except Exception as e:
+            logger.warning("context cache unavailable for %s, sending the prefix inline: %s", model, e)
+            name = None
+        self._store(key, name)
+        return name
+
+    def invoke(
+        self,
+        llm: Runnable,
+        prefix: str,
+        messages: list[AnyMessage],
+        tools: Sequence[Any] = (),
+        fallback: Optional[Runnable] = None,
+    ):
+        """
+        Invokes llm with the prefix served from the cache, or fallback (llm with the tools bound)
+        with the prefix sent inline as the first message.
+        """
+        model = getattr(llm, "model", None)
+        name = self.get(model, prefix, tools)
+        if name is not None:
+            try:
+                return llm.invoke(messages, cached_content=name)
+            except Exception as e:
+                logger.warning("cached call failed, retrying with the prefix inline: %s", e)
+                self.invalidate(model, prefix, tools)
+        self.fallbacks += 1
+        return (fallback or llm).invoke([HumanMessage(prefix)] + messages)
+
+    async def ainvoke(
+        self,
+        llm: Runnable,
+        prefix: str,
+        messages: list[AnyMessage],
+        tools: Sequence[Any] = (),
+        fallback: Optional[Runnable] = None,
+    ):
+        model = getattr(llm, "model", None)
+        name = await self.aget(model, prefix, tools)
+        if name is not None:
+            try:
+                return await llm.ainvoke(messages, cached_content=name)
+            except Exception as e:
+                logger.warning("cached call failed, retrying with the prefix inline: %s", e)
+                self.invalidate(model, prefix, tools)
+        self.fallbacks += 1
+        return await (fallback or llm).ainvoke([HumanMessage(prefix)] + messages)
+
+    def stats(self) -> dict[str, int]:
+        return {"created": self.created, "reused": self.reused, "fallbacks": self.fallbacks}
@@ -0,0 +1,88 @@
+from typing import Optional
+
+from langchain_core.messages import AnyMessage, HumanMessage, ToolMessage
+
+from src.transcript import estimate_tokens
+
+
+def message_tokens(message: AnyMessage) -> int:
+    tokens = estimate_tokens(str(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(str(tool_call["args"]))
+    return tokens
+
+
+class ContextWindow:
+    """
+    Keeps the interview prompt under a token budget.
+    The last keep_last_turns turns (a turn starts at a human message) are sent verbatim,
+    tool payloads of earlier turns are cut to tool_payload_chars, and once the prompt is
+    still over budget the turns before the window are folded into a rolling summary.
+    """
+
+    def __init__(self, keep_last_turns: int = 4, token_budget: int = 6000, tool_payload_chars: int = 1500):
+        self.keep_last_turns = keep_last_turns
+        self.token_budget = token_budget
+        self.tool_payload_chars = tool_payload_chars
+
+    def recent_start(self, messages: list[AnyMessage], summarized_until: int) -> int:
+        """Index of the first message of the last keep_last_turns turns."""
+        turn_starts = [
+            index for index in range(summarized_until, len(messages))
+            if isinstance(messages[index], HumanMessage)
+        ]
+        if len(turn_starts) <= self.keep_last_turns:
+            return summarized_until
+        return turn_starts[-self.keep_last_turns]
+
+    def condense_tool_payloads(self, messages: list[AnyMessage]) -> list[AnyMessage]:
+        """Cuts tool results that precede the latest human message, the current turn keeps them whole."""
+        last_human = max(
+            (index for index, message in enumerate(messages) if isinstance(message, HumanMessage)),
+            default=-1,
+        )
+        condensed = []
+        for index, message in enumerate(messages):
+            if (
+                index < last_human
+                and isinstance(message, ToolMessage)
+                and len(str(message.content)) > self.tool_payload_chars
+            ):
+                message = message.model_copy(
+                    update={"content": str(message.content)[: self.tool_payload_chars] + "…"}
+                )
+            condensed.append(message)
+        return condensed
+
+    def build(
+        self,
+        prefix: list[AnyMessage],
+        messages: list[AnyMessage],
+        summary: Optional[str],
+        summarized_until: int,
+    ) -> list[AnyMessage]:
+        window = self.condense_tool_payloads(messages[summarized_until:])
+        if summary:
+            window = [HumanMessage(f"Підсумок попередньої частини розмови:\n{summary}")] + window
+        return prefix + window
+
+    def fold_index(
+        self,
+        prefix: list[AnyMessage],
+        messages: list[AnyMessage],
+        summary: Optional[str],
+        summarized_until: int,
+    ) -> Optional[int]:
+        """Returns the index up to which turns should be folded into the summary, or None if the prompt fits."""
+        tokens = count_tokens(self.build(prefix, messages, summary, summarized_until))
+        if tokens <= self.token_budget:
+            return None
+        recent_start = self.recent_start(messages, summarized_until)
+        if recent_start <= summarized_until:
+            return None
+        return recent_start
+
+
+def count_tokens(messages: list[AnyMessage]) -> int:
+    return sum(message_tokens(message) for message in messages)
+
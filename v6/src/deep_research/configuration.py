@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from typing import Any, Optional
 
@@ -41,6 +42,20 @@ class Configuration(BaseModel):
         metadata={"description": "The number of initial search queries to generate."},
     )
 
+    queries_per_search: int = Field(
+        default=1,
+        metadata={
+            "description": "The number of search queries answered together by one grounded search call (1 searches each on its own)."
+        },
+    )
+
+    duplicate_query_threshold: float = Field(
+        default=0.7,
+        metadata={
+            "description": "Follow-up queries at least this similar to a query already run or kept are not searched (above 1 keeps all)."
+        },
+    )
+
     max_research_loops: int = Field(
         default=2,
         metadata={"description": "The maximum number of research loops to perform."},
@@ -56,8 +71,9 @@ class Configuration(BaseModel):
         )
 
         # Get raw values from environment or config
+        env_values = cls._env_values()
         raw_values: dict[str, Any] = {
-            name: os.environ.get(name.upper(), configurable.get(name))
+            name: env_values.get(name, configurable.get(name))
             for name in cls.model_fields.keys()
         }
 
@@ -65,3 +81,21 @@ class Configuration(BaseModel):
         values = {k: v for k, v in raw_values.items() if v is not None}
 
         return cls(**values)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _env_values(cls) -> dict[str, str]:
+        """
+        Read the environment overrides once per process: later changes to os.environ
+        are not seen until reload_env is called.
+        """
+        return {
+            name: os.environ[name.upper()]
+            for name in cls.model_fields.keys()
+            if name.upper() in os.environ
+        }
+
+    @classmethod
+    def reload_env(cls):
+        """Drop the cached environment overrides, e.g. after a test changes them."""
+        cls._env_values.cache_clear()
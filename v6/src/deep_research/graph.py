@@ -1,9 +1,16 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+
 from src.deep_research.tools_and_schemas import SearchQueryList, Reflection
 from langgraph.types import Send
 from langgraph.graph import StateGraph
 from langgraph.graph import START, END
-from langchain_core.runnables import RunnableConfig
-from src.llm import genai_client
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from src.llm import agenerate_content, generate_content, get_model, response_cache, web_research_limiter
+from shared.rate_limiter import Priority
 from src.state import memory
 
 from src.deep_research.state import (
@@ -17,17 +24,34 @@ from src.deep_research.prompts import (
     get_current_date,
     query_writer_instructions,
     web_searcher_instructions,
+    web_searcher_batch_instructions,
     reflection_instructions,
     answer_instructions,
 )
-from langchain_google_genai import ChatGoogleGenerativeAI
 from src.deep_research.utils import (
     get_citations,
     get_research_topic,
+    drop_near_duplicates,
     insert_citation_markers,
+    normalize_query,
+    rebase_short_urls,
     resolve_urls,
+    split_batched_response,
 )
 
+logger = logging.getLogger(__name__)
+
+WEB_SEARCH_CONFIG = {
+    "tools": [{"google_search": {}}],
+    "temperature": 0,
+}
+
+# Both calls run at temperature 0, so identical prompts can be answered from the cache.
+# Web research results are shared across sessions by normalized query, for as long as they count as fresh
+WEB_RESEARCH_CACHE_TTL = float(os.getenv("WEB_RESEARCH_CACHE_TTL", 6 * 60 * 60))
+FINALIZE_ANSWER_CACHE_TTL = 24 * 60 * 60
+
+
 # Nodes
 def generate_query(state: OverallState, config: RunnableConfig) -> QueryGenerationState:
     """LangGraph node that generates a search queries based on the User's question.
@@ -47,35 +71,57 @@ def generate_query(state: OverallState, config: RunnableConfig) -> QueryGenerati
     if state.get("initial_search_query_count") is None:
         state["initial_search_query_count"] = configurable.number_of_initial_queries
 
-    llm = ChatGoogleGenerativeAI(
-        model=configurable.query_generator_model,
-        temperature=1.0,
-        max_retries=2,
-    )
-    structured_llm = llm.with_structured_output(SearchQueryList)
+    structured_llm = get_model(configurable.query_generator_model, 1.0, SearchQueryList, priority=Priority.BACKGROUND)
+    result = structured_llm.invoke(_query_writer_prompt(state))
+    return {"query_list": result.query}
+
 
-    current_date = get_current_date()
+async def agenerate_query(state: OverallState, config: RunnableConfig) -> QueryGenerationState:
+    """Async variant of `generate_query`."""
+    configurable = Configuration.from_runnable_config(config)
+
+    if state.get("initial_search_query_count") is None:
+        state["initial_search_query_count"] = configurable.number_of_initial_queries
+
+    structured_llm = get_model(configurable.query_generator_model, 1.0, SearchQueryList, priority=Priority.BACKGROUND)
+    result = await structured_llm.ainvoke(_query_writer_prompt(state))
+    return {"query_list": result.query}
+
+
+def _query_writer_prompt(state: OverallState) -> str:
     event = state["event"]
-    formatted_prompt = query_writer_instructions.format(
-        current_date=current_date,
+    return query_writer_instructions.format(
+        current_date=get_current_date(),
         target_audience=event["target_audience"],
         event_name=event["event"]["name"],
         audience_knowledge=event["audience_knowledge"],
         key_message=event["key_message"],
         number_queries=state["initial_search_query_count"],
     )
-    result = structured_llm.invoke(formatted_prompt)
-    return {"query_list": result.query}
 
 
-def continue_to_web_research(state: QueryGenerationState):
+def continue_to_web_research(state: QueryGenerationState, config: RunnableConfig):
     """LangGraph node that sends the search queries to the web research node.
 
-    This is used to spawn n number of web research nodes, one for each search query.
+    This is used to spawn n number of web research nodes, one for each search query,
+    or one for each batch of queries_per_search queries.
     """
+    configurable = Configuration.from_runnable_config(config)
+    return _web_research_sends(state["query_list"], 0, configurable.queries_per_search)
+
+
+def _web_research_sends(queries: list[str], first_id: int, queries_per_search: int) -> list[Send]:
+    if queries_per_search <= 1:
+        return [
+            Send("web_research", {"search_query": search_query, "id": first_id + int(idx)})
+            for idx, search_query in enumerate(queries)
+        ]
     return [
-        Send("web_research", {"search_query": search_query, "id": int(idx)})
-        for idx, search_query in enumerate(state["query_list"])
+        Send(
+            "web_research",
+            {"search_query": queries[idx], "batch": queries[idx:idx + queries_per_search], "id": first_id + idx},
+        )
+        for idx in range(0, len(queries), queries_per_search)
     ]
 
 
@@ -83,6 +129,7 @@ def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
     """LangGraph node that performs web research using the native Google Search API tool.
 
     Executes a web search using the native Google Search API tool in combination with Gemini 2.0 Flash.
+    A batch of queries is answered by one grounded call, split back into a result per query.
 
     Args:
         state: Current graph state containing the search query and research loop count
@@ -93,20 +140,171 @@ def web_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
     """
     # Configure
     configurable = Configuration.from_runnable_config(config)
-    formatted_prompt = web_searcher_instructions.format(
+    searches, updates = _pending_web_research(state, configurable)
+
+    # Uses the google genai client as the langchain client doesn't return grounding metadata
+    if len(searches) > 1:
+        response = generate_content(
+            model=configurable.query_generator_model,
+            contents=_web_searcher_batch_prompt(searches),
+            config=WEB_SEARCH_CONFIG,
+            limiter=web_research_limiter,
+            priority=Priority.BACKGROUND,
+        )
+        searches = _split_web_research(searches, response, updates)
+    for search, cache_key in searches:
+        response = generate_content(
+            model=configurable.query_generator_model,
+            contents=_web_searcher_prompt(search),
+            config=WEB_SEARCH_CONFIG,
+            limiter=web_research_limiter,
+            priority=Priority.BACKGROUND,
+        )
+        updates.append(_cache_web_research(search, cache_key, _web_research_update(search, response)))
+    _log_limiter()
+    return _merge_web_research(updates)
+
+
+async def aweb_research(state: WebSearchState, config: RunnableConfig) -> OverallState:
+    """Async variant of `web_research`.
+
+    Parallel branches sent by `continue_to_web_research` run as concurrent
+    coroutines on the event loop instead of occupying worker threads.
+    """
+    configurable = Configuration.from_runnable_config(config)
+    # The result cache is SQLite, its reads and writes run on worker threads
+    searches, updates = await asyncio.to_thread(_pending_web_research, state, configurable)
+
+    if len(searches) > 1:
+        response = await agenerate_content(
+            model=configurable.query_generator_model,
+            contents=_web_searcher_batch_prompt(searches),
+            config=WEB_SEARCH_CONFIG,
+            limiter=web_research_limiter,
+            priority=Priority.BACKGROUND,
+        )
+        searches = await asyncio.to_thread(_split_web_research, searches, response, updates)
+
+    async def search_one(search: WebSearchState, cache_key: str) -> OverallState:
+        response = await agenerate_content(
+            model=configurable.query_generator_model,
+            contents=_web_searcher_prompt(search),
+            config=WEB_SEARCH_CONFIG,
+            limiter=web_research_limiter,
+            priority=Priority.BACKGROUND,
+        )
+        return await asyncio.to_thread(_cache_web_research, search, cache_key, _web_research_update(search, response))
+
+    updates += await asyncio.gather(*(search_one(search, cache_key) for search, cache_key in searches))
+    _log_limiter()
+    return _merge_web_research(updates)
+
+
+def _pending_web_research(
+    state: WebSearchState, configurable: Configuration
+) -> tuple[list[tuple[WebSearchState, str]], list[OverallState]]:
+    """Splits the queries of the state into (search, cache key) pairs still to search and updates served from the cache."""
+    if state.get("batch"):
+        searches = [
+            {"search_query": query, "id": int(state["id"]) + offset} for offset, query in enumerate(state["batch"])
+        ]
+    else:
+        searches = [state]
+    pending, updates = [], []
+    for search in searches:
+        cache_key = _web_research_cache_key(search, configurable)
+        cached = _cached_web_research(search, cache_key)
+        if cached is None:
+            pending.append((search, cache_key))
+        else:
+            updates.append(cached)
+    return pending, updates
+
+
+def _split_web_research(
+    searches: list[tuple[WebSearchState, str]], response, updates: list[OverallState]
+) -> list[tuple[WebSearchState, str]]:
+    """Adds a result per query of a batched answer to updates and returns the searches it left out."""
+    missing = []
+    for (search, cache_key), section in zip(searches, split_batched_response(response, len(searches))):
+        if section is None:
+            missing.append((search, cache_key))
+        else:
+            updates.append(_cache_web_research(search, cache_key, _web_research_update(search, section)))
+    if missing:
+        logger.warning(
+            "web_research: batched answer left out %d of %d queries, searching them one by one",
+            len(missing), len(searches),
+        )
+    return missing
+
+
+def _merge_web_research(updates: list[OverallState]) -> OverallState:
+    return {
+        "sources_gathered": [source for update in updates for source in update["sources_gathered"]],
+        "search_query": [query for update in updates for query in update["search_query"]],
+        "web_research_result": [result for update in updates for result in update["web_research_result"]],
+    }
+
+
+def _log_limiter():
+    stats = web_research_limiter.stats()
+    logger.info(
+        "web_research: %d in flight (limit %d, %d queued), queue wait avg %.2fs max %.2fs, %d throttled",
+        stats["in_flight"], stats["limit"], stats["queued"], stats["avg_wait"], stats["max_wait"], stats["throttled"],
+    )
+
+
+def _web_research_cache_key(state: WebSearchState, configurable: Configuration) -> str:
+    # The date in the prompt is left out, freshness is up to the TTL
+    return response_cache.make_key(
+        normalize_query(state["search_query"]),
+        configurable.query_generator_model,
+        instructions=web_searcher_instructions,
+        **WEB_SEARCH_CONFIG,
+    )
+
+
+def _cached_web_research(state: WebSearchState, cache_key: str) -> Optional[OverallState]:
+    """A fresh result of the same query from any session, with short urls moved to this query's id."""
+    cached = response_cache.get(cache_key, "web_research")
+    if cached is None:
+        return None
+    entry = json.loads(cached)
+    text, sources_gathered = rebase_short_urls(entry["text"], entry["sources_gathered"], entry["id"], state["id"])
+    logger.info("web_research: cached result reused for %r", state["search_query"])
+    return {
+        "sources_gathered": sources_gathered,
+        "search_query": [state["search_query"]],
+        "web_research_result": [text],
+    }
+
+
+def _cache_web_research(state: WebSearchState, cache_key: str, update: OverallState) -> OverallState:
+    entry = {
+        "id": state["id"],
+        "text": update["web_research_result"][0],
+        "sources_gathered": update["sources_gathered"],
+    }
+    response_cache.set(cache_key, json.dumps(entry, ensure_ascii=False), WEB_RESEARCH_CACHE_TTL)
+    return update
+
+
+def _web_searcher_batch_prompt(searches: list[tuple[WebSearchState, str]]) -> str:
+    return web_searcher_batch_instructions.format(
         current_date=get_current_date(),
-        research_topic=state["search_query"],
+        research_topics="\n".join(f"{n}. {search['search_query']}" for n, (search, _) in enumerate(searches, 1)),
     )
 
-    # Uses the google genai client as the langchain client doesn't return grounding metadata
-    response = genai_client.models.generate_content(
-        model=configurable.query_generator_model,
-        contents=formatted_prompt,
-        config={
-            "tools": [{"google_search": {}}],
-            "temperature": 0,
-        },
+
+def _web_searcher_prompt(state: WebSearchState) -> str:
+    return web_searcher_instructions.format(
+        current_date=get_current_date(),
+        research_topic=state["search_query"],
     )
+
+
+def _web_research_update(state: WebSearchState, response) -> OverallState:
     # resolve the urls to short urls for saving tokens and time
     resolved_urls = resolve_urls(
         response.candidates[0].grounding_metadata.grounding_chunks, state["id"]
@@ -141,25 +339,48 @@ def reflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
     state["research_loop_count"] = state.get("research_loop_count", 0) + 1
     reasoning_model = state.get("reasoning_model") or configurable.reasoning_model
 
-    current_date = get_current_date()
-    formatted_prompt = reflection_instructions.format(
-        current_date=current_date,
+    structured_llm = get_model(reasoning_model, 1.0, Reflection, priority=Priority.BACKGROUND)
+    result = structured_llm.invoke(_reflection_prompt(state))
+    return _reflection_update(state, result, configurable)
+
+
+async def areflection(state: OverallState, config: RunnableConfig) -> ReflectionState:
+    """Async variant of `reflection`."""
+    configurable = Configuration.from_runnable_config(config)
+    state["research_loop_count"] = state.get("research_loop_count", 0) + 1
+    reasoning_model = state.get("reasoning_model") or configurable.reasoning_model
+
+    structured_llm = get_model(reasoning_model, 1.0, Reflection, priority=Priority.BACKGROUND)
+    result = await structured_llm.ainvoke(_reflection_prompt(state))
+    return _reflection_update(state, result, configurable)
+
+
+def _reflection_prompt(state: OverallState) -> str:
+    return reflection_instructions.format(
+        current_date=get_current_date(),
         research_topic=get_research_topic(state["messages"]),
         summaries="\n\n---\n\n".join(state["web_research_result"]),
     )
-    llm = ChatGoogleGenerativeAI(
-        model=reasoning_model,
-        temperature=1.0,
-        max_retries=2,
-    )
-    result = llm.with_structured_output(Reflection).invoke(formatted_prompt)
 
+
+def _reflection_update(state: OverallState, result: Reflection, configurable: Configuration) -> ReflectionState:
+    # Paraphrases of queries already searched would only bring back the same sources
+    follow_up_queries, duplicates = drop_near_duplicates(
+        result.follow_up_queries, state["search_query"], configurable.duplicate_query_threshold
+    )
+    skipped_queries = state.get("skipped_queries", 0) + len(duplicates)
+    if duplicates:
+        logger.info(
+            "reflection: skipped %d near-duplicate follow-up queries %s, %d grounded searches saved in this run",
+            len(duplicates), duplicates, skipped_queries,
+        )
     return {
         "is_sufficient": result.is_sufficient,
         "knowledge_gap": result.knowledge_gap,
-        "follow_up_queries": result.follow_up_queries,
+        "follow_up_queries": follow_up_queries,
         "research_loop_count": state["research_loop_count"],
         "number_of_ran_queries": len(state["search_query"]),
+        "skipped_queries": skipped_queries,
     }
 
 
@@ -185,19 +406,16 @@ def evaluate_research(
         if state.get("max_research_loops") is not None
         else configurable.max_research_loops
     )
-    if state["is_sufficient"] or state["research_loop_count"] >= max_research_loops:
+    if (
+        state["is_sufficient"]
+        or state["research_loop_count"] >= max_research_loops
+        or not state["follow_up_queries"]
+    ):
         return "finalize_answer"
     else:
-        return [
-            Send(
-                "web_research",
-                {
-                    "search_query": follow_up_query,
-                    "id": state["number_of_ran_queries"] + int(idx),
-                },
-            )
-            for idx, follow_up_query in enumerate(state["follow_up_queries"])
-        ]
+        return _web_research_sends(
+            state["follow_up_queries"], state["number_of_ran_queries"], configurable.queries_per_search
+        )
 
 
 def finalize_answer(state: OverallState, config: RunnableConfig):
@@ -216,22 +434,35 @@ def finalize_answer(state: OverallState, config: RunnableConfig):
     configurable = Configuration.from_runnable_config(config)
     reasoning_model = state.get("reasoning_model") or configurable.reasoning_model
 
-    # Format the prompt
-    current_date = get_current_date()
-    formatted_prompt = answer_instructions.format(
-        current_date=current_date,
+    # init Reasoning Model, default to Gemini 2.5 Flash
+    llm = get_model(
+        reasoning_model, 0, cache_ttl=FINALIZE_ANSWER_CACHE_TTL, call_site="finalize_answer", priority=Priority.BACKGROUND
+    )
+    result = llm.invoke(_answer_prompt(state))
+    return _finalize_update(state, result)
+
+
+async def afinalize_answer(state: OverallState, config: RunnableConfig):
+    """Async variant of `finalize_answer`."""
+    configurable = Configuration.from_runnable_config(config)
+    reasoning_model = state.get("reasoning_model") or configurable.reasoning_model
+
+    llm = get_model(
+        reasoning_model, 0, cache_ttl=FINALIZE_ANSWER_CACHE_TTL, call_site="finalize_answer", priority=Priority.BACKGROUND
+    )
+    result = await llm.ainvoke(_answer_prompt(state))
+    return _finalize_update(state, result)
+
+
+def _answer_prompt(state: OverallState) -> str:
+    return answer_instructions.format(
+        current_date=get_current_date(),
         research_topic=get_research_topic(state["messages"]),
         summaries="\n---\n\n".join(state["web_research_result"]),
     )
 
-    # init Reasoning Model, default to Gemini 2.5 Flash
-    llm = ChatGoogleGenerativeAI(
-        model=reasoning_model,
-        temperature=0,
-        max_retries=2,
-    )
-    result = llm.invoke(formatted_prompt)
 
+def _finalize_update(state: OverallState, result):
     # Replace the short urls with the original urls and add all used urls to the sources_gathered
     unique_sources = []
     for source in state["sources_gathered"]:
@@ -252,10 +483,12 @@ def finalize_answer(state: OverallState, config: RunnableConfig):
 deep_research_builder = StateGraph(OverallState, config_schema=Configuration)
 
 # Define the nodes we will cycle between
-deep_research_builder.add_node("generate_query", generate_query)
-deep_research_builder.add_node("web_research", web_research)
-deep_research_builder.add_node("reflection", reflection)
-deep_research_builder.add_node("finalize_answer", finalize_answer)
+# Each node has a sync and an async implementation: `graph.invoke`/`stream` use the
+# former (CLI), `ainvoke`/`astream` the latter (Chainlit, langgraph-api)
+deep_research_builder.add_node("generate_query", RunnableLambda(generate_query, afunc=agenerate_query))
+deep_research_builder.add_node("web_research", RunnableLambda(web_research, afunc=aweb_research))
+deep_research_builder.add_node("reflection", RunnableLambda(reflection, afunc=areflection))
+deep_research_builder.add_node("finalize_answer", RunnableLambda(finalize_answer, afunc=afinalize_answer))
 
 # Set the entrypoint as `generate_query`
 # This means that this node is the first one called
@@ -32,6 +32,26 @@ web_searcher_instructions = """Виконуй цільові пошукові з
 {research_topic}
 """
 
+web_searcher_batch_instructions = """Виконуй цільові пошукові запити в Google, щоб зібрати найновішу та достовірну інформацію про кожну з тем нижче, і синтезуй її в окремий перевірений текстовий артефакт для кожної теми.
+
+Інструкції:
+
+Запити повинні забезпечити отримання максимально актуальної інформації. Поточна дата: {current_date}.
+
+Для кожної теми проведи кілька різноманітних пошуків, щоб зібрати всебічну інформацію.
+
+Узагальни ключові висновки, ретельно відстежуючи джерело кожного конкретного фрагмента інформації.
+
+Результатом для кожної теми має бути добре написане резюме або звіт на основі знайдених даних.
+
+Включай лише ту інформацію, яка була знайдена в результатах пошуку. Не вигадуй дані.
+
+Формат відповіді: відповідь на кожну тему починай з окремого рядка з її номером у вигляді <<<номер>>>, наприклад <<<1>>>, і нічого не пиши перед першим таким рядком. Відповідай на теми по порядку, не пропускай і не об'єднуй їх.
+
+Теми дослідження:
+{research_topics}
+"""
+
 reflection_instructions = """Ви — досвідчений науковий асистент, який аналізує резюме з теми "{research_topic}".
 
 Інструкції:
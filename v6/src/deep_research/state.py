@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import TypedDict
 
 from langgraph.graph import MessagesState
-from typing_extensions import Annotated
+from typing_extensions import Annotated, NotRequired
 
 
 import operator
@@ -25,13 +25,15 @@ class OverallState(MessagesState):
     max_research_loops: int
     research_loop_count: int
     reasoning_model: str
+    skipped_queries: int
     final_research_result: Optional[str] = None
 
 
 class ReflectionState(TypedDict):
     is_sufficient: bool
     knowledge_gap: str
-    follow_up_queries: Annotated[list, operator.add]
+    # Only this loop's queries, the ones already run are in OverallState.search_query
+    follow_up_queries: list
     research_loop_count: int
     number_of_ran_queries: int
 
@@ -48,6 +50,8 @@ class QueryGenerationState(TypedDict):
 class WebSearchState(TypedDict):
     search_query: str
     id: str
+    # Queries searched together in one grounded call, with ids counting up from id
+    batch: NotRequired[list[str]]
 
 
 @dataclass(kw_only=True)
@@ -1,5 +1,10 @@
-from typing import Any, Dict, List
-from langchain_core.messages import AnyMessage, AIMessage, HumanMessage
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+from google.genai import types
+from langchain_core.messages import AnyMessage
+
+from src.transcript import render_transcript
 
 
 def get_research_topic(messages: List[AnyMessage]) -> str:
@@ -8,15 +13,12 @@ def get_research_topic(messages: List[AnyMessage]) -> str:
     """
     # check if request has a history and combine the messages into a single string
     if len(messages) == 1:
-        research_topic = messages[-1].content
-    else:
-        research_topic = ""
-        for message in messages:
-            if isinstance(message, HumanMessage):
-                research_topic += f"User: {message.content}\n"
-            elif isinstance(message, AIMessage):
-                research_topic += f"Assistant: {message.content}\n"
-    return research_topic
+        return messages[-1].content
+    # Tool calls and search payloads of the interview are not part of the topic
+    return render_transcript(messages, tool_payload_chars=0)
+
+
+SHORT_URL_PREFIX = "https://vertexaisearch.cloud.google.com/id/"
 
 
 def resolve_urls(urls_to_resolve: List[Any], id: int) -> Dict[str, str]:
@@ -24,7 +26,7 @@ def resolve_urls(urls_to_resolve: List[Any], id: int) -> Dict[str, str]:
     Create a map of the vertex ai search urls (very long) to a short url with a unique id for each url.
     Ensures each original URL gets a consistent shortened form while maintaining uniqueness.
     """
-    prefix = f"https://vertexaisearch.cloud.google.com/id/"
+    prefix = SHORT_URL_PREFIX
     urls = [site.web.uri for site in urls_to_resolve]
 
     # Create a dictionary that maps each unique URL to its first occurrence index
@@ -36,6 +38,110 @@ def resolve_urls(urls_to_resolve: List[Any], id: int) -> Dict[str, str]:
     return resolved_map
 
 
+def normalize_query(query: str) -> str:
+    """
+    Search query casefolded, NFKC-normalized and with punctuation and whitespace collapsed,
+    so queries that differ only in those share one cache entry. Word order is kept
+    ("Kyiv to Lviv" is not "Lviv to Kyiv"), rewordings are left to drop_near_duplicates.
+    """
+    return " ".join(re.findall(r"\w+", unicodedata.normalize("NFKC", query).casefold()))
+
+
+def query_shingles(query: str, size: int = 3) -> set[str]:
+    """Character shingles of the query's words, so inflected and reordered words still overlap."""
+    shingles = set()
+    for word in re.findall(r"\w+", unicodedata.normalize("NFKC", query).casefold()):
+        padded = f" {word} "
+        shingles.update(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+    return shingles
+
+
+def drop_near_duplicates(
+    queries: List[str], ran_queries: List[str], threshold: float
+) -> tuple[List[str], List[str]]:
+    """
+    Splits queries into (kept, dropped): a query is dropped when the Jaccard similarity of its
+    shingles to an already run query, or to a query kept before it, reaches the threshold.
+    Queries that mention different numbers (years, sizes) are never duplicates.
+    """
+    seen = [(query_shingles(query), set(re.findall(r"\d+", query))) for query in ran_queries]
+    kept, dropped = [], []
+    for query in queries:
+        shingles, numbers = query_shingles(query), set(re.findall(r"\d+", query))
+        if any(
+            numbers == other_numbers and len(shingles & other) >= threshold * len(shingles | other)
+            for other, other_numbers in seen
+        ):
+            dropped.append(query)
+            continue
+        kept.append(query)
+        seen.append((shingles, numbers))
+    return kept, dropped
+
+
+def rebase_short_urls(text: str, sources: List[dict], from_id: Any, to_id: Any) -> tuple[str, List[dict]]:
+    """
+    Moves the short urls of a web research result made under query id from_id to to_id,
+    so a result reused in another run can't collide with the short urls of its other queries.
+    """
+    if str(from_id) == str(to_id):
+        return text, sources
+    old, new = f"{SHORT_URL_PREFIX}{from_id}-", f"{SHORT_URL_PREFIX}{to_id}-"
+    sources = [
+        {**source, "short_url": source["short_url"].replace(old, new)} if source["short_url"] else source
+        for source in sources
+    ]
+    return text.replace(old, new), sources
+
+
+BATCH_SECTION_MARKER = re.compile(r"^[ \t]*<<<(\d+)>>>[ \t]*\n?", re.MULTILINE)
+
+
+def split_batched_response(
+    response: types.GenerateContentResponse, count: int
+) -> List[Optional[types.GenerateContentResponse]]:
+    """
+    Splits a grounded answer to `count` numbered queries into one response per query: the text of
+    its <<<n>>> section, with the grounding supports that end inside the section moved to offsets
+    within it. All grounding chunks are kept, citations only refer to the ones they use.
+    A query the answer has no section for gets None.
+    """
+    text = response.text or ""
+    markers = list(BATCH_SECTION_MARKER.finditer(text))
+    bounds: List[Optional[tuple[int, int]]] = [None] * count
+    for i, marker in enumerate(markers):
+        n = int(marker.group(1)) - 1
+        if 0 <= n < count and bounds[n] is None:
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+            bounds[n] = (marker.end(), end)
+
+    candidate = response.candidates[0]
+    metadata = candidate.grounding_metadata
+    sections = []
+    for section in bounds:
+        if section is None:
+            sections.append(None)
+            continue
+        start, end = section
+        # Segment offsets count UTF-8 bytes of the text
+        start_byte, end_byte = len(text[:start].encode()), len(text[:end].encode())
+        supports = [
+            support.model_copy(update={"segment": support.segment.model_copy(update={
+                "start_index": max((support.segment.start_index or 0) - start_byte, 0),
+                "end_index": support.segment.end_index - start_byte,
+            })})
+            for support in (metadata.grounding_supports or [] if metadata else [])
+            if support.segment
+            and support.segment.end_index is not None
+            and start_byte < support.segment.end_index <= end_byte
+        ]
+        sections.append(response.model_copy(update={"candidates": [candidate.model_copy(update={
+            "content": types.Content(role="model", parts=[types.Part(text=text[start:end])]),
+            "grounding_metadata": metadata.model_copy(update={"grounding_supports": supports}) if metadata else None,
+        })]}))
+    return sections
+
+
 def insert_citation_markers(text, citations_list):
     """
     Inserts citation markers into a text string based on start and end indices.
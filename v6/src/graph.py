@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph
 from langgraph.graph import END, START
 from typing import Literal
+from langchain_core.runnables import RunnableConfig
 from src.state import GraphState, memory
 from src.interview_graph import interview_graph
 from src.deep_research.graph import deep_research_graph
@@ -33,3 +34,21 @@ builder.add_edge("arguments_graph", END)
 
 graph = builder.compile(checkpointer=memory)
 # graph = builder.compile()
+
+
+async def ainterrupted_subgraph(config: RunnableConfig) -> tuple[RunnableConfig, str]:
+    """
+    Config and next node of the subgraph waiting for the user's message. Read from the
+    checkpointer's index, so a turn starts without loading the parent and child state;
+    falls back to get_state(subgraphs=True) when the index can't tell.
+    """
+    sub_cfg = await memory.ainterrupted_subgraph(config["configurable"]["thread_id"])
+    # Only the direct subgraphs of this graph are known here
+    if sub_cfg is not None and "|" not in sub_cfg["configurable"]["checkpoint_ns"]:
+        node = sub_cfg["configurable"]["checkpoint_ns"].split(":")[0]
+        interrupt_nodes = graph.nodes[node].bound.interrupt_before_nodes
+        if len(interrupt_nodes) == 1:
+            return sub_cfg, interrupt_nodes[0]
+    sub_state = (await graph.aget_state(config, subgraphs=True)).tasks[0].state
+    sub_next_node, = sub_state.next
+    return sub_state.config, sub_next_node
@@ -1,39 +1,215 @@
+import logging
+import os
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.constants import TAG_NOSTREAM
 from langgraph.graph import StateGraph, END, START
 from langchain_tavily import TavilySearch
 from langgraph.prebuilt import ToolNode
 from typing import Literal
-from src.llm import llm
+from src.llm import context_cache, llm
 from src import prompts
-from src.state import GraphState, Event, memory
+from src.context_window import ContextWindow, count_tokens
+from src.interview_prompt import build_interview_prompt, interview_prompt_parts
+from src.transcript import estimate_tokens, render_event, render_message, render_transcript
+from src.state import GraphState, Event, memory, merge_event
+
+logger = logging.getLogger(__name__)
 
 
 tool = TavilySearch(max_results=10)
 tools = [tool]
 llm_with_tools = llm.bind_tools(tools)
+# Summaries are internal, keep them out of the chat stream
+summary_llm = llm.with_config(tags=[TAG_NOSTREAM])
+
+
+class UpdateEvent(Event):
+    """Оновлює поля події, які спікер назвав або підтвердив в останньому повідомленні."""
+
+
+# One call per turn returns both the reply and the Event delta (as an UpdateEvent tool call)
+single_call = os.getenv("INTERVIEW_SINGLE_CALL", "false").lower() in ("1", "true", "yes")
+event_tools = tools + [UpdateEvent]
+# Parsing calls don't stream: the UpdateEvent arguments and replies dropped when the interview
+# ends never reach the chat, a reply that is kept is sent with the node output
+event_llm = llm.with_config(tags=[TAG_NOSTREAM])
+llm_with_event_tool = llm.bind_tools(event_tools).with_config(tags=[TAG_NOSTREAM])
+parsing_llm = llm.with_structured_output(Event).with_config(tags=[TAG_NOSTREAM])
+
+context_window = ContextWindow(
+    keep_last_turns=int(os.getenv("INTERVIEW_KEEP_LAST_TURNS", 4)),
+    token_budget=int(os.getenv("INTERVIEW_TOKEN_BUDGET", 6000)),
+    tool_payload_chars=int(os.getenv("INTERVIEW_TOOL_PAYLOAD_CHARS", 1500)),
+)
+
+# Number of missing dialogue stages whose instructions are sent, 0 sends the full prompt
+interview_prompt_stages = int(os.getenv("INTERVIEW_PROMPT_STAGES", 1))
 
 interview_builder = StateGraph(GraphState)
 
 def interview_node(state: GraphState) -> GraphState:
-    event = state.get("event", None)
-    
-    sys_prompt = prompts.context_builder_sys_prompt.format(event=event)
-    ai_response = llm_with_tools.invoke([sys_prompt] + state["messages"])
+    if not state["messages"]:
+        return _greeting()
+    if _has_reply(state):
+        return {}
+    context_update = _fold_context(state)
+    prefix, messages = _interview_messages({**state, **context_update})
+    ai_response = context_cache.invoke(llm, prefix, messages, tools=tools, fallback=llm_with_tools)
+    _log_prompt_tokens(state, [HumanMessage(prefix)] + messages, ai_response)
+
+    return {"messages": [ai_response], **context_update}
+
+async def ainterview_node(state: GraphState) -> GraphState:
+    if not state["messages"]:
+        return _greeting()
+    if _has_reply(state):
+        return {}
+    context_update = await _afold_context(state)
+    prefix, messages = _interview_messages({**state, **context_update})
+    ai_response = await context_cache.ainvoke(llm, prefix, messages, tools=tools, fallback=llm_with_tools)
+    _log_prompt_tokens(state, [HumanMessage(prefix)] + messages, ai_response)
+
+    return {"messages": [ai_response], **context_update}
+
+def _greeting() -> GraphState:
+    """The opening line is fixed by the prompt, so a new session gets it without an LLM roundtrip."""
+    return {"messages": [AIMessage(content=prompts.interview_greeting)]}
+
+def _has_reply(state: GraphState) -> bool:
+    """In single-call mode the parsing node may have already answered the turn."""
+    return single_call and isinstance(state["messages"][-1], AIMessage)
+
+def _fold_context(state: GraphState) -> dict:
+    fold_until = _fold_index(state)
+    if fold_until is None:
+        return {}
+    summary = summary_llm.invoke(_summary_messages(state, fold_until)).content
+    return {"context_summary": summary, "summarized_until": fold_until}
+
+async def _afold_context(state: GraphState) -> dict:
+    fold_until = _fold_index(state)
+    if fold_until is None:
+        return {}
+    summary = (await summary_llm.ainvoke(_summary_messages(state, fold_until))).content
+    return {"context_summary": summary, "summarized_until": fold_until}
+
+def _prompt_parts(state: GraphState) -> tuple[str, str]:
+    # One stage keeps an inline prompt short, but is below the context cache minimum: when the
+    # model can cache every stage, that prefix stays the same for the whole interview
+    prefix, turn_prompt = interview_prompt_parts(state.get("event"), 0)
+    if not context_cache.cacheable(llm.model, prefix):
+        prefix, turn_prompt = interview_prompt_parts(state.get("event"), interview_prompt_stages)
+    if single_call:
+        turn_prompt += prompts.single_call_interview_prompt
+    return prefix, turn_prompt
+
+def _system_prompt(state: GraphState) -> HumanMessage:
+    return HumanMessage("".join(_prompt_parts(state)))
+
+def _interview_messages(state: GraphState) -> tuple[str, list]:
+    """Returns the stable prompt prefix, which context_cache serves or sends inline, and the rest of the prompt."""
+    prefix, turn_prompt = _prompt_parts(state)
+    messages = context_window.build(
+        [HumanMessage(turn_prompt)],
+        state["messages"],
+        state.get("context_summary"),
+        state.get("summarized_until") or 0,
+    )
+    return prefix, messages
+
+def _fold_index(state: GraphState):
+    return context_window.fold_index(
+        [_system_prompt(state)],
+        state["messages"],
+        state.get("context_summary"),
+        state.get("summarized_until") or 0,
+    )
+
+def _summary_messages(state: GraphState, fold_until: int) -> list:
+    summarized_until = state.get("summarized_until") or 0
+    prompt = prompts.context_summary_prompt.format(
+        summary=state.get("context_summary") or "",
+        transcript=render_transcript(state["messages"][summarized_until:fold_until], context_window.tool_payload_chars),
+    )
+    return [HumanMessage(prompt)]
+
+def _log_prompt_tokens(state: GraphState, messages: list, ai_response: AIMessage):
+    usage = ai_response.usage_metadata or {}
+    logger.info(
+        "interview prompt: ~%d tokens sent, ~%d untrimmed, %s reported by the model; "
+        "system prompt ~%d tokens, ~%d with all stages",
+        count_tokens(messages),
+        count_tokens([_system_prompt(state)] + state["messages"]),
+        usage.get("input_tokens", "n/a"),
+        estimate_tokens(_system_prompt(state).content),
+        estimate_tokens(build_interview_prompt(state.get("event"), 0)),
+    )
 
-    return {"messages": [ai_response]}
-    
 def human_input_node(state: GraphState) -> GraphState:
     pass
     
 def parsing_node(state: GraphState) -> GraphState:
-    messages = state["messages"]
-    last_human_message = messages[-1] if messages else None
-    event = state.get("event", None)
-    parsing_instructions = prompts.parsing_interview_prompt.format(event=event,last_human_message=last_human_message, messages=messages)
-    parsed_response = llm.with_structured_output(Event).invoke([HumanMessage(parsing_instructions)])
-    
+    if single_call:
+        context_update = _fold_context(state)
+        prefix, messages = _interview_messages({**state, **context_update})
+        ai_response = context_cache.invoke(event_llm, prefix, messages, tools=event_tools, fallback=llm_with_event_tool)
+        _log_prompt_tokens(state, [HumanMessage(prefix)] + messages, ai_response)
+        return {**_single_call_update(state, ai_response), **context_update}
+
+    parsed_response = parsing_llm.invoke(_parsing_messages(state))
+
+    return _parsing_update(state, parsed_response)
+
+async def aparsing_node(state: GraphState) -> GraphState:
+    if single_call:
+        context_update = await _afold_context(state)
+        prefix, messages = _interview_messages({**state, **context_update})
+        ai_response = await context_cache.ainvoke(event_llm, prefix, messages, tools=event_tools, fallback=llm_with_event_tool)
+        _log_prompt_tokens(state, [HumanMessage(prefix)] + messages, ai_response)
+        return {**_single_call_update(state, ai_response), **context_update}
 
-    return {"event": parsed_response.model_dump()}
+    parsed_response = await parsing_llm.ainvoke(_parsing_messages(state))
+
+    return _parsing_update(state, parsed_response)
+
+def _parsing_update(state: GraphState, parsed_response: Event) -> GraphState:
+    return {
+        "event": merge_event(state.get("event", None), parsed_response.model_dump()),
+        "last_extracted_index": len(state["messages"]),
+    }
+
+def _single_call_update(state: GraphState, ai_response: AIMessage) -> GraphState:
+    """
+    Applies the UpdateEvent call to the event and keeps the rest of the response as the reply.
+    The reply is dropped when the interview ends this turn, and when it is empty,
+    in which case interview_node asks the model again.
+    """
+    event = merge_event(state.get("event", None), {})
+    tool_calls = []
+    for tool_call in ai_response.tool_calls:
+        if tool_call["name"] == UpdateEvent.__name__:
+            event = merge_event(event, tool_call["args"])
+        else:
+            tool_calls.append(tool_call)
+
+    update = {"event": event}
+    reply = ai_response.model_copy(update={"tool_calls": tool_calls, "additional_kwargs": {}})
+    if (reply.content or reply.tool_calls) and not is_interview_completed(event) and event.get("is_going") != False:
+        update["messages"] = [reply]
+    return update
+
+def _parsing_messages(state: GraphState) -> list:
+    """Only the messages added since the last extraction are sent, the event carries everything before them."""
+    messages = state["messages"]
+    new_messages = messages[state.get("last_extracted_index") or 0:]
+    parsing_instructions = prompts.parsing_interview_prompt.format(
+        event=render_event(state.get("event")),
+        last_human_message=render_message(messages[-1]) if messages else "",
+        messages=render_transcript(new_messages, context_window.tool_payload_chars),
+    )
+    logger.info("parsing prompt: ~%d tokens", estimate_tokens(parsing_instructions))
+    return [HumanMessage(parsing_instructions)]
     
 def final_node(state: GraphState) -> GraphState:
     return {
@@ -85,9 +261,10 @@ def interview_route_condition(state: GraphState) -> Literal['human_input', 'tool
     
     return "human_input"
 
-interview_builder.add_node("interview", interview_node)
+# Sync implementations serve `graph.stream` (CLI), async ones `graph.astream` (Chainlit, langgraph-api)
+interview_builder.add_node("interview", RunnableLambda(interview_node, afunc=ainterview_node))
 interview_builder.add_node("human_input", human_input_node)
-interview_builder.add_node("parsing", parsing_node)
+interview_builder.add_node("parsing", RunnableLambda(parsing_node, afunc=aparsing_node))
 tool_node = ToolNode(tools=[tool])
 interview_builder.add_node("tools", tool_node)
 interview_builder.add_node("final", final_node)
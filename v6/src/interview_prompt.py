@@ -0,0 +1,41 @@
+from src import prompts
+from src.state import merge_event
+from src.transcript import render_event
+
+# Dialogue stages in prompt order with the Event fields each of them fills
+STAGE_FIELDS = {
+    "event": ("is_going", "event.name", "topic"),
+    "goal": ("goal",),
+    "target_audience": ("target_audience",),
+    "audience_knowledge": ("audience_knowledge",),
+    "key_message": ("key_message",),
+}
+
+
+def missing_stages(event) -> list[str]:
+    """Stages whose fields are not filled in the event yet, in dialogue order."""
+    event = merge_event(event, {})
+    missing = []
+    for stage, fields in STAGE_FIELDS.items():
+        values = [event["event"]["name"] if field == "event.name" else event[field] for field in fields]
+        if not all(values):
+            missing.append(stage)
+    return missing
+
+
+def interview_prompt_parts(event, max_stages: int = 1) -> tuple[str, str]:
+    """
+    Returns the interview system prompt as (stable prefix, per-turn part).
+    The prefix holds the general principles and the instructions of the next max_stages
+    missing stages, so it stays byte-identical across the turns of a stage and can be
+    served from the context cache. max_stages=0 sends every stage.
+    """
+    if max_stages <= 0:
+        stages = list(prompts.interview_stages.values())
+    else:
+        stages = [prompts.interview_stages[stage] for stage in missing_stages(event)[:max_stages]]
+    return prompts.interview_intro + "".join(stages), prompts.interview_event_prompt.format(event=render_event(event))
+
+
+def build_interview_prompt(event, max_stages: int = 1) -> str:
+    return "".join(interview_prompt_parts(event, max_stages))
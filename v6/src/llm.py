@@ -1,12 +1,14 @@
 import os
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
-from google.genai import Client
+from google.genai import Client, types
+from langchain_core.runnables import Runnable
+from shared.response_cache import LLMResponseCache, ResponseCache
+from src.concurrency import AdaptiveLimiter
+from src.context_cache import ContextCacheManager, GeminiContextCacheBackend
+from shared.rate_limiter import Priority, PriorityRateLimiter
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.5)
-
-from langchain_openai import ChatOpenAI
 
 load_dotenv()
 # if os.getenv("OPENROUTER_API_KEY") is None:
@@ -36,3 +38,137 @@ if os.getenv("GOOGLE_API_KEY") is None:
 
 # Used for Google Search API
 genai_client = Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+# One request/token budget for the API key, interview turns are served ahead of research
+rate_limiter = PriorityRateLimiter.from_env()
+
+llm = ChatGoogleGenerativeAI(
+    model="gemini-2.0-flash",
+    temperature=0.5,
+    rate_limiter=rate_limiter.bind(Priority.INTERACTIVE),
+    callbacks=[rate_limiter.usage_handler],
+)
+
+
+# Persistent cache for deterministic calls, each call site opts in with its own TTL; opened on first use
+response_cache = ResponseCache(
+    os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite"),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10_000)),
+    log_every=int(os.getenv("LLM_CACHE_LOG_EVERY", 100)),
+)
+
+# Provider-side caching of long static prompt prefixes (interview instructions, research text)
+context_cache = ContextCacheManager(
+    GeminiContextCacheBackend(genai_client),
+    ttl=float(os.getenv("CONTEXT_CACHE_TTL", 3600)),
+    min_tokens=int(os.getenv("CONTEXT_CACHE_MIN_TOKENS") or 0) or None,
+    enabled=os.getenv("CONTEXT_CACHE", "true").lower() in ("1", "true", "yes"),
+)
+
+# Grounded-search calls fanned out by deep research, limited per process and backed off on 429s
+web_research_limiter = AdaptiveLimiter(
+    "web_research",
+    initial=int(os.getenv("WEB_RESEARCH_CONCURRENCY", 4)),
+    max_limit=int(os.getenv("WEB_RESEARCH_MAX_CONCURRENCY", 16)),
+    max_retries=int(os.getenv("WEB_RESEARCH_MAX_RETRIES", 3)),
+)
+
+
+@lru_cache(maxsize=None)
+def get_model(
+    model: str,
+    temperature: float,
+    schema: Optional[type] = None,
+    cache_ttl: Optional[float] = None,
+    call_site: str = "default",
+    priority: Priority = Priority.INTERACTIVE,
+) -> Runnable:
+    """
+    Returns a process-wide shared chat model for the given (model, temperature, schema).
+    Reusing the client keeps its HTTP connection pool warm, and the structured-output
+    runnable is built once per schema instead of on every node run.
+    With cache_ttl set, responses are served from the persistent response cache.
+    Cache misses wait for the shared rate limiter at the given priority.
+    """
+    if schema is not None:
+        return get_model(
+            model, temperature, cache_ttl=cache_ttl, call_site=call_site, priority=priority
+        ).with_structured_output(schema)
+    cache = LLMResponseCache(response_cache, call_site, cache_ttl) if cache_ttl else None
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        max_retries=2,
+        cache=cache,
+        rate_limiter=rate_limiter.bind(priority),
+        callbacks=[rate_limiter.usage_handler],
+    )
+
+
+def _record_usage(response: types.GenerateContentResponse, charged: float):
+    if response.usage_metadata and response.usage_metadata.total_token_count:
+        rate_limiter.record_tokens(response.usage_metadata.total_token_count, charged)
+
+
+def _generate(model: str, contents: str, config: dict, priority: Priority) -> types.GenerateContentResponse:
+    charged = rate_limiter.acquire(priority)
+    response = genai_client.models.generate_content(model=model, contents=contents, config=config)
+    _record_usage(response, charged)
+    return response
+
+
+async def _agenerate(model: str, contents: str, config: dict, priority: Priority) -> types.GenerateContentResponse:
+    charged = await rate_limiter.aacquire(priority)
+    response = await genai_client.aio.models.generate_content(model=model, contents=contents, config=config)
+    _record_usage(response, charged)
+    return response
+
+
+def generate_content(
+    model: str,
+    contents: str,
+    config: dict,
+    cache_ttl: Optional[float] = None,
+    call_site: str = "default",
+    limiter: Optional[AdaptiveLimiter] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> types.GenerateContentResponse:
+    """
+    genai_client.models.generate_content, backed by the persistent response cache when cache_ttl is set.
+    Cache misses wait for the shared rate limiter at the given priority, and go through
+    the concurrency limiter when one is given.
+    """
+    key = response_cache.make_key(contents, model, **config)
+    cached = response_cache.get(key, call_site) if cache_ttl else None
+    if cached is not None:
+        return types.GenerateContentResponse.model_validate_json(cached)
+    if limiter is not None:
+        response = limiter.call(_generate, model, contents, config, priority)
+    else:
+        response = _generate(model, contents, config, priority)
+    if cache_ttl:
+        response_cache.set(key, response.model_dump_json(exclude_none=True), cache_ttl)
+    return response
+
+
+async def agenerate_content(
+    model: str,
+    contents: str,
+    config: dict,
+    cache_ttl: Optional[float] = None,
+    call_site: str = "default",
+    limiter: Optional[AdaptiveLimiter] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> types.GenerateContentResponse:
+    """Async variant of `generate_content`."""
+    key = response_cache.make_key(contents, model, **config)
+    cached = await response_cache.aget(key, call_site) if cache_ttl else None
+    if cached is not None:
+        return types.GenerateContentResponse.model_validate_json(cached)
+    if limiter is not None:
+        response = await limiter.acall(_agenerate, model, contents, config, priority)
+    else:
+        response = await _agenerate(model, contents, config, priority)
+    if cache_ttl:
+        await response_cache.aset(key, response.model_dump_json(exclude_none=True), cache_ttl)
+    return response
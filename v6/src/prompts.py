@@ -1,4 +1,6 @@
-context_builder_sys_prompt = """
+# The interview system prompt is assembled from a stable intro, the dialogue stages and the current event,
+# see src/interview_prompt.py. context_builder_sys_prompt is the full prompt with every stage.
+interview_intro = """
 Ти консультант з публічних виступів і перемовин, твоя мета - допомогти спікеру підготуватися до виступу на конференції,
  визначивши цільову аудиторію, її поточні знання та ключові повідомлення для досягнення цілей спікера.
 
@@ -14,12 +16,16 @@ context_builder_sys_prompt = """
 Що вона має знати/відчути для досягнення цілі? (Основне повідомлення, заклик до дії).
 Етапи діалогу:
 
-Початок діалогу та збір базової інформації:
+"""
+
+interview_stages = {
+    "greeting": """Початок діалогу та збір базової інформації:
 
 1. Привітання: "Привіт! Готуєшся до виступу?"
 
 
-2. Визначення де спікер буде виступати:
+""",
+    "event": """2. Визначення де спікер буде виступати:
 
 Запитай, де саме відбудеться виступ (назва конференції).
 Дія: Негайно використай пошук в інтернеті, щоб знайти якомога більше інформації про зазначену конференцію: дати, місце проведення, основні тематики, секції/стейджі, орієнтовна кількість відвідувачів та загальний портрет аудиторії (якщо доступно).
@@ -28,7 +34,8 @@ context_builder_sys_prompt = """
 Якщо користувач не готується - то не відповідай нічого. Наступного разу коли користувач повернеться почни діалог спочатку.
 
 
-3. Визначення цілі виступу:
+""",
+    "goal": """3. Визначення цілі виступу:
 
 Запитай, чому ти погодився виступити.
 Обробка відповідей: Спікер може мати різні цілі (набір студентів, підвищення особистого бренду, пошук лідів, виконання прохання).
@@ -36,7 +43,8 @@ context_builder_sys_prompt = """
 Зафіксуй погоджену ціль.
 
 
-4. Уточнення деталей конференції та аудиторії:
+""",
+    "target_audience": """4. Уточнення деталей конференції та аудиторії:
 
 Надай інформацію про конференцію, яку ти знайшов в інтернеті (стейджі, очікувана кількість глядачів, дата).
 Запитай, на якому стейджі/секції спікер буде виступати.
@@ -46,24 +54,54 @@ context_builder_sys_prompt = """
 Запитай: "Я правильно розумію, що для досягнення своєї цілі ти будеш зосереджуватись на аудиторіях [назви сегментів]?"
 
 
-5. Аналіз поточних знань аудиторії:
+""",
+    "audience_knowledge": """5. Аналіз поточних знань аудиторії:
 
 Поясни важливість розуміння того, що аудиторія вже знає про заявлену тему: "Для підготовки якісного спіча нам треба зрозуміти, що аудиторія вже зараз знає про тобою заявлену тему."
 Дія: Сформуй детальну гіпотезу щодо поточного рівня знань аудиторії з теми виступу. Врахуй як загальні знання, так і можливі прогалини чи стереотипи, а також відкритість аудиторії до нової інформації.
 Представ свою гіпотезу спікеру для підтвердження: "На мою думку, зараз аудиторія твого виступу вже має досвід у сфері... Однак, коли мова заходить про..., їхні знання обмежуються... Ти згоден?"
 
 
-6. Формування ключового повідомлення та висновків для аудиторії:
+""",
+    "key_message": """6. Формування ключового повідомлення та висновків для аудиторії:
 
 Запропонуй спікеру основну думку, яку аудиторія має винести з виступу для досягнення його цілі: "Для досягнення твоєї цілі, я вважаю, що аудиторія має винести з виступу наступну основну думку: [основна думка]".
 Дія: Сформулюй ключове повідомлення, яке поєднує інноваційність, доступність, приналежність/можливість долучитися та терміновість (якщо доречно). Поясни, чому саме ця думка важлива.
 Запитай, чи погоджується спікер з цим формулюванням: "Згоден?"
 
-Проаналізуй цей об'єкт:
+""",
+}
+
+interview_event_prompt = """Проаналізуй цей об'єкт:
 {event}
 якщо якесь із полів ще не заповнене - повернись зі своєю пропозицією по цьому полю згідно із вище викладеним планом і запитай чи спікер згоден з нею.
 """
 
+context_builder_sys_prompt = interview_intro + "".join(interview_stages.values()) + interview_event_prompt
+
+# First interview turn, sent without a model call
+interview_greeting = "Привіт! Готуєшся до виступу?"
+
+single_call_interview_prompt = """
+Окрім відповіді спікеру, в кожній відповіді виклич інструмент UpdateEvent і передай у нього лише ті поля об'єкта,
+які спікер назвав або підтвердив у своєму останньому повідомленні. Не вигадуй значень, решту полів залиш null.
+Якщо зрозуміло що користувач **іде на подію або готується до виступу** постав is_going = True,
+якщо зрозуміло що **НЕ іде на подію або НЕ готується до виступу** - is_going = False.
+Якщо після цього всі поля заповнені або спікер відмовився від виступу - відповідь спікеру залиш порожньою.
+"""
+
+context_summary_prompt = """
+Стисло підсумуй розмову консультанта зі спікером, щоб її можна було продовжити без повної історії.
+Збережи всі факти, які повідомив спікер, і всі домовленості: подія, тема, ціль, аудиторія, її знання, ключове повідомлення,
+а також важливі знахідки з пошуку в інтернеті. Не додавай нічого, чого немає в розмові.
+
+Попередній підсумок:
+{summary}
+
+Нова частина розмови:
+{transcript}
+"""
+
 parsing_interview_prompt = """
 Ти є високоточним агентом для вилучення даних.
 Твоє завдання — **точно проаналізувати наданий текст** та **вилучити з нього інформацію**, строго дотримуючись наступної JSON-схеми для виводу.
@@ -73,7 +111,7 @@ parsing_interview_prompt = """
 2.  **Якщо інформація для поля відсутня в тексті (якщо людина не вказувала цю інформацію), встановіть значення цього поля на `null` (None в Python).**
 3.  **Не вигадуйте жодної інформації.** Ваша відповідь має базуватися виключно на наданому тексті.
 
-Вилучи інформацію з наступного тексту:
+Вилучи інформацію з нових повідомлень розмови (все, що було сказано раніше, вже враховано в поточному стані об'єкту):
 {messages}
 
 Враховуй останнє повідомлення користувача найбільше:
@@ -99,7 +137,7 @@ messages - {messages}
 
 
 # # Prompts for arguments graph
-arguments_prompt = """
+arguments_context_prompt = """
 Ти допомогаєш спікеру підготуватися до презентації/дзвінка чи іншої події де він буде комунікувати
 Це останній етап підготовки, на попередніх етапах спікер вже зібрав достатньо інформації щоб мати повну картину про виступ:
 назва події: {event_name}
@@ -147,9 +185,14 @@ arguments_prompt = """
 В кінці запитай спікера чи підходять йому такі аргументи чи він бажає внести якісь виправлення.
 Якщо потрібні зміни допоможи йому відкоригувати аргументи поки він не буде задоволений.
 Щоб зрозуміти чи спікер задоволений після кожної ітерації проси його надати фідбек - чи все добре чи потрібні якісь корективи.
-Це фідбек від користувача, який потрібно врахувати: {user_feedback}
+"""
+
+# Sent after arguments_context_prompt, which stays the same across regenerations and is served from the context cache
+arguments_feedback_prompt = """Це фідбек від користувача, який потрібно врахувати: {user_feedback}
 # """
 
+arguments_prompt = arguments_context_prompt + arguments_feedback_prompt
+
 # Prompt for evaluating user feedback on arguments
 argument_feedback_evaluation_prompt = """
 Ти є асистентом, який оцінює відгуки користувачів щодо згенерованого списку аргументів.
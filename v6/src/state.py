@@ -1,7 +1,10 @@
+import logging
 from langgraph.graph import MessagesState
-from langgraph.checkpoint.memory import MemorySaver
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Optional
+from src.checkpointing import make_checkpointer
+
+logger = logging.getLogger(__name__)
 
 
 class EventDetails(BaseModel):
@@ -22,10 +25,51 @@ class Event(BaseModel):
     key_message: Optional[str] = Field(default=None, description="Основне повідомлення, яке спікер хоче донести")
     
 
+def merge_event(event: Optional[dict], delta: dict) -> dict:
+    """
+    Overlays the non-empty fields of an Event delta onto the current event, field by field.
+    The delta comes from the model, so fields Event doesn't have and values that don't
+    validate are logged and dropped instead of failing the turn.
+    """
+    merged = Event.model_validate(event or {}).model_dump()
+    for field, value in delta.items():
+        if value is None:
+            continue
+        if field not in Event.model_fields:
+            logger.warning("event update: dropping unknown field %r", field)
+            continue
+        nested = Event.model_fields[field].annotation
+        if isinstance(nested, type) and issubclass(nested, BaseModel):
+            if not isinstance(value, dict):
+                logger.warning("event update: dropping %r, expected an object, got %r", field, value)
+                continue
+            for key, item in value.items():
+                if item is None:
+                    continue
+                if key not in nested.model_fields:
+                    logger.warning("event update: dropping unknown field %r.%r", field, key)
+                    continue
+                merged = _validated(merged, {field: {**merged[field], key: item}}, f"{field}.{key}") or merged
+        else:
+            merged = _validated(merged, {field: value}, field) or merged
+    return merged
+
+def _validated(event: dict, update: dict[str, Any], name: str) -> Optional[dict]:
+    try:
+        return Event.model_validate({**event, **update}).model_dump()
+    except ValidationError as e:
+        logger.warning("event update: dropping invalid %s: %s", name, e.errors()[0]["msg"])
+        return None
+
+
 class GraphState(MessagesState):
     event: Event = Event()
     final_research_result: Optional[str] = Field(default=None)
     generated_arguments: Optional[list[str]] = Field(default_factory=list)
     arguments_approved: Optional[bool] = Field(default=None)
+    context_summary: Optional[str] = Field(default=None)
+    summarized_until: Optional[int] = Field(default=0)
+    last_extracted_index: Optional[int] = Field(default=0)
 
-memory = MemorySaver()
+# Shared by the root graph and all subgraphs, selected with CHECKPOINTER
+memory = make_checkpointer()
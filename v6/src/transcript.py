@@ -0,0 +1,62 @@
+from typing import Optional, Union
+
+from langchain_core.messages import AnyMessage, ToolMessage
+from pydantic import BaseModel
+
+ROLE_PREFIXES = {"human": "User", "ai": "Assistant", "tool": "Tool", "system": "System"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough local token estimate, Gemini averages about 3 characters per token on Ukrainian text."""
+    return len(text) // 3 + 1
+
+
+def render_message(message: AnyMessage, tool_payload_chars: Optional[int] = None) -> str:
+    """
+    Renders a message as "Role: content" without ids, metadata or kwargs.
+    Tool results are cut to tool_payload_chars (None keeps them whole, 0 drops them),
+    tool calls are rendered as "name(args)".
+    """
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    if isinstance(message, ToolMessage) and tool_payload_chars is not None:
+        if tool_payload_chars == 0:
+            return ""
+        if len(content) > tool_payload_chars:
+            content = content[:tool_payload_chars] + "…"
+    tool_calls = getattr(message, "tool_calls", None) or []
+    if tool_calls and tool_payload_chars != 0:
+        calls = ", ".join(f"{call['name']}({_render_args(call['args'])})" for call in tool_calls)
+        content = f"{content}\n{calls}" if content else calls
+    if not content:
+        return ""
+    return f"{ROLE_PREFIXES.get(message.type, message.type)}: {content}"
+
+
+def render_transcript(messages: list[AnyMessage], tool_payload_chars: Optional[int] = None) -> str:
+    """Renders messages one per line, skipping the ones left empty after elision."""
+    return "\n".join(
+        line for line in (render_message(message, tool_payload_chars) for message in messages) if line
+    )
+
+
+def render_event(event: Union[BaseModel, dict, None]) -> str:
+    """Renders an Event as "field: value" lines, nested details as "event.name: value", unset fields as null."""
+    if isinstance(event, BaseModel):
+        event = event.model_dump()
+    return "\n".join(_render_fields(event or {}, ""))
+
+
+def _render_fields(fields: dict, prefix: str) -> list[str]:
+    lines = []
+    for name, value in fields.items():
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+        if isinstance(value, dict):
+            lines += _render_fields(value, f"{prefix}{name}.")
+        else:
+            lines.append(f"{prefix}{name}: {'null' if value is None else value}")
+    return lines
+
+
+def _render_args(args: dict) -> str:
+    return ", ".join(f"{key}={value!r}" for key, value in args.items())
@@ -0,0 +1,13 @@
+import pytest
+
+from src.arguments_graph import feedback_intents
+
+
+@pytest.mark.parametrize("text", ["не добре", "не чудово", "не все ок", "все погано", "не зовсім добре"])
+def test_negative_feedback_is_not_approved(text):
+    assert feedback_intents.predict(text, lambda: "ADJUST") == "ADJUST"
+
+
+@pytest.mark.parametrize("text", ["так", "все чудово", "добре, дякую"])
+def test_approval_is_answered_locally(text):
+    assert feedback_intents.predict(text, lambda: pytest.fail("LLM called")) == "APPROVED"
@@ -0,0 +1,16 @@
+from src.deep_research.configuration import Configuration
+
+
+def test_env_overrides_are_read_once_until_reloaded(monkeypatch):
+    monkeypatch.setenv("MAX_RESEARCH_LOOPS", "5")
+    Configuration.reload_env()
+    assert Configuration.from_runnable_config({"configurable": {"max_research_loops": 1}}).max_research_loops == 5
+
+    monkeypatch.setenv("MAX_RESEARCH_LOOPS", "7")
+    assert Configuration.from_runnable_config().max_research_loops == 5
+    Configuration.reload_env()
+    assert Configuration.from_runnable_config().max_research_loops == 7
+
+    monkeypatch.delenv("MAX_RESEARCH_LOOPS")
+    Configuration.reload_env()
+    assert Configuration.from_runnable_config({"configurable": {"max_research_loops": 1}}).max_research_loops == 1
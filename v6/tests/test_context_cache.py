@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src import interview_graph
+from src.context_cache import ContextCacheManager, LocalContextCacheBackend, function_declarations, min_cache_tokens
+from src.interview_prompt import interview_prompt_parts
+
+LONG_PREFIX = "Дослідження аудиторії конференції. " * 600
+
+
+class StubModel:
+    """Records the messages and cached_content of every call, fails cached calls when told to."""
+
+    def __init__(self, model: str, fail_cached: bool = False):
+        self.model = model
+        self.fail_cached = fail_cached
+        self.calls = []
+
+    def invoke(self, messages, cached_content=None):
+        self.calls.append((messages, cached_content))
+        if cached_content and self.fail_cached:
+            raise RuntimeError("cached content expired")
+        return AIMessage("ok")
+
+    async def ainvoke(self, messages, cached_content=None):
+        return self.invoke(messages, cached_content)
+
+
+def test_min_tokens_follow_the_model():
+    assert min_cache_tokens("gemini-2.5-flash") == 1024
+    assert min_cache_tokens("models/gemini-2.5-flash-lite") == 1024
+    assert min_cache_tokens("gemini-2.0-flash") == 4096
+    assert min_cache_tokens("unknown-model") == 4096
+    cache = ContextCacheManager(LocalContextCacheBackend())
+    prefix = "слово " * 2000
+    assert cache.cacheable("gemini-2.5-flash", prefix) and not cache.cacheable("gemini-2.0-flash", prefix)
+    assert ContextCacheManager(LocalContextCacheBackend(), min_tokens=100).cacheable("gemini-2.0-flash", prefix)
+
+
+def test_prefix_is_cached_once_and_reused():
+    backend = LocalContextCacheBackend()
+    cache = ContextCacheManager(backend)
+    model = StubModel("gemini-2.5-flash")
+    for feedback in ("коротше", "більше прикладів"):
+        cache.invoke(model, LONG_PREFIX, [HumanMessage(feedback)])
+    asyncio.run(cache.ainvoke(model, LONG_PREFIX, [HumanMessage("ще раз")]))
+    assert list(backend.entries) == ["cachedContents/local-1"]
+    assert backend.entries["cachedContents/local-1"]["prefix"] == LONG_PREFIX
+    assert [name for _, name in model.calls] == ["cachedContents/local-1"] * 3
+    assert all(len(messages) == 1 for messages, _ in model.calls)
+    assert cache.stats() == {"created": 1, "reused": 2, "fallbacks": 0}
+
+
+def test_short_prefix_and_failed_calls_are_sent_inline():
+    backend = LocalContextCacheBackend()
+    cache = ContextCacheManager(backend)
+    model = StubModel("gemini-2.0-flash")
+    cache.invoke(model, "Короткий промпт.", [HumanMessage("привіт")])
+    assert not backend.entries and model.calls[-1][1] is None
+    assert model.calls[-1][0][0].content == "Короткий промпт."
+
+    failing = StubModel("gemini-2.5-flash", fail_cached=True)
+    cache.invoke(failing, LONG_PREFIX, [HumanMessage("привіт")])
+    cache.invoke(failing, LONG_PREFIX, [HumanMessage("ще")])
+    # The failed handle is remembered, the second call goes inline straight away
+    assert [name for _, name in failing.calls] == ["cachedContents/local-1", None, None]
+    assert cache.stats()["fallbacks"] == 3
+
+
+def test_interview_caches_every_stage_when_the_model_allows(monkeypatch):
+    monkeypatch.setattr(interview_graph, "context_cache", ContextCacheManager(LocalContextCacheBackend()))
+    full_prefix, _ = interview_prompt_parts(None, 0)
+    stage_prefix, _ = interview_prompt_parts(None, interview_graph.interview_prompt_stages)
+    later_stage = {"event": {"is_going": True, "event": {"name": "DevFest"}, "topic": "AI"}}
+
+    monkeypatch.setattr(interview_graph, "llm", SimpleNamespace(model="gemini-2.5-flash"))
+    assert interview_graph._prompt_parts({})[0] == full_prefix
+    assert interview_graph._prompt_parts(later_stage)[0] == full_prefix
+
+    monkeypatch.setattr(interview_graph, "llm", SimpleNamespace(model="gemini-2.0-flash"))
+    assert interview_graph._prompt_parts({})[0] == stage_prefix != full_prefix
+
+
+def test_tool_declarations_use_the_public_schema():
+    tool = function_declarations(interview_graph.event_tools)
+    names = [declaration.name for declaration in tool.function_declarations]
+    assert names == ["tavily_search", "UpdateEvent"]
+    assert "topic" in tool.function_declarations[1].parameters_json_schema["properties"]
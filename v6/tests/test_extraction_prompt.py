@@ -0,0 +1,25 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src import interview_graph
+from src.state import Event
+from src.transcript import estimate_tokens
+
+TURNS = 30
+
+
+def prompt_tokens(messages: list) -> int:
+    return sum(estimate_tokens(message.content) for message in messages)
+
+
+def test_extraction_prompt_stays_flat():
+    state = {"messages": [AIMessage("Привіт! Готуєшся до виступу?")], "event": None, "last_extracted_index": 0}
+    sizes = []
+    for turn in range(TURNS):
+        state["messages"] = state["messages"] + [HumanMessage(f"Відповідь номер {turn} про мою доповідь на конференції")]
+        sizes.append(prompt_tokens(interview_graph._parsing_messages(state)))
+        parsed = Event(topic="AI в освіті", goal="10 нових студентів")
+        state.update(interview_graph._parsing_update(state, parsed))
+        state["messages"] = state["messages"] + [AIMessage(f"Питання номер {turn}: розкажи більше про аудиторію")]
+    # Each extraction sees the event and the latest turn only, not the whole transcript
+    assert max(sizes[2:]) - min(sizes[2:]) <= 5
+    assert sizes[-1] < sizes[0] * 1.5
@@ -0,0 +1,139 @@
+import ormsgpack
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+
+from src.checkpointing.kvstore import LocalKVServer
+from src.checkpointing.remote import CheckpointConflictError, KVCheckpointSaver
+from src.checkpointing.retention import RetentionPolicy
+
+
+@pytest.fixture
+def server():
+    server = LocalKVServer().start()
+    yield server
+    server.stop()
+
+
+def make_saver(server: LocalKVServer, **kwargs) -> KVCheckpointSaver:
+    kwargs.setdefault("retention", RetentionPolicy(keep_last=0))
+    return KVCheckpointSaver(server.url, **kwargs)
+
+
+def put(saver: KVCheckpointSaver, thread_id: str, value: str, config=None) -> dict:
+    """Stores a checkpoint whose "value" channel moves to a new version."""
+    config = config or {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    previous = saver.get_tuple(config) if "checkpoint_id" not in config["configurable"] else None
+    checkpoint = empty_checkpoint()
+    checkpoint["id"] = str(uuid6())
+    step = previous.metadata["step"] + 1 if previous else 0
+    checkpoint["channel_values"] = {"value": value}
+    checkpoint["channel_versions"] = {"value": step + 1}
+    if previous:
+        config = previous.config
+    return saver.put(config, checkpoint, {"step": step}, {"value": step + 1})
+
+
+def values(saver: KVCheckpointSaver, thread_id: str) -> str:
+    return saver.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}).checkpoint["channel_values"]["value"]
+
+
+def head(server: LocalKVServer, thread_id: str = "t") -> dict:
+    return ormsgpack.unpackb(server.data[f"v6/threads/{thread_id}"][0])
+
+
+def test_workers_see_each_others_checkpoints(server):
+    first, second = make_saver(server), make_saver(server)
+    put(first, "t", "a")
+    assert values(second, "t") == "a"
+    put(second, "t", "b")
+    assert values(first, "t") == "b"
+    assert len(list(first.list({"configurable": {"thread_id": "t"}}))) == 2
+
+
+def test_stale_worker_gets_a_conflict_and_is_fenced_until_it_reads_again(server):
+    first, second = make_saver(server), make_saver(server)
+    put(first, "t", "a")
+    stale = second.get_tuple({"configurable": {"thread_id": "t", "checkpoint_ns": ""}})
+    put(first, "t", "b")
+
+    checkpoint = empty_checkpoint()
+    checkpoint["id"] = str(uuid6())
+    with pytest.raises(CheckpointConflictError):
+        second.put(stale.config, checkpoint, {"step": 1}, {})
+    # The rest of the run is refused, even writes that would not conflict anymore
+    with pytest.raises(CheckpointConflictError):
+        second.put_writes(stale.config, [("value", "c")], task_id="task")
+    assert len(head(server)["log"]) == 2
+
+    # The next run reads the thread from the root namespace and continues from the stored state
+    assert values(second, "t") == "b"
+    put(second, "t", "c")
+    assert values(first, "t") == "c"
+
+
+def test_conflicting_log_entry_is_removed(server):
+    first, second = make_saver(server), make_saver(server)
+    put(first, "t", "a")
+    second.get_tuple({"configurable": {"thread_id": "t", "checkpoint_ns": ""}})
+    put(first, "t", "b")
+    with pytest.raises(CheckpointConflictError):
+        second.put_writes(
+            {"configurable": {"thread_id": "t", "checkpoint_ns": "", "checkpoint_id": str(uuid6())}},
+            [("value", "c")],
+            task_id="task",
+        )
+    assert len([key for key in server.data if key.startswith("v6/log/t/")]) == 2
+
+
+def test_puts_publish_deltas_not_the_thread(server):
+    saver = make_saver(server)
+    for value in "abcdef":
+        put(saver, "t", value * 1000)
+    entries = [key for key in server.data if key.startswith("v6/log/t/")]
+    sizes = [len(server.data[key][0]) for key in sorted(entries, key=lambda key: int(key.split("/")[-1].split("-")[0]))]
+    # Each entry carries one checkpoint and blob row, it doesn't grow with the thread
+    assert max(sizes) - min(sizes) < 64
+    assert set(head(server)["log"]) == set(entries)
+
+
+def test_log_is_folded_into_snapshots(server):
+    saver = make_saver(server, snapshot_every=4)
+    for value in "abcdefghij":
+        put(saver, "t", value)
+    state = head(server)
+    assert state["seq"] == 10 and len(state["log"]) == 2
+    assert [key for key in server.data if key.startswith("v6/snapshots/t/")] == [state["snapshot"]]
+    assert len([key for key in server.data if key.startswith("v6/log/t/")]) == 2
+
+    fresh = make_saver(server)
+    assert values(fresh, "t") == "j"
+    assert len(list(fresh.list({"configurable": {"thread_id": "t"}}))) == 10
+
+
+def test_reader_catches_up_across_a_compaction(server):
+    writer, reader = make_saver(server, snapshot_every=3), make_saver(server)
+    put(writer, "t", "a")
+    assert values(reader, "t") == "a"
+    for value in "bcdefg":
+        put(writer, "t", value)
+    assert values(reader, "t") == "g"
+
+
+def test_released_blobs_are_deleted(server):
+    saver = make_saver(server, retention=RetentionPolicy(keep_last=2))
+    for value in "abcde":
+        put(saver, "t", value)
+    blobs = [key for key in server.data if key.startswith("v6/blobs/t/")]
+    assert len(blobs) == 2
+    assert values(make_saver(server), "t") == "e"
+
+
+def test_delete_thread_removes_every_key(server):
+    saver = make_saver(server, snapshot_every=2)
+    for value in "abc":
+        put(saver, "t", value)
+    put(saver, "other", "x")
+    saver.delete_thread("t")
+    assert all("/t/" not in key and not key.endswith("/t") for key in server.data)
+    assert values(make_saver(server), "other") == "x"
@@ -0,0 +1,36 @@
+import logging
+
+from langgraph.constants import TAG_NOSTREAM
+
+from src import interview_graph
+from src.state import Event, merge_event
+
+
+def test_fields_are_overlaid_one_by_one():
+    event = merge_event({"topic": "LLM", "event": {"name": "DevFest"}}, {"goal": "hire", "event": {"place": "Lviv", "name": None}})
+    assert event["topic"] == "LLM" and event["goal"] == "hire"
+    assert event["event"]["name"] == "DevFest" and event["event"]["place"] == "Lviv"
+
+
+def test_invalid_keys_are_dropped_and_logged(caplog):
+    delta = {
+        "speaker": "Olena",
+        "topic": {"title": "LLM"},
+        "event": "DevFest",
+        "goal": "hire",
+    }
+    with caplog.at_level(logging.WARNING, logger="src.state"):
+        event = merge_event({"topic": "AI"}, delta)
+    assert event == {**Event(topic="AI", goal="hire").model_dump()}
+    assert len(caplog.records) == 3
+
+
+def test_invalid_nested_keys_are_dropped():
+    event = merge_event(None, {"event": {"name": "DevFest", "city": "Lviv", "dates": ["1", "2"]}, "is_going": "yes"})
+    assert event["event"] == {**Event().model_dump()["event"], "name": "DevFest"}
+    assert event["is_going"] is True
+
+
+def test_parsing_calls_do_not_stream():
+    for runnable in (interview_graph.event_llm, interview_graph.llm_with_event_tool, interview_graph.parsing_llm):
+        assert TAG_NOSTREAM in runnable.config["tags"]
@@ -0,0 +1,42 @@
+import logging
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.checkpointing.serde import CompressedSerializer
+from src.state import Event, EventDetails
+
+AI = AIMessage(
+    content="Шукаю інформацію про конференцію",
+    id="run-1",
+    tool_calls=[{"name": "tavily_search", "args": {"query": "DevFest Lviv 2025", "max_results": 3}, "id": "call_1"}],
+    usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+)
+TOOL = ToolMessage('{"results": [{"url": "https://devfest.lviv.ua"}]}', tool_call_id="call_1", name="tavily_search")
+EVENT = Event(is_going=True, event=EventDetails(name="DevFest Lviv", place="Львів"), topic="AI в освіті")
+STATE = {"messages": [HumanMessage("Привіт"), AI, TOOL] * 20, "event": EVENT, "last_extracted_index": 3}
+
+
+@pytest.mark.parametrize("obj", [AI, TOOL, EVENT, STATE, None, b"raw"], ids=["ai", "tool", "event", "state", "none", "bytes"])
+def test_round_trip(obj, caplog):
+    serde = CompressedSerializer()
+    with caplog.at_level(logging.WARNING):
+        back = serde.loads_typed(serde.dumps_typed(obj))
+    assert not caplog.records
+    assert back == obj and type(back) is type(obj)
+    if obj is AI:
+        assert back.tool_calls == AI.tool_calls and back.usage_metadata == AI.usage_metadata
+
+
+def test_large_payloads_are_compressed():
+    serde = CompressedSerializer()
+    type_, data = serde.dumps_typed(STATE)
+    stock_type, stock_data = JsonPlusSerializer().dumps_typed(STATE)
+    assert type_ == f"{stock_type}+zstd" and len(data) < len(stock_data) / 4
+    assert serde.dumps_typed(EVENT)[0] == stock_type
+
+
+def test_reads_payloads_of_the_default_serializer():
+    serde = CompressedSerializer()
+    assert serde.loads_typed(JsonPlusSerializer().dumps_typed(STATE)) == STATE
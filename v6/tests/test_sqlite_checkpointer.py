@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from src.checkpointing.sqlite import SqliteWriteBehindSaver
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def paused_thread(path: str, thread_id: str):
+    """Runs a root graph until its subgraph pauses before a human turn, and persists it."""
+    sub = StateGraph(State)
+    sub.add_node("ask", lambda state: {"messages": [AIMessage("Готуєшся до виступу?")]})
+    sub.add_node("human_input", lambda state: {})
+    sub.add_edge(START, "ask")
+    sub.add_edge("ask", "human_input")
+    sub.add_edge("human_input", END)
+    root = StateGraph(State)
+    root.add_node("interview", sub.compile(interrupt_before=["human_input"]))
+    root.add_edge(START, "interview")
+    root.add_edge("interview", END)
+    saver = SqliteWriteBehindSaver(path)
+    root.compile(checkpointer=saver).invoke({"messages": []}, {"configurable": {"thread_id": thread_id}})
+    saver.close()
+
+
+def reopened(path: str, monkeypatch) -> tuple[SqliteWriteBehindSaver, list]:
+    """A fresh saver on the file, recording the threads its SQLite loads run on."""
+    saver = SqliteWriteBehindSaver(path)
+    load = saver._load
+    loaded_on = []
+
+    def recording_load(where, params):
+        loaded_on.append(threading.current_thread())
+        return load(where, params)
+
+    monkeypatch.setattr(saver, "_load", recording_load)
+    return saver, loaded_on
+
+
+def test_async_reads_load_threads_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoints.sqlite")
+    paused_thread(path, "s1")
+
+    saver, loaded_on = reopened(path, monkeypatch)
+    pointer = asyncio.run(saver.ainterrupted_subgraph("s1"))
+    assert pointer["configurable"]["checkpoint_ns"].startswith("interview:")
+    assert loaded_on and threading.main_thread() not in loaded_on
+    saver.close()
+
+    saver, loaded_on = reopened(path, monkeypatch)
+    config = {"configurable": {"thread_id": "s1", "checkpoint_ns": ""}}
+
+    async def read():
+        return await saver.aget_tuple(config), [item async for item in saver.alist(config)]
+
+    latest, history = asyncio.run(read())
+    assert latest is not None and history[0].config == latest.config
+    assert len(loaded_on) == 1 and loaded_on[0] is not threading.main_thread()
+    saver.close()
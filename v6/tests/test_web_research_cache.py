@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+from google.genai import types
+
+from shared.response_cache import ResponseCache
+from src.deep_research import graph
+from src.deep_research.utils import normalize_query
+
+
+def test_normalize_query_keeps_word_order():
+    assert normalize_query("Kyiv  to Lviv, trains!") == normalize_query("kyiv to lviv trains")
+    assert normalize_query("ＡＩ in Education") == "ai in education"
+    assert normalize_query("Kyiv to Lviv trains") != normalize_query("Lviv to Kyiv trains")
+
+
+def grounded_response(query: str) -> types.GenerateContentResponse:
+    text = f"Факт про {query}."
+    return types.GenerateContentResponse(candidates=[types.Candidate(
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        grounding_metadata=types.GroundingMetadata(
+            grounding_chunks=[types.GroundingChunk(web=types.GroundingChunkWeb(uri="https://example.org/1", title="example.org"))],
+            grounding_supports=[types.GroundingSupport(
+                segment=types.Segment(start_index=0, end_index=len(text.encode()), text=text), grounding_chunk_indices=[0]
+            )],
+        ),
+    )])
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(graph, "response_cache", cache)
+    return cache
+
+
+def test_async_web_research_keeps_the_cache_off_the_event_loop(cache, monkeypatch):
+    searched, cache_threads = [], []
+    get, set_ = cache.get, cache.set
+
+    def recording(method):
+        def call(*args):
+            cache_threads.append(threading.current_thread())
+            return method(*args)
+        return call
+
+    monkeypatch.setattr(cache, "get", recording(get))
+    monkeypatch.setattr(cache, "set", recording(set_))
+
+    async def agenerate_content(model, contents, config, **kwargs):
+        searched.append(contents)
+        return grounded_response(contents)
+
+    monkeypatch.setattr(graph, "agenerate_content", agenerate_content)
+
+    async def run(query: str, id: int):
+        return await graph.aweb_research({"search_query": query, "id": id}, {"configurable": {}})
+
+    asyncio.run(run("AI in education", 0))
+    again = asyncio.run(run("ai in Education?", 3))
+    asyncio.run(run("education in AI", 4))
+    # The same words in another order are another query
+    assert len(searched) == 2 and "education in AI" in searched[1]
+    assert again["search_query"] == ["ai in Education?"] and "Факт про" in again["web_research_result"][0]
+    assert cache_threads and threading.main_thread() not in cache_threads